@@ -0,0 +1,223 @@
+"""
+Times the hot functions of the publishing engine against a synthetic course and saves the results as JSON.
+
+    python benchmarks/run_benchmarks.py --notebooks 50 --cells 40 --output results.json
+    python benchmarks/run_benchmarks.py --output latest.json --compare results.json
+
+When comparing, any benchmark slower than the baseline by more than the threshold is reported as a regression
+and the script exits with a non-zero status.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_course import SyntheticCourse
+
+
+def measure(function: Callable[[], None], repeat: int) -> Dict[str, float]:
+    import statistics
+
+    timings = []
+    for _ in range(repeat):
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "max": max(timings),
+        "repeat": repeat,
+    }
+
+
+def create_benchmarks(course: SyntheticCourse, work_dir: str) -> Dict[str, Callable[[], None]]:
+    from dbacademy_courseware.dbbuild import BuildConfig
+    from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+    from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef, D_TODO
+    from dbacademy_courseware.dbpublish.resource_diff_class import SegmentDiff
+
+    client = LocalRestClient(os.path.join(work_dir, "workspace"))
+    course.write(client, "/Course/Source")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        build_config = BuildConfig(name="Synthetic Course",
+                                   version="1.0.0",
+                                   client=client,
+                                   source_dir="/Course/Source",
+                                   source_repo="/Course",
+                                   cloud="AWS",
+                                   i18n=course.i18n)
+
+    notebooks: List[NotebookDef] = list(build_config.notebooks.values())
+    for notebook in notebooks:
+        notebook.replacements["version_number"] = build_config.version
+        notebook.replacements["built_on"] = "today"
+
+    # Every command of every notebook, along with its notebook and language
+    commands = []
+    for notebook in notebooks:
+        language, source = course.notebooks.get(notebook.path)
+        for command in source.split(NotebookDef.get_cmd_delim(language)):
+            commands.append((notebook, language, command.lstrip()))
+
+    todo_commands = [c for c in commands if f" {D_TODO}\n" in c[2].split("\n", 1)[0] + "\n"]
+
+    old_dir = os.path.join(work_dir, "resources", "english-v1.0.0")
+    new_dir = os.path.join(work_dir, "resources", "english-v1.0.1")
+    course.write_resources(old_dir)
+    course.write_resources(new_dir, changed=0.05)
+
+    def publish():
+        for n in notebooks:
+            n.publish(source_dir=build_config.source_dir,
+                      target_dir="/Course/Published",
+                      i18n_resources_dir="/Course/Resources",
+                      verbose=False,
+                      debugging=False,
+                      other_notebooks=notebooks,
+                      path_index=build_config.path_index,
+                      write=False)
+
+    def get_leading_comments():
+        for n, language, command in commands:
+            n.get_leading_comments(language, command)
+
+    leading_comments = [(n, n.get_leading_comments(language, command)) for n, language, command in commands]
+
+    def parse_directives():
+        for i, (n, comments) in enumerate(leading_comments):
+            n.parse_directives(i, comments)
+
+    def clean_todo_cell():
+        for i, (n, language, command) in enumerate(todo_commands):
+            n.clean_todo_cell(language, command, i)
+
+    sources = [(n, course.notebooks.get(n.path)[1]) for n in notebooks]
+
+    def replace_contents():
+        for n, source in sources:
+            n.replace_contents(source)
+
+    def load_i18n_guid_map():
+        for n in notebooks:
+            n.load_i18n_guid_map(course.resources.get(n.path))
+
+    def segment_diff():
+        for path in course.resources:
+            sd = SegmentDiff(f"{path}.md", old_dir, new_dir)
+            sd.read_segments()
+            sd.diff()
+
+    return {
+        "NotebookDef.publish": publish,
+        "NotebookDef.get_leading_comments": get_leading_comments,
+        "NotebookDef.parse_directives": parse_directives,
+        "NotebookDef.clean_todo_cell": clean_todo_cell,
+        "NotebookDef.replace_contents": replace_contents,
+        "NotebookDef.load_i18n_guid_map": load_i18n_guid_map,
+        "SegmentDiff.read_segments+diff": segment_diff,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    regressions = []
+
+    print()
+    print(f"{'Benchmark':<40} {'Baseline':>12} {'Current':>12} {'Ratio':>8}")
+    for name, result in results.get("results").items():
+        previous = baseline.get("results", dict()).get(name)
+        if previous is None:
+            print(f"{name:<40} {'-':>12} {result.get('median')*1000:>10.2f}ms {'new':>8}")
+            continue
+
+        ratio = result.get("median") / previous.get("median") if previous.get("median") > 0 else 1.0
+        flag = "  << REGRESSION" if ratio > threshold else ""
+        print(f"{name:<40} {previous.get('median')*1000:>10.2f}ms {result.get('median')*1000:>10.2f}ms {ratio:>7.2f}x{flag}")
+
+        if ratio > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(args: List[str] = None) -> int:
+    import platform
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Benchmarks the publishing engine against a synthetic course.")
+    parser.add_argument("--notebooks", type=int, default=20)
+    parser.add_argument("--cells", type=int, default=30)
+    parser.add_argument("--cell-size", type=int, default=400)
+    parser.add_argument("--languages", default="python,sql")
+    parser.add_argument("--run-density", type=float, default=0.1)
+    parser.add_argument("--link-density", type=float, default=0.1)
+    parser.add_argument("--no-i18n", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default=None, help="Comma separated list of benchmarks to run")
+    parser.add_argument("--output", default=None, help="The JSON file to which results are written")
+    parser.add_argument("--compare", default=None, help="A previous JSON file against which to compare")
+    parser.add_argument("--threshold", type=float, default=1.2, help="The slowdown ratio reported as a regression")
+    options = parser.parse_args(args)
+
+    parameters = {
+        "notebooks": options.notebooks,
+        "cells": options.cells,
+        "cell_size": options.cell_size,
+        "languages": options.languages.split(","),
+        "run_density": options.run_density,
+        "link_density": options.link_density,
+        "i18n": not options.no_i18n,
+        "seed": options.seed,
+    }
+
+    course = SyntheticCourse(**parameters)
+    only = None if options.only is None else options.only.split(",")
+
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": dict(),
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name, function in create_benchmarks(course, work_dir).items():
+            if only is not None and name not in only:
+                continue
+
+            result = measure(function, options.repeat)
+            results["results"][name] = result
+            print(f"{name:<40} {result.get('median')*1000:>10.2f} ms (median of {options.repeat})")
+
+    if options.output is not None:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote results to \"{options.output}\"")
+
+    if options.compare is not None:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+
+        if baseline.get("parameters") != parameters:
+            print("** WARNING ** The baseline was run with different parameters")
+
+        if len(compare(results, baseline, options.threshold)) > 0:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
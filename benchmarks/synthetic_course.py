@@ -0,0 +1,143 @@
+"""
+Generates synthetic courses, of a configurable size and shape, with which to benchmark the publishing engine.
+"""
+import random
+import uuid
+from typing import Dict, List, Tuple
+
+MARKERS = {"python": "#", "sql": "--", "scala": "//", "r": "#"}
+
+WORDS = ["spark", "delta", "table", "stream", "cluster", "notebook", "query", "lakehouse", "schema", "partition",
+         "the", "and", "with", "from", "into", "of", "a", "is", "for", "to"]
+
+
+class SyntheticCourse:
+    """
+    A deterministic, seeded, course of notebooks in the SOURCE format along with the i18n resource for each notebook.
+    """
+    def __init__(self,
+                 *,
+                 notebooks: int = 20,
+                 cells: int = 30,
+                 cell_size: int = 400,
+                 languages: List[str] = None,
+                 run_density: float = 0.1,
+                 link_density: float = 0.1,
+                 todo_density: float = 0.1,
+                 i18n: bool = True,
+                 seed: int = 0):
+
+        self.notebook_count = notebooks
+        self.cell_count = cells
+        self.cell_size = cell_size
+        self.languages = languages or ["python", "sql"]
+        self.run_density = run_density
+        self.link_density = link_density
+        self.todo_density = todo_density
+        self.i18n = i18n
+        self.seed = seed
+
+        self.notebooks: Dict[str, Tuple[str, str]] = dict()  # relative path -> (language, source)
+        self.resources: Dict[str, str] = dict()              # relative path -> i18n resource
+
+        self.__random = random.Random(seed)
+        self.__generate()
+
+    def __text(self, size: int) -> str:
+        words = []
+        length = 0
+        while length < size:
+            word = self.__random.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    def __guid(self) -> str:
+        return "--i18n-" + str(uuid.UUID(int=self.__random.getrandbits(128)))
+
+    def __md_cell(self, m: str, guid: str, path: str, paths: List[str]) -> Tuple[str, str]:
+        import posixpath
+
+        lines = [f"# {self.__text(30)}"]
+        while sum([len(line) for line in lines]) < self.cell_size:
+            line = self.__text(80)
+            if self.__random.random() < self.link_density:
+                target = posixpath.relpath(self.__random.choice(paths), posixpath.dirname(path) or ".")
+                line += f" [{self.__text(10)}]($./{target})"
+            lines.append(line)
+
+        directive = f"%md {guid}" if self.i18n else "%md"
+        cell = f"{m} MAGIC {directive}\n" + "\n".join([f"{m} MAGIC {line}" for line in lines])
+        resource = f"<hr>{guid}\n" + "\n".join(lines) + "\n"
+        return cell, resource
+
+    def __code_cell(self, m: str, language: str) -> str:
+        lines = []
+        while sum([len(line) for line in lines]) < self.cell_size:
+            if language == "sql":
+                lines.append(f"SELECT * FROM {self.__random.choice(WORDS)} WHERE id = {self.__random.randint(0, 1000)}")
+            else:
+                lines.append(f"{self.__random.choice(WORDS)}_{self.__random.randint(0, 1000)} = \"{self.__text(40)}\"")
+        return "\n".join(lines)
+
+    def __todo_cells(self, m: str, language: str) -> List[str]:
+        code = self.__code_cell(m, language).split("\n")
+        todo = f"{m} TODO\n" + "\n".join([f"{m} {line}" for line in code])
+        answer = f"{m} ANSWER\n" + "\n".join(code)
+        return [todo, answer]
+
+    def __generate(self) -> None:
+        paths = ["Includes/Classroom-Setup"] + [f"{i+1:02d} - Lesson {i+1}" for i in range(self.notebook_count - 1)]
+
+        for index, path in enumerate(paths):
+            language = self.languages[index % len(self.languages)]
+            m = MARKERS.get(language)
+            cells = [f"{m} INCLUDE_HEADER_TRUE\n{m} INCLUDE_FOOTER_TRUE"]
+            resources = [f"# /{path}\n"]
+
+            while len(cells) < self.cell_count:
+                roll = self.__random.random()
+                if index > 0 and roll < self.run_density:
+                    cells.append(f"{m} MAGIC %run ./Includes/Classroom-Setup")
+                elif roll < self.run_density + self.todo_density:
+                    cells.extend(self.__todo_cells(m, language))
+                elif roll < 0.5:
+                    cell, resource = self.__md_cell(m, self.__guid(), path, paths)
+                    cells.append(cell)
+                    resources.append(resource)
+                else:
+                    cells.append(self.__code_cell(m, language))
+
+            delim = f"\n\n{m} COMMAND ----------\n\n"
+            self.notebooks[path] = (language, f"{m} Databricks notebook source\n" + delim.join(cells) + "\n")
+            self.resources[path] = "".join(resources)
+
+    def write(self, client, source_dir: str) -> None:
+        """
+        Imports every notebook of this course into the specified directory of the workspace, local or otherwise.
+        """
+        import posixpath
+
+        for path, (language, source) in self.notebooks.items():
+            notebook_path = f"{source_dir}/{path}"
+            client.workspace().mkdirs(posixpath.dirname(notebook_path))
+            client.workspace().import_notebook(language.upper(), notebook_path, source)
+
+    def write_resources(self, resources_dir: str, changed: float = 0.0) -> None:
+        """
+        Writes the i18n resources to the local file system, optionally changing the specified fraction of lines.
+        """
+        import os
+
+        changes = random.Random(self.seed + 1)
+
+        for path, resource in self.resources.items():
+            lines = resource.split("\n")
+            for i in range(1, len(lines)):
+                if not lines[i].startswith("<hr") and changes.random() < changed:
+                    lines[i] = lines[i] + " (changed)"
+
+            target_file = f"{resources_dir}/{path}.md"
+            os.makedirs(os.path.dirname(target_file), exist_ok=True)
+            with open(target_file, "w") as f:
+                f.write("\n".join(lines))
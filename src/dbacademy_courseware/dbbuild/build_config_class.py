@@ -108,12 +108,23 @@ class BuildConfig:
                  i18n_language: str = None,
                  i18n_xml_tag_disabled: bool = False,
                  ignoring: list = None,
-                 publishing_info: dict = None):
+                 publishing_info: dict = None,
+                 commit_pin_file: str = None):
 
-        import uuid, time, re
+        import uuid, time, re, threading
         from dbacademy import dbrest
         from dbacademy_gems import dbgems
         from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+        from dbacademy_courseware.dbpublish.cell_rule_set_class import CellRuleSet
+        from dbacademy_courseware.dbbuild.course_path_index_class import CoursePathIndex
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+        from dbacademy_courseware.dbbuild.build_metrics_class import BuildMetrics
+        from dbacademy_courseware.dbbuild.workspace_metadata_cache_class import WorkspaceMetadataCache
+        from dbacademy_courseware.dbbuild.commit_resolver_class import CommitResolver
+        from dbacademy_courseware.dbbuild.guid_registry_class import GuidRegistry
+        from dbacademy_courseware.dbbuild.source_cache_class import SourceCache
+        from dbacademy_courseware.dbbuild.directory_plan_class import DirectoryPlan
+        from dbacademy_courseware.dbbuild.i18n_bundle_class import I18nBundle
 
         self.__validated = False
 
@@ -131,7 +142,37 @@ class BuildConfig:
 
         self.test_type = None
         self.notebooks: Union[None, Dict[str, NotebookDef]] = None
-        self.client = dbrest.DBAcademyRestClient() if client is None else client
+        self.__path_index: Union[None, CoursePathIndex] = None
+
+        # The metadata of every object listed in the workspace, shared by all notebooks
+        self.metadata = WorkspaceMetadataCache()
+
+        # The directories created while publishing, such that each is created only once
+        self.directories = DirectoryPlan()
+
+        # Optionally populated by BuildConfig.load_source_archive()
+        self.source_archive: Union[None, DbcArchive] = None
+
+        # The per-cell validation rules, compiled once for the entire build
+        self.cell_rules = CellRuleSet()
+
+        # The index of each language's i18n resources, see BuildConfig.i18n_bundle()
+        self.__i18n_bundles: Dict[str, I18nBundle] = dict()
+        self.__i18n_bundles_lock = threading.Lock()
+
+        # The notebook and command declaring each i18n GUID, across the entire course
+        self.guid_registry = GuidRegistry()
+
+        # The commit ids against which %pip commands are pinned, resolved once for the entire build
+        self.commit_resolver = CommitResolver(pin_file=commit_pin_file)
+
+        # The timing of each phase of the build and of every call made through the client
+        self.metrics = BuildMetrics()
+        self.client = self.metrics.instrument(dbrest.DBAcademyRestClient() if client is None else client)
+
+        # The source of every notebook exported during the build, shared by every stage
+        self.source_cache = SourceCache()
+        self.metrics.register_cache("source_cache", self.source_cache)
 
         # The instance of this test run
         self.suite_id = str(time.time()) + "-" + str(uuid.uuid1())
@@ -194,7 +235,8 @@ class BuildConfig:
         assert self.source_dir is not None, "BuildConfig.source_dir must be specified"
 
         self.notebooks = dict()
-        entities = self.client.workspace().ls(self.source_dir, recursive=True)
+        self.__path_index = None
+        entities = self.metadata.load(self.client, self.source_dir)
 
         if entities is None and fail_fast is False:
             return  # The directory doesn't exist
@@ -244,6 +286,129 @@ class BuildConfig:
                                                    version=self.version)
         if has_wip: print()
 
+    @property
+    def path_index(self):
+        from dbacademy_courseware.dbbuild.course_path_index_class import CoursePathIndex
+
+        if self.__path_index is None:
+            # Built once, on first use, from the complete set of notebooks
+            self.__path_index = CoursePathIndex.from_notebooks(self.notebooks.values())
+
+        return self.__path_index
+
+    def i18n_bundle(self, resources_dir: str):
+        """
+        Returns the index of the i18n resources in the specified directory, such as "{source_repo}/Resources/english",
+        built once per build and shared by every notebook
+        """
+        from dbacademy_courseware.dbbuild.i18n_bundle_class import I18nBundle
+
+        with self.__i18n_bundles_lock:
+            bundle = self.__i18n_bundles.get(resources_dir)
+            if bundle is None:
+                bundle = I18nBundle(resources_dir)
+                bundle.load()
+                self.__i18n_bundles[resources_dir] = bundle
+
+        return bundle
+
+    def load_source_archive(self):
+        """
+        Exports the entire source directory as a single DBC from which every notebook's source and language is then served
+        """
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+
+        with self.metrics.phase("load_source_archive"):
+            self.source_archive = DbcArchive.export(self.client, self.source_dir)
+
+        print(f"Loaded {len(self.source_archive)} notebooks from the source archive")
+
+        return self.source_archive
+
+    def refresh_source_metadata(self) -> None:
+        """
+        Lists the source directory anew, at the start of each stage that reads the notebooks' sources, such that notebooks
+        edited since the previous stage are exported again instead of being served from the source cache. The source
+        archive, should any notebook have changed, is dropped to be exported again by the next stage that requires it.
+        """
+        from dbacademy_courseware.dbbuild.source_cache_class import SourceCache
+
+        paths = [f"{self.source_dir}/{p}" for p in (self.notebooks or dict())]
+        previous = {p: self.metadata.get_status(self.client, p) for p in paths}
+
+        self.metadata.load(self.client, self.source_dir)
+
+        for path in paths:
+            status = self.metadata.get_status(self.client, path)
+            if previous.get(path) is None or status is None or SourceCache.version(previous.get(path)) != SourceCache.version(status):
+                self.source_archive = None
+                break
+
+    def lint(self, *, cache_dir: str = None, i18n_resources_dir: str = None, bulk_export: bool = False, notebooks: list = None) -> int:
+        """
+        Validates every notebook without publishing anything, answering unchanged notebooks from the on-disk cache.
+        :param cache_dir: The directory of the lint cache, defaulting to one in the system's temp directory
+        :param i18n_resources_dir: The directory of the i18n resources, defaulting to that of this build's language
+        :param bulk_export: True to load every notebook's source from a single DBC export
+        :param notebooks: The notebooks to be validated, defaulting to all notebooks
+        :return: the total number of errors
+        """
+        import tempfile, time
+        from dbacademy_courseware.dbbuild.lint_cache_class import LintCache
+
+        start = time.time()
+
+        cache = LintCache(cache_dir or f"{tempfile.gettempdir()}/dbacademy-lint-cache/{self.build_name}")
+        i18n_resources_dir = i18n_resources_dir or f"{self.source_repo}/Resources/{self.i18n_language}"
+        notebooks = list(self.notebooks.values()) if notebooks is None else notebooks
+
+        self.refresh_source_metadata()
+        if bulk_export and self.source_archive is None:
+            self.load_source_archive()
+
+        errors = 0
+        warnings = 0
+        all_notebooks = list(self.notebooks.values())
+
+        for notebook in notebooks:
+            with self.metrics.phase("lint", notebook.path):
+                notebook.lint(source_dir=self.source_dir,
+                              i18n_resources_dir=i18n_resources_dir,
+                              other_notebooks=all_notebooks,
+                              path_index=self.path_index,
+                              cache=cache)
+
+            errors += len(notebook.errors)
+            warnings += len(notebook.warnings)
+
+        print("-" * 80)
+        for notebook in notebooks:
+            if len(notebook.errors) + len(notebook.warnings) > 0:
+                print(f".../{notebook.path}")
+                for error in notebook.errors:
+                    print(f"  ERROR   {error.message}")
+                for warning in notebook.warnings:
+                    print(f"  WARNING {warning.message}")
+
+        print("-" * 80)
+        print(f"Linted {len(notebooks)} notebooks in {time.time() - start:,.2f} seconds ({cache.hits} cached)")
+        print(f"Found {warnings} warnings")
+        print(f"Found {errors} errors")
+
+        return errors
+
+    def write_build_report(self, report_file: str = None) -> str:
+        """
+        Writes the build's metrics, as JSON, to the specified file or to the system's temp directory by default
+        :return: the path to the report
+        """
+        import tempfile
+
+        report_file = report_file or f"{tempfile.gettempdir()}/{self.build_name}-v{self.version}-build-report.json"
+        self.metrics.write_report(report_file)
+
+        return report_file
+
     def validate(self, validate_version: bool = True, validate_readme: bool = True):
 
         if validate_version: self._validate_version()
@@ -0,0 +1,215 @@
+from typing import Dict, List, Union
+
+
+class BuildMetrics:
+    """
+    Records the wall-clock time of each phase of a build, overall and per notebook, along with the count and latency of
+    every call made through an instrumented client, such that a slow build can be attributed to its cause.
+    Phases that run concurrently on multiple threads report the sum of their durations.
+    """
+    def __init__(self):
+        import time
+        import threading
+
+        self.started = time.time()
+        self.phases: Dict[str, float] = dict()                # phase -> seconds
+        self.notebooks: Dict[str, Dict[str, float]] = dict()  # notebook -> phase -> seconds
+        self.calls: Dict[str, List[float]] = dict()           # endpoint -> [count, seconds, max seconds, errors]
+        self.caches: Dict[str, object] = dict()               # name -> any cache with a to_dict() method
+        self.__lock = threading.Lock()
+
+    def phase(self, name: str, notebook: str = None) -> "BuildPhase":
+        """
+        Returns a context manager that times the enclosed block as the specified phase, optionally of the specified notebook
+        """
+        return BuildPhase(self, name, notebook)
+
+    def record_phase(self, name: str, notebook: Union[None, str], seconds: float) -> None:
+        with self.__lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+            if notebook is not None:
+                phases = self.notebooks.setdefault(notebook, dict())
+                phases[name] = phases.get(name, 0.0) + seconds
+
+    def record_call(self, endpoint: str, seconds: float, failed: bool = False) -> None:
+        with self.__lock:
+            stats = self.calls.setdefault(endpoint, [0, 0.0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3] += 1 if failed else 0
+
+    def register_cache(self, name: str, cache) -> None:
+        """
+        Includes the statistics of the specified cache, as returned by its to_dict() method, in every report
+        """
+        self.caches[name] = cache
+
+    def instrument(self, client):
+        """
+        Wraps the client such that every call made through it is recorded by endpoint, for example "workspace.export_notebook"
+        """
+        return client if isinstance(client, InstrumentedApi) else InstrumentedApi(client, self, None)
+
+    def to_dict(self) -> dict:
+        import time
+
+        caches = {n: c.to_dict() for n, c in self.caches.items()}
+
+        with self.__lock:
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started)),
+                "elapsed_seconds": time.time() - self.started,
+                "phases": dict(self.phases),
+                "notebooks": {n: dict(p) for n, p in self.notebooks.items()},
+                "calls": {e: {"count": s[0], "total_seconds": s[1], "mean_seconds": s[1] / s[0], "max_seconds": s[2], "errors": s[3]}
+                          for e, s in sorted(self.calls.items())},
+                "caches": caches,
+            }
+
+    def write_report(self, target_file: str) -> dict:
+        import os, json
+
+        report = self.to_dict()
+
+        target_dir = os.path.dirname(target_file)
+        if target_dir and not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+
+        with open(target_file, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"Wrote build report to \"{target_file}\"")
+        return report
+
+    def to_html(self) -> str:
+        report = self.to_dict()
+
+        html = f"""<table style="border-collapse: collapse; border-spacing:0; margin-top:1em">"""
+        html += f"""<tr><td colspan="4" style="font-weight:bold">Build Report ({report.get("elapsed_seconds"):,.2f} seconds)</td></tr>"""
+        html += f"""<tr style="font-weight:bold"><td>Phase</td><td colspan="3" style="text-align:right">Seconds</td></tr>"""
+        for name, seconds in report.get("phases").items():
+            html += f"""<tr><td>{name}</td><td colspan="3" style="text-align:right">{seconds:,.2f}</td></tr>"""
+
+        html += f"""<tr style="font-weight:bold"><td>Endpoint</td><td style="text-align:right">Calls</td><td style="text-align:right">Seconds</td><td style="text-align:right">Mean</td></tr>"""
+        for endpoint, stats in report.get("calls").items():
+            html += f"""<tr><td>{endpoint}</td><td style="text-align:right">{stats.get("count"):,}</td><td style="text-align:right">{stats.get("total_seconds"):,.2f}</td><td style="text-align:right">{stats.get("mean_seconds"):,.3f}</td></tr>"""
+
+        html += "</table>"
+        return html
+
+    def print_summary(self) -> None:
+        report = self.to_dict()
+
+        print(f"Build Report ({report.get('elapsed_seconds'):,.2f} seconds):")
+        for name, seconds in report.get("phases").items():
+            print(f"  {name:<45} {seconds:>10.2f} sec")
+
+        for endpoint, stats in report.get("calls").items():
+            print(f"  {endpoint:<45} {stats.get('total_seconds'):>10.2f} sec   {stats.get('count'):,} calls")
+
+        for name, stats in report.get("caches").items():
+            print(f"  {name:<45} {stats.get('hits'):>10,} hits  {stats.get('misses'):,} misses")
+
+
+class BuildPhase:
+    def __init__(self, metrics: BuildMetrics, name: str, notebook: Union[None, str]):
+        self.metrics = metrics
+        self.name = name
+        self.notebook = notebook
+        self.start = None
+
+    def __enter__(self):
+        import time
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        import time
+        self.metrics.record_phase(self.name, self.notebook, time.time() - self.start)
+        return False
+
+
+class InstrumentedApi:
+    """
+    A proxy for the REST client, or any one of its APIs, that times each method invoked through it. Attributes that are
+    themselves APIs, such as client.workspace or the result of client.workspace(), are proxied in turn; only objects
+    declared by the client's own package are considered APIs such that responses, dates and the like are returned as-is.
+    """
+    SCALARS = (str, int, float, bool, bytes, dict, list, tuple, type(None))
+
+    def __init__(self, target, metrics: BuildMetrics, prefix: Union[None, str], package: str = None):
+        self.__target = target
+        self.__metrics = metrics
+        self.__prefix = prefix
+        self.__package = package or InstrumentedApi.package_of(target)
+
+    @property
+    def target(self):
+        return self.__target
+
+    def __endpoint(self, name: str) -> str:
+        return name if self.__prefix is None else f"{self.__prefix}.{name}"
+
+    def __call__(self, *args, **kwargs):
+        # Calling an API, as in client.workspace(), returns an API and is not itself a REST call
+        return InstrumentedApi(self.__target(*args, **kwargs), self.__metrics, self.__prefix, self.__package)
+
+    @staticmethod
+    def package_of(value) -> str:
+        """
+        Returns the top-level package of the module declaring the value's type, such as "dbacademy" for dbacademy.dbrest
+        """
+        return (type(value).__module__ or "").split(".")[0]
+
+    @staticmethod
+    def is_api(value, package: str) -> bool:
+        """
+        Returns True if the value is an object with methods of its own declared by the specified package, as opposed to
+        the data, or the response objects, returned by a REST call
+        """
+        import inspect
+
+        if isinstance(value, InstrumentedApi.SCALARS) or inspect.isroutine(value):
+            return False
+        elif InstrumentedApi.package_of(value) != package:
+            return False
+        return any(inspect.isroutine(getattr(value, n, None)) for n in dir(type(value)) if not n.startswith("_"))
+
+    def __getattr__(self, name: str):
+        import inspect
+
+        if name.startswith("_InstrumentedApi__"):
+            raise AttributeError(name)  # Not yet initialized, as when copied or unpickled
+
+        value = getattr(self.__target, name)
+
+        if inspect.isroutine(value):
+            return self.__timed(self.__endpoint(name), value)
+        elif InstrumentedApi.is_api(value, self.__package):
+            return InstrumentedApi(value, self.__metrics, self.__endpoint(name), self.__package)
+        else:
+            return value
+
+    def __timed(self, endpoint: str, method):
+        import time
+        import functools
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.time()
+            failed = True
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+            finally:
+                self.__metrics.record_call(endpoint, time.time() - start, failed)
+
+            if InstrumentedApi.is_api(result, self.__package):
+                # Methods such as client.clusters() return yet another API
+                return InstrumentedApi(result, self.__metrics, endpoint, self.__package)
+            return result
+
+        return timed
+
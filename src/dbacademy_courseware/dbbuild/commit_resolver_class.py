@@ -0,0 +1,123 @@
+from typing import Dict, List, Union
+
+
+class CommitResolver:
+    """
+    Resolves, once per build, the commit id of the head of the "published" branch of each of the dbacademy-* repos
+    against which %pip commands are pinned. Commit ids can be read from, and written to, a pin file such that a build
+    can be reproduced offline.
+    """
+
+    REPOSITORIES = ["dbacademy-gems", "dbacademy-rest", "dbacademy-helper"]
+    BRANCH = "published"
+
+    def __init__(self, pin_file: str = None):
+        import os
+        import json
+        import threading
+
+        self.pin_file = pin_file
+        self.commits: Dict[str, str] = dict()
+        self.calls = 0
+
+        self.__lock = threading.Lock()
+        self.__session = None
+
+        if pin_file is not None and os.path.exists(pin_file):
+            with open(pin_file) as f:
+                pins = json.load(f)
+            assert pins.get("branch") == CommitResolver.BRANCH, f"Expected the pin file \"{pin_file}\" to be of the branch \"{CommitResolver.BRANCH}\", found \"{pins.get('branch')}\"."
+            self.commits.update(pins.get("commits", dict()))
+
+    @property
+    def session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if self.__session is None:
+            self.__session = requests.Session()
+            self.__session.mount("https://", HTTPAdapter(pool_maxsize=len(CommitResolver.REPOSITORIES)))
+        return self.__session
+
+    def fetch(self, repo_name: str) -> str:
+        """
+        Looks up the commit id of the head of the published branch on GitHub, ignoring any cached or pinned value
+        """
+        repo_url = f"https://api.github.com/repos/databricks-academy/{repo_name}/commits/{CommitResolver.BRANCH}"
+        response = self.session.get(repo_url)
+        assert response.status_code == 200, f"Expected 200, received {response.status_code}"
+
+        with self.__lock:
+            self.calls += 1
+
+        return response.json().get("sha")
+
+    def resolve(self, repo_name: str) -> str:
+        """
+        Returns the commit id of the specified repo, fetching it only if it was not previously resolved or pinned
+        """
+        with self.__lock:
+            commit_id = self.commits.get(repo_name)
+
+        if commit_id is None:
+            commit_id = self.fetch(repo_name)
+            with self.__lock:
+                commit_id = self.commits.setdefault(repo_name, commit_id)
+
+        return commit_id
+
+    def resolve_all(self, repo_names: List[str] = None) -> Dict[str, Union[None, str]]:
+        """
+        Concurrently resolves every one of the specified repos, by default all of them, saving the pin file if one was
+        specified. Failures are reported but not raised, leaving resolve() to fail only should the repo actually be used.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        repo_names = CommitResolver.REPOSITORIES if repo_names is None else repo_names
+        missing = [r for r in repo_names if r not in self.commits]
+
+        def try_resolve(repo_name: str) -> Union[None, str]:
+            try:
+                return self.resolve(repo_name)
+            except Exception as e:
+                print(f"Unable to resolve the commit id of {repo_name}: {e}")
+                return None
+
+        if len(missing) > 0:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                list(executor.map(try_resolve, missing))
+
+            if self.pin_file is not None and all(r in self.commits for r in repo_names):
+                self.save()
+
+        return {r: self.commits.get(r) for r in repo_names}
+
+    def save(self, pin_file: str = None) -> None:
+        import os
+        import json
+
+        pin_file = pin_file or self.pin_file
+        assert pin_file is not None, "The pin file must be specified."
+
+        target_dir = os.path.dirname(pin_file)
+        if target_dir and not os.path.exists(target_dir):
+            os.makedirs(target_dir)
+
+        with self.__lock:
+            pins = {"branch": CommitResolver.BRANCH, "commits": dict(sorted(self.commits.items()))}
+
+        with open(pin_file, "w") as f:
+            json.dump(pins, f, indent=2)
+
+    def __getstate__(self):
+        # The session and lock are not carried to other processes, only what was already resolved
+        return {"pin_file": self.pin_file, "commits": dict(self.commits), "calls": self.calls}
+
+    def __setstate__(self, state):
+        import threading
+
+        self.pin_file = state.get("pin_file")
+        self.commits = state.get("commits")
+        self.calls = state.get("calls")
+        self.__lock = threading.Lock()
+        self.__session = None
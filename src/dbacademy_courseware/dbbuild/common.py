@@ -1,10 +1,77 @@
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Callable, Any
 from dbacademy.dbrest import DBAcademyRestClient
 
+# The local mount of the workspace's file system
+WORKSPACE_FS = "/Workspace"
+
 def print_if(condition, text):
     if condition:
         print(text)
 
+class ThreadLocalOutput:
+    """
+    Stands in for sys.stdout, redirecting writes from threads that registered a buffer to that buffer.
+    """
+    def __init__(self, stdout):
+        import threading
+        self.stdout = stdout
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (self.stdout if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.stdout.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stdout, name)
+
+def parallel_map(function: Callable[[Any], Any], items: list, max_workers: int) -> list:
+    """
+    Applies the function to each item using a bounded pool of threads. The console output of each call is buffered and then
+    printed, in the order of the items, as soon as that item and all the items before it have completed. Should any call
+    fail, its output is printed, all pending calls are cancelled, and its exception is re-raised.
+    :param function: The function to apply to each item
+    :param items: The items to be processed
+    :param max_workers: The maximum number of concurrent threads
+    :return: The list of results, in the order of the items
+    """
+    import io, sys
+    from concurrent.futures import ThreadPoolExecutor
+
+    installed = not isinstance(sys.stdout, ThreadLocalOutput)
+    output = ThreadLocalOutput(sys.stdout) if installed else sys.stdout
+
+    def invoke(item):
+        buffer = io.StringIO()
+        output.local.buffer = buffer
+        try:
+            return buffer, function(item), None
+        except Exception as e:
+            return buffer, None, e
+        finally:
+            output.local.buffer = None
+
+    results = []
+    if installed: sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(invoke, item) for item in items]
+            for future in futures:
+                buffer, result, error = future.result()
+                print(buffer.getvalue(), end="")
+
+                if error is not None:
+                    for pending in futures: pending.cancel()
+                    raise error
+
+                results.append(result)
+    finally:
+        if installed: sys.stdout = output.stdout
+
+    return results
+
 def clean_target_dir(client, target_dir: str, verbose):
     from dbacademy_courseware.dbpublish.publisher_class import Publisher
     if verbose: print(f"Cleaning {target_dir}...")
@@ -67,7 +134,7 @@ def reset_git_repo(*, client: DBAcademyRestClient, directory: str, repo_url: str
 
     assert branch == current_branch, f"Expected the new branch to be {branch}, found {current_branch}"
 
-def validate_not_uncommitted(*, client: DBAcademyRestClient, build_name: str, repo_url: str, directory: str, ignored: List[str]):
+def validate_not_uncommitted(*, client: DBAcademyRestClient, build_name: str, repo_url: str, directory: str, ignored: List[str], bulk_export: bool = False, source_cache=None):
     repo_dir = f"/Repos/Temp/{build_name}-diff"
 
     print(f"Comparing {directory}")
@@ -80,8 +147,8 @@ def validate_not_uncommitted(*, client: DBAcademyRestClient, build_name: str, re
                    branch="published",
                    which="fresh")
 
-    index_a: Dict[str, Dict[str, str]] = index_repo_dir(client=client, repo_dir=repo_dir, ignored=ignored)
-    index_b: Dict[str, Dict[str, str]] = index_repo_dir(client=client, repo_dir=directory, ignored=ignored)
+    index_a: Dict[str, Dict[str, str]] = index_repo_dir(client=client, repo_dir=repo_dir, ignored=ignored, bulk_export=bulk_export)
+    index_b: Dict[str, Dict[str, str]] = index_repo_dir(client=client, repo_dir=directory, ignored=ignored, bulk_export=bulk_export, source_cache=source_cache)
 
     return compare_results(index_a, index_b)
 
@@ -95,15 +162,19 @@ def __starts_with(test_path: str, values: List[str]):
         if test_path.startswith(ext): return True
     return False
 
-def index_repo_dir(*, client: DBAcademyRestClient, repo_dir: str, ignored: List[str]) -> Dict[str, Dict[str, str]]:
+def __notebook_path(full_path: str) -> str:
+    return full_path[len(WORKSPACE_FS):] if full_path.startswith(f"{WORKSPACE_FS}/") else full_path
+
+def index_repo_dir(*, client: DBAcademyRestClient, repo_dir: str, ignored: List[str], bulk_export: bool = False, source_cache=None) -> Dict[str, Dict[str, str]]:
     import os
+    from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
 
     print(f"...indexing \"{repo_dir}\"")
     notebooks = client.workspace().ls(repo_dir, recursive=True)
     assert notebooks is not None, f"No notebooks found for the path {repo_dir}"
 
     results: Dict[str, Dict[str, str]] = {}
-    base_path = f"/Workspace/{repo_dir}"
+    base_path = f"{WORKSPACE_FS}/{repo_dir.strip('/')}"
 
     for path, dirs, files in os.walk(base_path):
         for file in files:
@@ -115,9 +186,15 @@ def index_repo_dir(*, client: DBAcademyRestClient, repo_dir: str, ignored: List[
                     "contents": None
                 }
 
-    return load_sources(client=client, results=results)
+    archive = DbcArchive.export(client, repo_dir) if bulk_export else None
+    statuses = {n.get("path"): n for n in notebooks}
+    return load_sources(client=client, results=results, archive=archive, source_cache=source_cache, statuses=statuses)
 
-def load_sources(*, client: DBAcademyRestClient, results: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+def load_sources(*, client: DBAcademyRestClient, results: Dict[str, Dict[str, str]], archive=None, source_cache=None, statuses: Dict[str, dict] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Loads the contents of each file, exporting notebooks through the source_cache, when specified, for those notebooks
+    whose status, as listed in statuses, is known.
+    """
     for path in results:
         full_path = results.get(path).get("full_path")
 
@@ -127,10 +204,17 @@ def load_sources(*, client: DBAcademyRestClient, results: Dict[str, Dict[str, st
         elif __ends_with(full_path, [".json", ".txt", ".html", ".md", ".gitignore", "LICENSE"]):
             # These are text files that we can just read in
             with open(full_path) as f: contents = f.read()
+        elif archive is not None and __notebook_path(full_path) in archive:
+            # These are notebooks that were already exported in bulk
+            language, contents = archive.get(__notebook_path(full_path))
+        elif source_cache is not None and __notebook_path(full_path) in (statuses or dict()):
+            # These are notebooks that may have already been exported by another stage of the build
+            notebook_path = __notebook_path(full_path)
+            language, contents = source_cache.get(client, notebook_path, statuses.get(notebook_path))
         else:
             # These are notebooks
             try:
-                notebook_path = full_path[10:] if full_path.startswith("/Workspace/") else full_path
+                notebook_path = __notebook_path(full_path)
                 contents = client.workspace.export_notebook(notebook_path)
             except Exception as e:
                 contents = ""
@@ -0,0 +1,55 @@
+from typing import Iterable
+
+
+class CoursePathIndex:
+    """
+    An immutable index of every notebook path in a course, and all of their parent directories, against which the
+    relative targets of %run commands and $-relative markdown links are resolved in constant time.
+    """
+    def __init__(self, paths: Iterable[str]):
+        import posixpath
+
+        all_paths = set()
+        for path in paths:
+            # Add the original notebook's path
+            path = posixpath.normpath(path)
+            all_paths.add(path)
+
+            # Get the notebook's directory
+            directory = posixpath.dirname(path)
+            all_paths.add(directory)
+
+            # While there are still parent directories, keep processing
+            while "/" in directory:
+                directory = posixpath.dirname(directory)
+                all_paths.add(directory)
+
+        self.__paths = frozenset(all_paths)
+
+    @staticmethod
+    def from_notebooks(notebooks: Iterable) -> "CoursePathIndex":
+        return CoursePathIndex([n.path for n in notebooks])
+
+    @staticmethod
+    def resolve(notebook_path: str, target: str) -> str:
+        """
+        Resolves the target, relative to the specified notebook, to a normalized path relative to the course's root.
+        Targets that would climb above the course's root are clamped to it.
+        """
+        import posixpath
+
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(notebook_path), target))
+
+        while resolved == ".." or resolved.startswith("../"):
+            resolved = resolved[3:]
+
+        return "" if resolved == "." else resolved
+
+    def exists(self, path: str) -> bool:
+        return path in self.__paths
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.__paths
+
+    def __len__(self) -> int:
+        return len(self.__paths)
@@ -0,0 +1,176 @@
+from typing import Dict, Tuple, Union
+
+
+class DbcArchive:
+    """
+    An in-memory view of a DBC archive, indexed by each notebook's workspace path, from which a whole directory of
+    notebooks can be served in their source format after a single call to export_dbc().
+    """
+
+    EXTENSIONS = {
+        ".python": "python",
+        ".scala": "scala",
+        ".sql": "sql",
+        ".r": "r",
+    }
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.notebooks: Dict[str, Tuple[str, str]] = dict()  # workspace path -> (language, source)
+
+    @staticmethod
+    def export(client, directory: str) -> "DbcArchive":
+        print(f"Exporting DBC from \"{directory}\"")
+        data = client.workspace.export_dbc(directory)
+        return DbcArchive.read(directory, data)
+
+    @staticmethod
+    def read(directory: str, data: bytes) -> "DbcArchive":
+        import io, json, zipfile
+
+        archive = DbcArchive(directory)
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+            for name in zip_file.namelist():
+                # The first folder in the archive is the exported directory itself
+                relative_path = "/".join(name.split("/")[1:])
+                extension = "." + relative_path.split(".")[-1] if "." in relative_path else None
+
+                if extension in DbcArchive.EXTENSIONS:
+                    notebook = json.loads(zip_file.read(name).decode("utf-8"))
+                    language = notebook.get("language", DbcArchive.EXTENSIONS.get(extension)).lower()
+
+                    path = f"{directory}/{relative_path[:-len(extension)]}"
+                    archive.notebooks[path] = (language, DbcArchive.to_source(language, notebook.get("commands", [])))
+
+        return archive
+
+    @staticmethod
+    def to_source(language: str, commands: list) -> str:
+        """
+        Converts the commands of a DBC notebook to the same SOURCE format produced by export_notebook()
+        """
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        m = NotebookDef.get_comment_marker(language)
+        cells = []
+
+        for command in sorted(commands, key=lambda c: c.get("position", 0)):
+            lines = command.get("command", "").split("\n")
+
+            if lines[0].strip().startswith("%"):
+                # Magic commands are commented out, line by line
+                lines = [f"{m} MAGIC" if line == "" else f"{m} MAGIC {line}" for line in lines]
+
+            title = command.get("commandTitle")
+            if title:
+                show_title = 1 if command.get("showCommandTitle") else 0
+                lines.insert(0, f"{m} DBTITLE {show_title},{title}")
+
+            cells.append("\n".join(lines))
+
+        # Like the workspace's own SOURCE export, every cell is separated by a blank line and the file ends with a newline
+        return f"{m} Databricks notebook source\n" + f"\n\n{m} COMMAND ----------\n\n".join(cells) + "\n"
+
+    @staticmethod
+    def to_commands(language: str, source: str) -> list:
+        """
+        Converts a notebook in the SOURCE format produced by export_notebook() to the list of commands of a DBC notebook
+        """
+        import uuid
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        m = NotebookDef.get_comment_marker(language)
+        header = f"{m} Databricks notebook source"
+        if source.startswith(header):
+            source = source[len(header):]
+
+        commands = []
+        for i, cell in enumerate(source.split(f"\n{m} COMMAND ----------\n")):
+            lines = cell.strip("\n").split("\n")
+
+            title, show_title = "", False
+            if lines[0].startswith(f"{m} DBTITLE "):
+                show_title, title = lines.pop(0)[len(m)+9:].split(",", 1)
+                show_title = show_title == "1"
+
+            if len(lines) > 0 and lines[0].startswith(f"{m} MAGIC"):
+                # Magic commands are un-commented, line by line
+                for index, line in enumerate(lines):
+                    if line.startswith(f"{m} MAGIC "):
+                        lines[index] = line[len(m)+7:]
+                    elif line == f"{m} MAGIC":
+                        lines[index] = ""
+
+            commands.append({
+                "version": "CommandV1",
+                "origId": i + 1,
+                "guid": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{i}:{cell}")),
+                "subtype": "command",
+                "commandType": "auto",
+                "position": float(i + 1),
+                "command": "\n".join(lines),
+                "commandVersion": 0,
+                "state": "finished",
+                "results": None,
+                "errorSummary": None,
+                "error": None,
+                "bindings": {},
+                "inputWidgets": {},
+                "commandTitle": title,
+                "showCommandTitle": show_title,
+                "hideCommandCode": False,
+                "hideCommandResult": False,
+            })
+
+        return commands
+
+    def add(self, path: str, language: str, source: str) -> None:
+        assert path.startswith(f"{self.directory}/"), f"The notebook \"{path}\" is not in the directory \"{self.directory}\"."
+        self.notebooks[path] = (language.lower(), source)
+
+    def to_bytes(self) -> bytes:
+        """
+        Assembles the DBC archive, as would be produced by export_dbc(), from the notebooks in this archive
+        """
+        import io, json, zipfile
+
+        extensions = {v: k for k, v in DbcArchive.EXTENSIONS.items()}
+        root = self.directory.split("/")[-1]
+        buffer = io.BytesIO()
+
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for path in sorted(self.notebooks.keys()):
+                language, source = self.notebooks.get(path)
+                relative_path = path[len(self.directory)+1:]
+
+                notebook = {
+                    "version": "NotebookV1",
+                    "origId": 0,
+                    "name": relative_path.split("/")[-1],
+                    "language": language,
+                    "commands": self.to_commands(language, source),
+                    "dashboards": [],
+                    "globalVars": {},
+                    "iPythonMetadata": None,
+                    "inputWidgets": {},
+                }
+
+                # A fixed timestamp keeps the archive's bytes reproducible
+                info = zipfile.ZipInfo(f"{root}/{relative_path}{extensions.get(language)}", date_time=(1980, 1, 1, 0, 0, 0))
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zip_file.writestr(info, json.dumps(notebook))
+
+        return buffer.getvalue()
+
+    def get(self, path: str) -> Union[None, Tuple[str, str]]:
+        """
+        Returns the tuple (language, source) for the specified notebook or None if the notebook is not in the archive
+        """
+        return self.notebooks.get(path)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.notebooks
+
+    def __len__(self) -> int:
+        return len(self.notebooks)
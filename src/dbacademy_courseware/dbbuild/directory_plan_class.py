@@ -0,0 +1,100 @@
+from typing import Iterable, List, Set
+
+
+class DirectoryPlan:
+    """
+    Computes, from the paths of every notebook about to be written, the minimal set of leaf directories to be created;
+    each call to mkdirs() creating all of a directory's ancestors. Directories already created are remembered such that
+    a subsequent write into any of them, or into any of their ancestors, requires no further call. Only the directories
+    created are shared, such that concurrent builds, as of several translations, may each create their own files' leaves.
+    """
+    def __init__(self):
+        import threading
+
+        self.__created: Set[str] = set()
+        self.__lock = threading.Lock()
+
+        self.calls = 0
+
+    @staticmethod
+    def parent(path: str) -> str:
+        return path.rstrip("/").rsplit("/", 1)[0]
+
+    @staticmethod
+    def ancestors(directory: str) -> List[str]:
+        """
+        Returns the directory's ancestors, nearest first, excluding the root
+        """
+        ancestors = []
+        directory = DirectoryPlan.parent(directory)
+        while directory not in ["", "/"]:
+            ancestors.append(directory)
+            directory = DirectoryPlan.parent(directory)
+        return ancestors
+
+    def leaves(self, paths: Iterable[str]) -> List[str]:
+        """
+        Returns the parent directories of the specified files that were not already created and are not the ancestor of
+        another of those directories
+        """
+        planned = {DirectoryPlan.parent(p) for p in paths} - {"", "/"}
+        ancestors = {a for d in planned for a in DirectoryPlan.ancestors(d)}
+
+        with self.__lock:
+            return sorted(planned - ancestors - self.__created)
+
+    def __mark_created(self, directory: str) -> None:
+        self.__created.add(directory)
+        self.__created.update(DirectoryPlan.ancestors(directory))
+
+    def __mkdirs(self, client, directory: str) -> None:
+        client.workspace().mkdirs(directory)
+
+        with self.__lock:
+            self.calls += 1
+            self.__mark_created(directory)
+
+    def create(self, client, paths: Iterable[str], max_workers: int = None) -> List[str]:
+        """
+        Creates every leaf directory of the specified files, concurrently on up to max_workers threads
+        :return: the directories that were created
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        leaves = self.leaves(paths)
+
+        if max_workers is None or max_workers <= 1 or len(leaves) <= 1:
+            for directory in leaves:
+                self.__mkdirs(client, directory)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(lambda d: self.__mkdirs(client, d), leaves))
+
+        return leaves
+
+    def ensure(self, client, directory: str) -> bool:
+        """
+        Creates the specified directory unless it, or one of its descendants, was already created
+        :return: True if the directory had to be created
+        """
+        with self.__lock:
+            if directory in self.__created:
+                return False
+
+        self.__mkdirs(client, directory)
+        return True
+
+    def invalidate(self, prefix: str = None) -> None:
+        """
+        Forgets that the specified directory and its descendants were created, or all directories if not specified, as
+        when the directory is deleted
+        """
+        with self.__lock:
+            if prefix is None:
+                self.__created.clear()
+            else:
+                prefix = prefix.rstrip("/")
+                self.__created = {d for d in self.__created if d != prefix and not d.startswith(f"{prefix}/")}
+
+    def __contains__(self, directory: str) -> bool:
+        return directory in self.__created
@@ -0,0 +1,69 @@
+from typing import Dict, List, Tuple
+
+
+class GuidRegistry:
+    """
+    Records, for the entire course, the notebook and command in which each i18n GUID is declared such that a GUID that
+    is declared by more than one notebook can be reported along with every one of its locations.
+    """
+    def __init__(self):
+        import threading
+
+        self.__locations: Dict[str, Dict[str, int]] = dict()  # guid -> notebook -> zero-based command index
+        self.__notebooks: Dict[str, Dict[str, int]] = dict()  # notebook -> guid -> zero-based command index
+        self.__lock = threading.Lock()
+
+    def update(self, path: str, guid_cells: Dict[str, int]) -> None:
+        """
+        Replaces the GUIDs registered for the specified notebook, as when the notebook is published again
+        """
+        with self.__lock:
+            self.__remove(path)
+
+            self.__notebooks[path] = dict(guid_cells)
+            for guid, i in guid_cells.items():
+                self.__locations.setdefault(guid, dict())[path] = i
+
+    def __remove(self, path: str) -> None:
+        for guid in self.__notebooks.pop(path, dict()):
+            locations = self.__locations.get(guid)
+            locations.pop(path, None)
+            if len(locations) == 0:
+                del self.__locations[guid]
+
+    def remove(self, path: str) -> None:
+        with self.__lock:
+            self.__remove(path)
+
+    def locations(self, guid: str) -> List[Tuple[str, int]]:
+        """
+        Returns the (notebook, command index) of every declaration of the specified GUID, sorted by notebook
+        """
+        with self.__lock:
+            return sorted(self.__locations.get(guid, dict()).items())
+
+    def guids(self, path: str) -> List[str]:
+        """
+        Returns the GUIDs declared by the specified notebook, in the order of its commands
+        """
+        with self.__lock:
+            cells = self.__notebooks.get(path, dict())
+            return sorted(cells, key=lambda g: cells[g])
+
+    def conflicts(self) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Returns the locations of every GUID declared by more than one notebook, sorted by GUID
+        """
+        with self.__lock:
+            return {g: sorted(n.items()) for g, n in sorted(self.__locations.items()) if len(n) > 1}
+
+    @staticmethod
+    def describe(guid: str, locations: List[Tuple[str, int]]) -> str:
+        where = ", ".join([f"\"{path}\" Cmd #{i + 1}" for path, i in locations])
+        return f"The i18n GUID {guid} is declared by {len(locations)} notebooks: {where}"
+
+    def __contains__(self, guid: str) -> bool:
+        return guid in self.__locations
+
+    def __len__(self) -> int:
+        return len(self.__locations)
@@ -0,0 +1,155 @@
+from typing import Dict, List, Tuple, Union
+
+
+class I18nResource:
+    """
+    The parsed i18n resource of a single notebook: the notebook's name, as declared by the resource's header, and the
+    translated text of each GUID, in the order in which they appear.
+    """
+    def __init__(self, name: str, guids: List[Tuple[str, str]]):
+        self.name = name
+        self.guids = guids
+        self.guid_map: Dict[str, str] = dict(guids)
+        self.__lines: Dict[str, List[str]] = dict()
+
+    def lines(self, guid: str) -> List[str]:
+        """
+        Returns the stripped, translated text of the specified GUID split into lines, splitting it only once
+        """
+        lines = self.__lines.get(guid)
+        if lines is None:
+            lines = self.guid_map[guid].strip().split("\n")
+            self.__lines[guid] = lines
+        return lines
+
+    def __contains__(self, guid: str) -> bool:
+        return guid in self.guid_map
+
+    def __len__(self) -> int:
+        return len(self.guids)
+
+
+class I18nBundle:
+    """
+    Indexes every i18n resource of one language, such as "{source_repo}/Resources/english", once per build. The index is
+    persisted to disk along with each file's modification time and size such that only the resources that changed
+    since the previous build are parsed again.
+    """
+
+    # Incremented whenever a change to the parsing would invalidate previously persisted indexes
+    FORMAT_VERSION = 1
+
+    def __init__(self, resources_dir: str, index_file: str = None, local_dir: str = None):
+        import hashlib
+        import tempfile
+
+        self.resources_dir = resources_dir
+        self.local_dir = f"/Workspace{resources_dir}" if local_dir is None else local_dir
+
+        if index_file is None:
+            name = hashlib.sha1(self.local_dir.encode("utf-8")).hexdigest()
+            index_file = f"{tempfile.gettempdir()}/dbacademy-i18n-index/{name}.json"
+        self.index_file = index_file
+
+        self.parsed = 0   # The number of resources parsed, as opposed to read from the index
+        self.__resources: Union[None, Dict[str, I18nResource]] = None
+
+    @staticmethod
+    def normalize(source: str) -> str:
+        source = source.replace("<hr />\n--i18n-", "<hr>--i18n-")
+        source = source.replace("<hr sandbox />\n--i18n-", "<hr sandbox>--i18n-")
+        return source
+
+    @staticmethod
+    def parse(i18n_source: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Splits a normalized resource into the notebook's name and the list of (guid, value) tuples
+        """
+        import re
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        parts = re.split(r"^<hr>--i18n-|^<hr sandbox>--i18n-", i18n_source, flags=re.MULTILINE)
+        name = parts[0].strip()[3:]
+
+        return name, [NotebookDef.parse_guid_and_value(part) for part in parts[1:]]
+
+    def __read_index(self) -> dict:
+        import os, json
+
+        if not os.path.exists(self.index_file):
+            return dict()
+
+        try:
+            with open(self.index_file) as f:
+                index = json.load(f)
+        except ValueError:
+            return dict()  # A corrupt index is simply rebuilt
+
+        if index.get("format_version") != I18nBundle.FORMAT_VERSION or index.get("local_dir") != self.local_dir:
+            return dict()
+
+        return index.get("files", dict())
+
+    def __write_index(self, files: dict) -> None:
+        import os, json
+
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+
+        # Written to a temp file and then renamed so that readers never see a partial index
+        temp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump({"format_version": I18nBundle.FORMAT_VERSION, "local_dir": self.local_dir, "files": files}, f)
+
+        os.replace(temp_file, self.index_file)
+
+    def load(self) -> Dict[str, I18nResource]:
+        """
+        Indexes every resource of this language, reusing the persisted index for files that did not change
+        """
+        import os
+
+        previous = self.__read_index()
+        files = dict()
+        resources = dict()
+
+        for root, dirs, file_names in os.walk(self.local_dir):
+            dirs.sort()
+            for file_name in sorted(file_names):
+                if not file_name.endswith(".md"):
+                    continue
+
+                local_path = os.path.join(root, file_name)
+                path = os.path.relpath(local_path, self.local_dir)[:-3].replace(os.sep, "/")
+                stat = os.stat(local_path)
+
+                entry = previous.get(path)
+                if entry is None or entry.get("mtime") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+                    with open(local_path) as f:
+                        name, guids = I18nBundle.parse(I18nBundle.normalize(f.read()))
+                    entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "name": name, "guids": [list(g) for g in guids]}
+                    self.parsed += 1
+
+                files[path] = entry
+                resources[path] = I18nResource(entry.get("name"), [tuple(g) for g in entry.get("guids")])
+
+        if files != previous:
+            self.__write_index(files)
+
+        self.__resources = resources
+        return resources
+
+    @property
+    def resources(self) -> Dict[str, I18nResource]:
+        return self.load() if self.__resources is None else self.__resources
+
+    def get(self, path: str) -> Union[None, I18nResource]:
+        """
+        Returns the resource of the specified notebook or None if the notebook has no resource in this language
+        """
+        return self.resources.get(path)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.resources
+
+    def __len__(self) -> int:
+        return len(self.resources)
@@ -0,0 +1,119 @@
+import functools
+from typing import List, Tuple, Union
+
+
+class LintCache:
+    """
+    Persists the errors and warnings of each notebook's validation to disk, keyed by a hash of everything that can
+    affect the outcome, such that a notebook that did not change since the last lint is not validated again.
+    """
+
+    # Incremented whenever a change to the validation would invalidate previously cached results
+    FORMAT_VERSION = 1
+
+    # Replacements whose values change with every build but do not affect the validation
+    VOLATILE_REPLACEMENTS = ["built_on"]
+
+    def __init__(self, cache_dir: str):
+        import os
+
+        self.cache_dir = cache_dir
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def tool_digest() -> str:
+        """
+        Hashes the source of the installed dbacademy_courseware package, computed once per process, such that any change
+        to these tools, released or not, invalidates previously cached results
+        """
+        import os, hashlib
+        import dbacademy_courseware
+
+        package_dir = os.path.dirname(os.path.abspath(dbacademy_courseware.__file__))
+        files = sorted([os.path.join(dp, f) for dp, dn, filenames in os.walk(package_dir) for f in filenames if f.endswith(".py")])
+
+        sha = hashlib.sha256()
+        for file in files:
+            sha.update(os.path.relpath(file, package_dir).encode("utf-8"))
+            sha.update(b"\x00")
+            with open(file, "rb") as f:
+                sha.update(f.read())
+            sha.update(b"\x00")
+
+        return sha.hexdigest()
+
+    @staticmethod
+    def key(notebook, language: str, raw_source: str, i18n_source: Union[None, str], course_paths: List[str]) -> str:
+        """
+        Hashes the notebook's source along with its configuration, including the version being built, the paths of every
+        notebook in the course, against which %run commands and links are validated, the build's cell rules and the source
+        of these tools.
+        """
+        import json, hashlib
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        replacements = {k: ("" if k in LintCache.VOLATILE_REPLACEMENTS else v) for k, v in notebook.replacements.items()}
+
+        fingerprint = json.dumps({
+            "format_version": LintCache.FORMAT_VERSION,
+            "tool_digest": LintCache.tool_digest(),
+            "cell_rules": notebook.build_config.cell_rules.digest,
+            "path": notebook.path,
+            "version": notebook.version,
+            # Pinned library versions are a warning for these versions but an error for any other
+            "version_listed": notebook.version in BuildConfig.VERSIONS_LIST,
+            "language": language,
+            "include_solution": notebook.include_solution,
+            "i18n": notebook.i18n,
+            "i18n_language": notebook.i18n_language,
+            "i18n_xml_tag_disabled": notebook.build_config.i18n_xml_tag_disabled,
+            "ignoring": sorted(notebook.ignoring),
+            "replacements": replacements,
+            "course_paths": sorted(course_paths),
+        }, sort_keys=True)
+
+        sha = hashlib.sha256(fingerprint.encode("utf-8"))
+        sha.update(b"\x00")
+        sha.update(raw_source.encode("utf-8"))
+        sha.update(b"\x00")
+        sha.update((i18n_source or "").encode("utf-8"))
+
+        return sha.hexdigest()
+
+    def get(self, key: str) -> Union[None, Tuple[List[str], List[str]]]:
+        """
+        Returns the tuple (errors, warnings) of the cached messages or None if the key is not cached
+        """
+        import os, json
+
+        cache_file = f"{self.cache_dir}/{key}.json"
+        if not os.path.exists(cache_file):
+            self.misses += 1
+            return None
+
+        try:
+            with open(cache_file) as f:
+                entry = json.load(f)
+        except ValueError:
+            self.misses += 1
+            return None  # A partially written entry is simply recomputed
+
+        self.hits += 1
+        return entry.get("errors", []), entry.get("warnings", [])
+
+    def put(self, key: str, path: str, errors: List[str], warnings: List[str]) -> None:
+        import os, json
+
+        # Written to a temp file and then renamed so that readers never see a partial entry
+        cache_file = f"{self.cache_dir}/{key}.json"
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+
+        with open(temp_file, "w") as f:
+            json.dump({"path": path, "errors": errors, "warnings": warnings}, f)
+
+        os.replace(temp_file, cache_file)
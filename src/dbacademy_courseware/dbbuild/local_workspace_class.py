@@ -0,0 +1,187 @@
+from typing import Dict, List, Union
+
+
+class LocalWorkspace:
+    """
+    Emulates the subset of the Workspace API used by the build tools against a directory on the local file system.
+    Each notebook is stored in its SOURCE format as a .py, .sql, .scala or .r file such that the workspace path
+    /Repos/someone/course/Source/1.1 Lesson is backed by the file {root}/Repos/someone/course/Source/1.1 Lesson.py
+    """
+
+    LANGUAGES = {
+        ".py": "PYTHON",
+        ".sql": "SQL",
+        ".scala": "SCALA",
+        ".r": "R",
+    }
+    EXTENSIONS = {v: k for k, v in LANGUAGES.items()}
+
+    def __init__(self, root: str):
+        import os
+        self.root = os.path.abspath(root)
+
+    def __call__(self):
+        # Supports both the client.workspace() and the client.workspace styles of invocation
+        return self
+
+    def to_local_path(self, path: str) -> str:
+        return self.root + "/" + path.strip("/")
+
+    def __find_notebook(self, path: str) -> Union[None, str]:
+        import os
+
+        local_path = self.to_local_path(path)
+        for extension in self.LANGUAGES:
+            for candidate in [local_path + extension, local_path + extension.upper()]:
+                if os.path.isfile(candidate):
+                    return candidate
+        return None
+
+    def __to_status(self, path: str, local_path: str) -> Dict[str, Union[str, int]]:
+        import os, zlib
+
+        mtime = int(os.path.getmtime(local_path) * 1000)
+        status = {"path": path, "object_id": zlib.crc32(path.encode("utf-8")), "modified_at": mtime}
+
+        if os.path.isdir(local_path):
+            status["object_type"] = "DIRECTORY"
+        elif local_path[len(self.to_local_path(path)):].lower() in self.LANGUAGES:
+            status["object_type"] = "NOTEBOOK"
+            status["language"] = self.LANGUAGES.get(local_path[len(self.to_local_path(path)):].lower())
+        else:
+            status["object_type"] = "FILE"
+
+        return status
+
+    def get_status(self, path: str) -> Union[None, Dict[str, Union[str, int]]]:
+        import os
+
+        local_path = self.to_local_path(path)
+        if os.path.isdir(local_path):
+            return self.__to_status(path, local_path)
+
+        notebook_path = self.__find_notebook(path)
+        if notebook_path is not None:
+            return self.__to_status(path, notebook_path)
+        elif os.path.isfile(local_path):
+            return self.__to_status(path, local_path)
+        else:
+            return None
+
+    def ls(self, path: str, recursive: bool = False) -> Union[None, List[Dict[str, Union[str, int]]]]:
+        """
+        Lists the children of the specified directory or, when recursive, every notebook and file below it, or None if it does not exist
+        """
+        import os
+
+        path = path.rstrip("/")
+        local_dir = self.to_local_path(path)
+        if not os.path.isdir(local_dir):
+            return None
+
+        results = []
+        for name in sorted(os.listdir(local_dir)):
+            local_path = f"{local_dir}/{name}"
+            base, extension = os.path.splitext(name)
+
+            if os.path.isfile(local_path) and extension.lower() in self.LANGUAGES:
+                name = base  # Notebooks are presented without their extension
+
+            status = self.__to_status(f"{path}/{name}", local_path)
+
+            if not recursive:
+                results.append(status)
+            elif status.get("object_type") == "DIRECTORY":
+                results.extend(self.ls(status.get("path"), recursive=True))
+            else:
+                results.append(status)
+
+        return results
+
+    def export_notebook(self, path: str) -> str:
+        notebook_path = self.__find_notebook(path)
+        assert notebook_path is not None, f"The notebook \"{path}\" does not exist."
+
+        with open(notebook_path, "r") as f:
+            return f.read()
+
+    def import_notebook(self, language: str, notebook_path: str, content: str, overwrite: bool = True) -> None:
+        import os
+
+        existing = self.__find_notebook(notebook_path)
+        if existing is not None:
+            assert overwrite, f"The notebook \"{notebook_path}\" already exists."
+            os.remove(existing)
+
+        local_path = self.to_local_path(notebook_path) + self.EXTENSIONS.get(language.upper())
+        assert os.path.isdir(os.path.dirname(local_path)), f"The parent directory of \"{notebook_path}\" does not exist."
+
+        with open(local_path, "w") as f:
+            f.write(content)
+
+    def mkdirs(self, path: str) -> None:
+        import os
+        os.makedirs(self.to_local_path(path), exist_ok=True)
+
+    def delete_path(self, path: str) -> None:
+        import os, shutil
+
+        local_path = self.to_local_path(path)
+        notebook_path = self.__find_notebook(path)
+
+        if os.path.isdir(local_path):
+            shutil.rmtree(local_path)
+        elif notebook_path is not None:
+            os.remove(notebook_path)
+        elif os.path.isfile(local_path):
+            os.remove(local_path)
+
+    def export_dbc(self, path: str) -> bytes:
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+
+        archive = DbcArchive(path.rstrip("/"))
+        for status in self.ls(path, recursive=True) or []:
+            if status.get("object_type") == "NOTEBOOK":
+                archive.add(status.get("path"), status.get("language"), self.export_notebook(status.get("path")))
+
+        return archive.to_bytes()
+
+    def import_dbc_files(self, target_path: str, local_file_path: str = None, source_url: str = None, overwrite: bool = True) -> None:
+        import posixpath
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+
+        assert local_file_path is not None, "Only DBCs on the local file system are supported."
+        assert source_url is None, "Only DBCs on the local file system are supported."
+
+        with open(local_file_path, "rb") as f:
+            archive = DbcArchive.read(target_path.rstrip("/"), f.read())
+
+        for path, (language, source) in archive.notebooks.items():
+            self.mkdirs(posixpath.dirname(path))
+            self.import_notebook(language, path, source, overwrite=overwrite)
+
+
+class LocalClusters:
+    """
+    Stands in for the Clusters API, for which there is no local equivalent
+    """
+    def __call__(self):
+        return self
+
+    @staticmethod
+    def get_current_spark_version() -> Union[None, str]:
+        return None
+
+    @staticmethod
+    def get_current_instance_pool_id() -> Union[None, str]:
+        return None
+
+
+class LocalRestClient:
+    """
+    A drop-in replacement for DBAcademyRestClient, limited to the workspace operations required to load, validate
+    and publish a course, such that a course can be built from and to the local file system without a workspace.
+    """
+    def __init__(self, root: str):
+        self.workspace = LocalWorkspace(root)
+        self.clusters = LocalClusters()
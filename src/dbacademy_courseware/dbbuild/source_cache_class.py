@@ -0,0 +1,68 @@
+from typing import Dict, Tuple, Union
+
+
+class SourceCache:
+    """
+    Retains the source of every notebook exported during a build, keyed by the notebook's path along with its object id
+    and modification time, such that the publishing, resource bundle and repo validation stages export each notebook
+    only once. A notebook whose status reports a different object id or modification time is exported again.
+    """
+    def __init__(self):
+        import threading
+
+        self.__sources: Dict[str, Tuple[tuple, str, str]] = dict()  # path -> (version, language, source)
+        self.__lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def version(status: dict) -> tuple:
+        return status.get("object_id"), status.get("modified_at")
+
+    def get(self, client, path: str, status: dict) -> Tuple[str, str]:
+        """
+        Returns the tuple (language, raw_source) of the specified notebook, exporting it only if not already cached
+        :param client: The client with which to export the notebook
+        :param path: The workspace path of the notebook
+        :param status: The notebook's status, as returned by get_status() or a listing of its directory
+        """
+        version = SourceCache.version(status)
+        language = status.get("language").lower()
+
+        with self.__lock:
+            entry = self.__sources.get(path)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1], entry[2]
+            self.misses += 1
+
+        raw_source = client.workspace().export_notebook(path)
+
+        with self.__lock:
+            self.__sources[path] = (version, language, raw_source)
+
+        return language, raw_source
+
+    def invalidate(self, prefix: str = None) -> None:
+        """
+        Drops the cached source of the specified notebook and its descendants, or of everything if not specified
+        """
+        with self.__lock:
+            if prefix is None:
+                self.__sources.clear()
+            else:
+                prefix = prefix.rstrip("/")
+                for path in [p for p in self.__sources if p == prefix or p.startswith(f"{prefix}/")]:
+                    del self.__sources[path]
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        with self.__lock:
+            total = self.hits + self.misses
+            return {"notebooks": len(self.__sources), "hits": self.hits, "misses": self.misses, "hit_rate": 0.0 if total == 0 else self.hits / total}
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.__sources
+
+    def __len__(self) -> int:
+        return len(self.__sources)
@@ -0,0 +1,52 @@
+from typing import List, Union
+
+
+class TextWriter:
+    """
+    Builds large documents, such as notebooks, resource bundles and HTML reports, from fragments that are joined only
+    once, instead of through repeated string concatenation. When constructed with a stream, such as an open file or an
+    io.StringIO upload buffer, each fragment is written straight through and nothing is retained in memory.
+    """
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.length = 0
+        self.__fragments: List[str] = list()
+
+    def write(self, text: str) -> "TextWriter":
+        self.length += len(text)
+
+        if self.stream is not None:
+            self.stream.write(text)
+        else:
+            self.__fragments.append(text)
+
+        return self
+
+    def writeln(self, text: str = "") -> "TextWriter":
+        return self.write(text).write("\n")
+
+    def write_all(self, fragments: List[str], separator: str = "") -> "TextWriter":
+        for i, fragment in enumerate(fragments):
+            if i > 0 and separator:
+                self.write(separator)
+            self.write(fragment)
+        return self
+
+    def getvalue(self) -> Union[None, str]:
+        """
+        Returns the accumulated text or None if the text was streamed
+        """
+        if self.stream is not None:
+            return None
+
+        if len(self.__fragments) > 1:
+            # Collapse the fragments so that subsequent calls are free
+            self.__fragments = ["".join(self.__fragments)]
+
+        return self.__fragments[0] if self.__fragments else ""
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __str__(self) -> str:
+        return self.getvalue() or ""
@@ -0,0 +1,93 @@
+from typing import Dict, List, Union
+
+
+class WorkspaceMetadataCache:
+    """
+    Retains the metadata (path, object type, language, object id) returned by a recursive listing of the workspace such
+    that subsequent lookups of the same objects do not require a call to get_status(). Within a directory that was
+    listed, an object that is not in the listing is known not to exist.
+    """
+    def __init__(self):
+        import threading
+
+        self.__statuses: Dict[str, dict] = dict()
+        self.__directories: List[str] = list()
+        self.__lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, directory: str, entities: Union[None, List[dict]]) -> None:
+        """
+        Caches the entities of a recursive listing of the specified directory
+        """
+        with self.__lock:
+            self.__invalidate(directory)
+
+            if entities is not None:
+                self.__directories.append(directory.rstrip("/"))
+                for entity in entities:
+                    self.__statuses[entity.get("path")] = entity
+
+    def load(self, client, directory: str) -> Union[None, List[dict]]:
+        """
+        Lists the specified directory, recursively, caching and then returning the result
+        """
+        entities = client.workspace().ls(directory, recursive=True)
+        self.update(directory, entities)
+        return entities
+
+    def __is_listed(self, path: str) -> bool:
+        for directory in self.__directories:
+            if path.startswith(f"{directory}/"):
+                return True
+        return False
+
+    def get_status(self, client, path: str) -> Union[None, dict]:
+        """
+        Returns the cached status of the specified object, falling back to the workspace only when the object is not
+        within a directory that was listed
+        """
+        with self.__lock:
+            if path in self.__statuses:
+                self.hits += 1
+                return self.__statuses.get(path)
+            elif self.__is_listed(path):
+                self.hits += 1
+                return None
+            else:
+                self.misses += 1
+
+        status = client.workspace().get_status(path)
+
+        with self.__lock:
+            if status is not None:
+                self.__statuses[path] = status
+
+        return status
+
+    def __invalidate(self, prefix: str) -> None:
+        prefix = prefix.rstrip("/")
+
+        for path in [p for p in self.__statuses if p == prefix or p.startswith(f"{prefix}/")]:
+            del self.__statuses[path]
+
+        # Neither the listings within the prefix nor the one containing it are complete anymore
+        self.__directories = [d for d in self.__directories if d != prefix and not d.startswith(f"{prefix}/") and not prefix.startswith(f"{d}/")]
+
+    def invalidate(self, prefix: str = None) -> None:
+        """
+        Drops the cached metadata of the specified object and its descendants, or of everything if not specified
+        """
+        with self.__lock:
+            if prefix is None:
+                self.__statuses.clear()
+                self.__directories.clear()
+            else:
+                self.__invalidate(prefix)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.__statuses
+
+    def __len__(self) -> int:
+        return len(self.__statuses)
@@ -0,0 +1,140 @@
+from typing import Union, Tuple, List
+
+
+class Cell:
+    """
+    A single command of a notebook, in the SOURCE format, whose lines, magic command and leading comments are computed
+    lazily and then memoized so that the various validation and transformation passes do not have to re-split the command.
+    """
+    __slots__ = ("language", "text", "cm", "__lines", "__magic", "__leading_comments")
+
+    def __init__(self, language: str, text: str):
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        self.language = language
+        self.text = text
+        self.cm = NotebookDef.get_comment_marker(language)
+
+        self.__lines = None
+        self.__magic = None
+        self.__leading_comments = None
+
+    @staticmethod
+    def of(language: str, command: Union[str, "Cell"]) -> "Cell":
+        """
+        Returns the command as-is if it is already a Cell, otherwise parses it as a cell of the specified language.
+        """
+        return command if isinstance(command, Cell) else Cell(language, command)
+
+    def update(self, text: str) -> "Cell":
+        """
+        Returns this cell, and its memoized state, if the text is unchanged, otherwise a new cell for the new text.
+        """
+        return self if text is self.text or text == self.text else Cell(self.language, text)
+
+    @property
+    def lines(self) -> Tuple[str, ...]:
+        if self.__lines is None:
+            self.__lines = tuple(self.text.split("\n"))
+        return self.__lines
+
+    @property
+    def first_line(self) -> str:
+        return self.lines[0]
+
+    @property
+    def magic(self) -> str:
+        """
+        The magic command, such as %md, %md-sandbox, %run or %pip, with which this cell starts or "" if it is not a magic cell
+        """
+        if self.__magic is None:
+            prefix = f"{self.cm} MAGIC %"
+            first_line = self.first_line
+            self.__magic = "%" + first_line[len(prefix):].split(" ")[0] if first_line.startswith(prefix) else ""
+        return self.__magic
+
+    def is_magic(self, command: str) -> bool:
+        """
+        Returns true if this cell starts with the specified magic command, as a prefix, such that %md also matches %md-sandbox
+        """
+        return self.magic.startswith(command)
+
+    @property
+    def is_md(self) -> bool:
+        return self.is_magic("%md")
+
+    @property
+    def is_run(self) -> bool:
+        return self.is_magic("%run")
+
+    @property
+    def is_pip(self) -> bool:
+        return self.is_magic("%pip")
+
+    @property
+    def leading_comments(self) -> List[str]:
+        if self.__leading_comments is None:
+            self.__leading_comments = self.__parse_leading_comments()
+        return self.__leading_comments
+
+    def __parse_leading_comments(self) -> List[str]:
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        leading_comments = []
+
+        source_m = self.cm
+        first_line = self.first_line.lower()
+
+        if first_line.startswith(f"{source_m} magic %md"):
+            cell_m = NotebookDef.get_comment_marker("md")
+        elif first_line.startswith(f"{source_m} magic %sql"):
+            cell_m = NotebookDef.get_comment_marker("sql")
+        elif first_line.startswith(f"{source_m} magic %python"):
+            cell_m = NotebookDef.get_comment_marker("python")
+        elif first_line.startswith(f"{source_m} magic %scala"):
+            cell_m = NotebookDef.get_comment_marker("scala")
+        elif first_line.startswith(f"{source_m} magic %run"):
+            cell_m = source_m  # Included to preclude trapping for R language below
+        elif first_line.startswith(f"{source_m} magic %r"):
+            cell_m = NotebookDef.get_comment_marker("r")
+        else:
+            cell_m = source_m
+
+        for line in self.lines:
+
+            # Start by removing any "source" prefix
+            if line.startswith(f"{source_m} MAGIC"):
+                length = len(source_m) + 6
+                line = line[length:].strip()
+
+            elif line.startswith(f"{source_m} COMMAND"):
+                length = len(source_m) + 8
+                line = line[length:].strip()
+
+            # Next, if it starts with a magic command, remove it.
+            if line.strip().startswith("%"):
+                # Remove the magic command from this line
+                pos = line.find(" ")
+                if pos == -1:
+                    line = ""
+                else:
+                    line = line[pos:].strip()
+
+            # Finally process the refactored-line for any comments.
+            if line.strip() == cell_m or line.strip() == "":
+                # empty comment line, don't break, just ignore
+                pass
+
+            elif line.strip().startswith(cell_m):
+                # append to our list
+                comment = line.strip()[len(cell_m):].strip()
+                leading_comments.append(comment)
+
+            else:
+                # All done, this is a non-comment
+                return leading_comments
+
+        return leading_comments
+
+    def __str__(self):
+        return self.text
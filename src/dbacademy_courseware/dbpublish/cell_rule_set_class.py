@@ -0,0 +1,242 @@
+from typing import List, Dict, Union
+
+STAGE_SOURCE = "source"      # The cell as exported, before any rewrites
+STAGE_CELL = "cell"          # The cell after the %md, %pip & directive rewrites
+STAGE_CONTENTS = "contents"  # The whole notebook after all replacements were processed
+
+SEVERITY_ERROR = "error"
+SEVERITY_WARNING = "warning"
+
+# Every year from 2017 through 2998, inclusive, as a single expression
+COPYRIGHT_YEARS = r"(?:20(?:1[7-9]|[2-9]\d)|2[1-8]\d\d|29[0-8]\d|299[0-8])"
+
+BDC_TOKENS = ["IPYTHON_ONLY", "DATABRICKS_ONLY",
+              "AMAZON_ONLY", "AZURE_ONLY", "TEST", "PRIVATE_TEST", "INSTRUCTOR_NOTE", "INSTRUCTOR_ONLY",
+              "SCALA_ONLY", "PYTHON_ONLY", "SQL_ONLY", "R_ONLY"
+                                                       "VIDEO", "ILT_ONLY", "SELF_PACED_ONLY", "INLINE",
+              "NEW_PART", "{dbr}"]
+
+DEPRECATED_ICONS = [":HINT:", ":CAUTION:", ":BESTPRACTICE:", ":SIDENOTE:", ":NOTE:"]
+
+
+class CellRule:
+    """
+    Declares a single substring (or regular expression) that may not appear in a notebook along with how to report it.
+    The message is a format string that may reference {cmd}, {match}, {line} and {padding}.
+    """
+    def __init__(self,
+                 name: str,
+                 pattern: str,
+                 message: str,
+                 *,
+                 stage: str = STAGE_CELL,
+                 severity: str = SEVERITY_ERROR,
+                 regex: bool = False,
+                 each_match: bool = False,
+                 languages: List[str] = None,
+                 ignore_key: str = None,
+                 skip_md: bool = False):
+
+        self.name = name
+        self.pattern = pattern
+        self.message = message
+        self.stage = stage
+        self.severity = severity
+        self.regex = regex              # When False, the pattern is a literal substring
+        self.each_match = each_match    # Report every distinct match instead of just the first one
+        self.languages = languages      # None implies all languages
+        self.ignore_key = ignore_key    # Skipped when the notebook is "ignoring" this key
+        self.skip_md = skip_md          # Skipped for %md cells
+
+    @property
+    def expression(self) -> str:
+        import re
+        return self.pattern if self.regex else re.escape(self.pattern)
+
+    def applies_to(self, language: str, is_md: bool, ignoring: list) -> bool:
+        if self.languages is not None and language not in self.languages:
+            return False
+        elif self.skip_md and is_md:
+            return False
+        elif self.ignore_key is not None and self.ignore_key in ignoring:
+            return False
+        else:
+            return True
+
+    def format(self, i: int, command: str, match: str, pos: int) -> str:
+        line = ""
+        if "{line}" in self.message:
+            pos_a = command.rfind("\n", 0, pos)
+            pos_a = 0 if pos_a == -1 else pos_a
+
+            pos_b = command.find("\n", pos)
+            pos_b = len(command)-1 if pos_b == -1 else pos_b
+
+            line = command[pos_a:pos_b].strip()
+
+        cmd = i + 1
+        padding = " " * len(f"Cmd #{cmd} ")
+        return self.message.format(cmd=cmd, match=match, line=line, padding=padding)
+
+
+def default_rules() -> List[CellRule]:
+    rules = [
+        CellRule("cell-title", "DBTITLE", "Cmd #{cmd} | Unsupported Cell-Title found", stage=STAGE_SOURCE),
+    ]
+
+    for what in ["/mnt/training", "/databricks-datasets"]:
+        rules.append(CellRule(f"prohibited-dataset:{what}", what, "Cmd #{cmd} | Course includes prohibited use of {match}:\n{padding}| {line}",
+                              stage=STAGE_SOURCE,
+                              severity=SEVERITY_WARNING,
+                              languages=["python", "scala", "sql", "java", "r"],
+                              ignore_key="prohibited-dataset"))
+
+    for token in BDC_TOKENS:
+        rules.append(CellRule(f"bdc-token:{token}", token, "Cmd #{cmd} | Found the token \"{match}\" "))
+
+    for language, magic, article, what in [("python", "%python", "a", "Python"),
+                                           ("sql", "%sql", "a", "SQL"),
+                                           ("scala", "%scala", "a", "Scala")]:
+        rules.append(CellRule(f"lang-{language}", magic, f"Cmd #{{cmd}} | Found \"{magic}\" in {article} {what} notebook",
+                              severity=SEVERITY_WARNING, languages=[language], ignore_key=f"lang-{language}", skip_md=True))
+
+    # We have to check both cases so as not to catch %run by accident
+    rules.append(CellRule("lang-r", "%r ", "Cmd #{cmd} | Found \"%r\" in an R notebook",
+                          severity=SEVERITY_WARNING, languages=["r"], ignore_key="lang-r", skip_md=True))
+    rules.append(CellRule("lang-r:eol", "%r\n", "Cmd #{cmd} | Found \"%r\" in an R notebook",
+                          severity=SEVERITY_WARNING, languages=["r"], ignore_key="lang-r", skip_md=True))
+
+    rules.append(CellRule("copyright", f"{COPYRIGHT_YEARS} Databricks, Inc", "Cmd #{cmd} | Found copyright ({match}) ",
+                          regex=True, each_match=True))
+
+    for icon in DEPRECATED_ICONS:
+        rules.append(CellRule(f"deprecated-icon:{icon}", icon, f"The deprecated {icon} pattern was found after all replacements were processed.",
+                              stage=STAGE_CONTENTS))
+    return rules
+
+
+class CellRuleSet:
+    """
+    Compiles a list of CellRules, once per build, into a single expression per stage so that each cell is scanned in one pass.
+    """
+    def __init__(self, rules: List[CellRule] = None):
+        import re
+        import threading
+
+        self.rules = default_rules() if rules is None else rules
+        self.patterns: Dict[str, re.Pattern] = dict()
+        self.stage_rules: Dict[str, List[CellRule]] = dict()
+        self.rule_patterns: Dict[str, re.Pattern] = {r.name: re.compile(r.expression) for r in self.rules}
+
+        self.scan_seconds: Dict[str, float] = dict()
+        self.rule_seconds: Dict[str, float] = {r.name: 0.0 for r in self.rules}
+        self.rule_hits: Dict[str, int] = {r.name: 0 for r in self.rules}
+        self.__lock = threading.Lock()
+        self.__digest = None
+
+        for stage in [STAGE_SOURCE, STAGE_CELL, STAGE_CONTENTS]:
+            rules = [r for r in self.rules if r.stage == stage]
+            self.stage_rules[stage] = rules
+            self.scan_seconds[stage] = 0.0
+
+            if len(rules) > 0:
+                # Capturing groups would defeat the regex engine's first-character optimization, so the combined
+                # expression only finds candidate positions and the individual rules are then matched at each one.
+                self.patterns[stage] = re.compile("|".join([r.expression for r in rules]))
+
+    @property
+    def digest(self) -> str:
+        """
+        Hashes the declaration of every rule, such that a change to any pattern, message or option yields a new digest
+        """
+        import json, hashlib
+
+        if self.__digest is None:
+            declarations = [[r.name, r.pattern, r.message, r.stage, r.severity, r.regex, r.each_match, r.languages, r.ignore_key, r.skip_md] for r in self.rules]
+            self.__digest = hashlib.sha256(json.dumps(declarations).encode("utf-8")).hexdigest()
+
+        return self.__digest
+
+    def scan(self, stage: str, command: str) -> Dict[str, Dict[str, int]]:
+        """
+        Scans the command once returning, for each rule that matched, the position of the first occurrence of each distinct match.
+        The time spent matching each rule at each candidate position is charged to that rule, the whole scan to the stage.
+        """
+        import time
+
+        start = time.perf_counter()
+        hits: Dict[str, Dict[str, int]] = dict()
+        rule_seconds: Dict[str, float] = dict()
+
+        pattern = self.patterns.get(stage)
+        m = None if pattern is None else pattern.search(command)
+
+        while m is not None:
+            pos = m.start()
+
+            # More than one rule may match at the same position, or overlap with the next
+            for rule in self.stage_rules[stage]:
+                rule_start = time.perf_counter()
+                rule_match = self.rule_patterns[rule.name].match(command, pos)
+                rule_seconds[rule.name] = rule_seconds.get(rule.name, 0.0) + time.perf_counter() - rule_start
+
+                if rule_match is not None:
+                    matches = hits.setdefault(rule.name, dict())
+                    matches.setdefault(rule_match.group(), pos)
+
+            m = pattern.search(command, pos + 1)
+
+        with self.__lock:
+            self.scan_seconds[stage] += time.perf_counter() - start
+            for name, seconds in rule_seconds.items():
+                self.rule_seconds[name] += seconds
+
+        return hits
+
+    def apply(self, notebook, stage: str, language: Union[None, str], command: str, i: int = -1, is_md: bool = False) -> None:
+        """
+        Evaluates all the rules of the specified stage against the command, reporting errors and warnings to the notebook in rule order.
+        :param notebook: The NotebookDef to which errors and warnings are reported
+        :param stage: One of STAGE_SOURCE, STAGE_CELL or STAGE_CONTENTS
+        :param language: The lower-case language of the notebook or None when not applicable
+        :param command: The text to be scanned
+        :param i: The zero-based index to the command within the notebook
+        :param is_md: True if the command is a %md cell
+        :return: None
+        """
+        import time
+
+        hits = self.scan(stage, command)
+        if len(hits) == 0:
+            return
+
+        for rule in self.stage_rules[stage]:
+            if rule.name not in hits:
+                continue
+            elif language is not None and not rule.applies_to(language, is_md, notebook.ignoring):
+                continue
+
+            start = time.perf_counter()
+            matches = hits.get(rule.name)
+            keys = sorted(matches.keys()) if rule.each_match else [min(matches, key=matches.get)]
+
+            for match in keys:
+                message = rule.format(i, command, match, matches.get(match))
+                if rule.severity == SEVERITY_ERROR:
+                    notebook.test(lambda: False, message)
+                else:
+                    notebook.warn(lambda: False, message)
+
+            with self.__lock:
+                self.rule_hits[rule.name] += len(keys)
+                self.rule_seconds[rule.name] += time.perf_counter() - start
+
+    def print_timings(self) -> None:
+        print("Rule timings:")
+        for stage, seconds in self.scan_seconds.items():
+            print(f"  scan:{stage:<40} {seconds*1000:>10.2f} ms")
+
+        for rule in self.rules:
+            hits = self.rule_hits.get(rule.name)
+            if hits > 0 or self.rule_seconds.get(rule.name) > 0:
+                print(f"  {rule.name:<45} {self.rule_seconds.get(rule.name)*1000:>10.2f} ms   {hits:,} hits")
@@ -0,0 +1,102 @@
+from typing import Dict, List, Tuple
+
+
+class DeltaPlan:
+    """
+    The minimal set of imports, overwrites and deletes required to bring a target directory in sync with the
+    generated notebooks, as determined by comparing the content hash of each notebook.
+    """
+    def __init__(self, target_dir: str, keepers: List[str]):
+        self.target_dir = target_dir
+        self.keepers = [f"{target_dir}/{k}" for k in keepers]
+
+        self.adds: Dict[str, Tuple[str, str]] = dict()     # path -> (language, source)
+        self.updates: Dict[str, Tuple[str, str]] = dict()  # path -> (language, source)
+        self.deletes: List[str] = list()
+        self.unchanged: List[str] = list()
+
+    @staticmethod
+    def digest(language: str, source: str) -> str:
+        """
+        Hashes the exact text of each of the notebook's commands, rather than its raw source, so that only the line breaks
+        around the delimiters between commands and at the end of the notebook, as introduced by the round trip through the
+        workspace, do not register as changes. Trailing whitespace is significant, two spaces being a hard break in Markdown.
+        """
+        import hashlib
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+
+        sha = hashlib.sha256(language.lower().encode("utf-8"))
+        for command in DbcArchive.to_commands(language, source):
+            sha.update(b"\x00")
+            sha.update(command.get("command").strip("\n").encode("utf-8"))
+
+        return sha.hexdigest()
+
+    def is_kept(self, path: str) -> bool:
+        for keeper in self.keepers:
+            if path == keeper or path.startswith(f"{keeper}/"):
+                return True
+        return False
+
+    def compute(self, generated: Dict[str, Tuple[str, str]], existing: Dict[str, Tuple[str, str]], existing_paths: List[str]) -> "DeltaPlan":
+        """
+        :param generated: The notebooks to be published, as path -> (language, source)
+        :param existing: The notebooks currently in the target directory, as path -> (language, source)
+        :param existing_paths: Every path, notebook or otherwise, currently in the target directory
+        :return: this plan
+        """
+        for path in sorted(generated.keys()):
+            language, source = generated.get(path)
+
+            if path not in existing:
+                self.adds[path] = (language, source)
+            elif self.digest(*existing.get(path)) != self.digest(language, source):
+                self.updates[path] = (language, source)
+            else:
+                self.unchanged.append(path)
+
+        # Directories that will contain at least one notebook must survive
+        directories = set()
+        for path in generated.keys():
+            while "/" in path and path != self.target_dir:
+                path = path[:path.rfind("/")]
+                directories.add(path)
+
+        for path in sorted(set(existing_paths) | set(existing.keys())):
+            if path in generated or path in directories or self.is_kept(path):
+                continue
+            elif any(path.startswith(f"{d}/") for d in self.deletes):
+                continue  # Already removed along with its parent directory
+            else:
+                self.deletes.append(path)
+
+        return self
+
+    @property
+    def changes(self) -> int:
+        return len(self.adds) + len(self.updates) + len(self.deletes)
+
+    def print_plan(self) -> None:
+        print(f"Delta plan for {self.target_dir}")
+        print(f"  adds:      {len(self.adds)}")
+        print(f"  updates:   {len(self.updates)}")
+        print(f"  deletes:   {len(self.deletes)}")
+        print(f"  unchanged: {len(self.unchanged)}")
+
+        for path in self.adds: print(f"  + {path}")
+        for path in self.updates: print(f"  ~ {path}")
+        for path in self.deletes: print(f"  - {path}")
+
+    def apply(self, client) -> None:
+        from dbacademy_courseware.dbbuild.directory_plan_class import DirectoryPlan
+
+        for path in self.deletes:
+            client.workspace().delete_path(path)
+
+        DirectoryPlan().create(client, self.adds)
+
+        for path, (language, source) in list(self.adds.items()) + list(self.updates.items()):
+            client.workspace.import_notebook(language=language.upper(),
+                                             notebook_path=path,
+                                             content=source,
+                                             overwrite=True)
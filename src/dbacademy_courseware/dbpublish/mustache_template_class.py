@@ -0,0 +1,37 @@
+import re
+from typing import Dict, List, Tuple
+
+# Any {{key}} placeholder; braces are excluded so that "{{{key}}}" yields "{value}", as did replacing each key in turn
+MUSTACHE_PATTERN = re.compile(r"{{([^{}]*)}}")
+
+# The keys that, when left unresolved, are reported as errors. Other placeholders, such as "{{ var }}" in
+# code samples, are not ours and are left untouched.
+# noinspection RegExpDuplicateCharacterInClass
+UNRESOLVED_KEY_PATTERN = re.compile(r"[a-zA-Z\-\\_\\#\\/]*")
+
+
+class MustacheTemplate:
+    """
+    Substitutes every {{key}} placeholder in a single pass over the text, independent of the number of replacements.
+    """
+    def __init__(self, replacements: Dict[str, str]):
+        self.replacements = replacements
+        self.unresolved: List[Tuple[str, int]] = list()  # (placeholder, position) of the last render
+
+    def render(self, text: str) -> str:
+        self.unresolved = list()
+
+        def substitute(match: re.Match) -> str:
+            key = match.group(1)
+            if key in self.replacements:
+                return self.replacements[key]
+
+            if UNRESOLVED_KEY_PATTERN.fullmatch(key):
+                self.unresolved.append((match.group(), match.start()))
+
+            return match.group()
+
+        return MUSTACHE_PATTERN.sub(substitute, text)
+
+    def describe_unresolved(self) -> str:
+        return ", ".join([f"{placeholder} at position {pos}" for placeholder, pos in self.unresolved])
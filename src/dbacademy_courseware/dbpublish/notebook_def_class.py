@@ -1,5 +1,10 @@
-from typing import Callable, Union, List
+import functools
+from typing import Callable, Union, List, Tuple, Dict
 from dbacademy_courseware.dbbuild import common
+from dbacademy_courseware.dbbuild.course_path_index_class import CoursePathIndex
+from dbacademy_courseware.dbbuild.text_writer_class import TextWriter
+from dbacademy_courseware.dbpublish.cell_rule_set_class import STAGE_SOURCE, STAGE_CELL, STAGE_CONTENTS
+from dbacademy_courseware.dbpublish.cell_class import Cell
 
 D_TODO = "TODO"
 D_ANSWER = "ANSWER"
@@ -14,6 +19,11 @@ D_INCLUDE_FOOTER_FALSE = "INCLUDE_FOOTER_FALSE"
 SUPPORTED_DIRECTIVES = [D_SOURCE_ONLY, D_ANSWER, D_TODO, D_DUMMY,
                         D_INCLUDE_HEADER_TRUE, D_INCLUDE_HEADER_FALSE, D_INCLUDE_FOOTER_TRUE, D_INCLUDE_FOOTER_FALSE, ]
 
+# The outcome of NotebookDef.create_resource_bundle()
+RESOURCE_GENERATED = "generated"
+RESOURCE_UNCHANGED = "unchanged"
+RESOURCE_SKIPPED = "skipped"
+
 
 class NotebookError:
     def __init__(self, message):
@@ -65,10 +75,14 @@ class NotebookDef:
         self.i18n = i18n
         self.i18n_language = i18n_language
         self.i18n_guids = list()
+        self.i18n_guid_cells: Dict[str, int] = dict()  # guid -> zero-based command index
 
         self.ignoring = ignoring
         self.version = version
 
+        # The target path, language and final source of each notebook generated by the last call to publish()
+        self.published_notebooks: Dict[str, Tuple[str, str]] = dict()
+
     def __str__(self):
         result = self.path
         result += f"\n - include_solution = {self.include_solution}"
@@ -110,46 +124,23 @@ class NotebookDef:
         if print_warnings:
             self.assert_no_warnings()
 
-    def test_notebook_exists(self, i, what, original_target, target, other_notebooks):
+    def test_notebook_exists(self, i, what, original_target, target, other_notebooks: Union[list, CoursePathIndex]):
         if not target.startswith("../") and not target.startswith("./"):
             self.warn(lambda: False, f"Cmd #{i+1} | Found unexpected, relative, {what} target: \"{original_target}\" resolved as \"{target}\"".strip())
             return
 
-        all_paths = set()
-        for other in other_notebooks:
-            # Add the original notebook's path
-            all_paths.add(other.path)
-
-            # Get the notebook's directory
-            directory = '/'.join(other.path.split("/")[:-1])
-            all_paths.add(directory)
-
-            # While there are still parent directories, keep processing
-            while directory.count("/") > 0:
-                directory = '/'.join(directory.split("/")[:-1])
-                all_paths.add(directory)
-
-        offset = -1
-
-        if target.startswith("../"):
-            while target.startswith("../"):
-                offset -= 1
-                target = target[3:] 
-
-        elif target.startswith("./"):
-            target = target[2:]
-
-        if "/" in self.path:
-            parent = '/'.join(self.path.split("/")[:offset])
-            target = f"{parent}/{target}"
-
-        if target.startswith("/"): target = target[1:]
-
-        notebooks = [n for n in all_paths if target == n]
+        path_index = self.to_path_index(other_notebooks)
+        target = path_index.resolve(self.path, target)
 
         message = f"Cmd #{i+1} | Cannot find notebook for the {what} target: \"{original_target}\" resolved as \"{target}\""
-        # self.test(lambda: len(notebooks) != 0, message)
-        self.test(lambda: len(notebooks) != 0, message)
+        self.test(lambda: target in path_index, message)
+
+    @staticmethod
+    def to_path_index(other_notebooks: Union[list, CoursePathIndex]) -> CoursePathIndex:
+        if type(other_notebooks) == CoursePathIndex:
+            return other_notebooks
+        else:
+            return CoursePathIndex.from_notebooks(other_notebooks)
 
     @staticmethod
     def get_latest_commit_id(repo_name):
@@ -204,12 +195,12 @@ class NotebookDef:
             else:
                 # We are building from the head, so we need to lock in the version number.
                 name = url.split("/")[-1]
-                commit_id = NotebookDef.get_latest_commit_id(name)
+                commit_id = self.build_config.commit_resolver.resolve(name)
                 new_url = f"{url}@{commit_id}"
                 print(f"Publishing w/commit \"{commit_id}\" for {url}")
                 return command.replace(url, new_url)
 
-    def test_pip_cells(self, language: str, command: str, i: int) -> str:
+    def test_pip_cells(self, language: str, command: Union[str, Cell], i: int) -> str:
         """
         Validates %pip cells, mostly to ensure that dbacademy-* resources are fixed to a specific version
         :param language: The language of the corresponding notebook
@@ -220,9 +211,9 @@ class NotebookDef:
         import re
 
         # First verify that the specified command is a %pip cell
-        cm = self.get_comment_marker(language)
-        prefix = f"{cm} MAGIC %pip"
-        if not command.startswith(prefix):
+        cell = Cell.of(language, command)
+        command = cell.text
+        if not cell.is_pip:
             return command
 
         command = self.update_git_commit(command, "git+https://github.com/databricks-academy/dbacademy-gems")
@@ -245,24 +236,23 @@ class NotebookDef:
 
         return command
 
-    def test_run_cells(self, language: str, command: str, i: int, other_notebooks: list) -> None:
+    def test_run_cells(self, language: str, command: Union[str, Cell], i: int, other_notebooks: Union[list, CoursePathIndex]) -> None:
         """
         Validates %run cells meet specific requirements
         :param language: The language of the corresponding notebook
         :param command: The %run command string to be evaluated
         :param i: The zero-based index to the command within the notebook
-        :param other_notebooks: A complete list of notebooks for cross-validation
+        :param other_notebooks: A complete list of notebooks, or the course's CoursePathIndex, for cross-validation
         :return: None
         """
 
         # First verify that the specified command is a %run cell
-        cm = self.get_comment_marker(language)
-        prefix = f"{cm} MAGIC %run"
-        if not command.startswith(prefix):
+        cell = Cell.of(language, command)
+        if not cell.is_run:
             return
 
-        line_zero = command.split("\n")[0]
-        link = line_zero[len(prefix):].strip()
+        prefix = f"{cell.cm} MAGIC %run"
+        link = cell.first_line[len(prefix):].strip()
 
         if link.startswith("\""):
             link = link[1:]
@@ -322,29 +312,9 @@ class NotebookDef:
 
             # Need to validate that the link exists.
 
-    def test_source_for(self, command: str, i: int, what: str):
-        if what in command:
-            pos = command.find(what)
-            pos_a = command.rfind("\n", 0, pos)
-            pos_a = 0 if pos_a == -1 else pos_a
-
-            pos_b = command.find("\n", pos)
-            pos_b = len(command)-1 if pos_b == -1 else pos_b
-
-            line = command[pos_a:pos_b].strip()
-
-            prefix = f"Cmd #{i+1} "
-            padding = " "*len(prefix)
-            if "prohibited-dataset" not in self.ignoring:
-                self.warn(lambda: False, f"{prefix}| Course includes prohibited use of {what}:\n{padding}| {line}")
-
-    def test_source_cells(self, language: str, command: str, i: int):
-
-        if language not in ["python", "scala", "sql", "java", "r"]:
-            return command
-
-        self.test_source_for(command, i, "/mnt/training")
-        self.test_source_for(command, i, "/databricks-datasets")
+    def test_source_cells(self, language: str, command: Union[str, Cell], i: int) -> str:
+        command = str(command)
+        self.build_config.cell_rules.apply(self, STAGE_SOURCE, language, command, i)
 
         return command
 
@@ -372,10 +342,11 @@ class NotebookDef:
             passed = passed and self.test(lambda: guid.startswith("--i18n-"), f"Cmd #{i + 1} | Expected word[1] of the first line of MD to start with \"--i18n-\", found {guid}: {debug_info}")
 
         if passed:
-            passed = passed and self.test(lambda: guid not in self.i18n_guids, f"Cmd #{i + 1} | Duplicate i18n GUID found: {guid}")
+            passed = passed and self.test(lambda: guid not in self.i18n_guid_cells, f"Cmd #{i + 1} | Duplicate i18n GUID found: {guid}")
 
         if passed:
             self.i18n_guids.append(guid)
+            self.i18n_guid_cells[guid] = i
 
             if not self.i18n_language:
                 # This is a "standard" publish, just remove the i18n directive
@@ -394,11 +365,12 @@ class NotebookDef:
 
         return command
 
-    def update_md_cells(self, language: str, command: str, i: int, i18n_guid_map: dict, other_notebooks: list):
+    def update_md_cells(self, language: str, command: Union[str, Cell], i: int, i18n_guid_map: dict, other_notebooks: Union[list, CoursePathIndex]) -> str:
 
         # First verify that the specified command is a mark-down cell
-        cm = self.get_comment_marker(language)
-        if not command.startswith(f"{cm} MAGIC %md"):
+        cell = Cell.of(language, command)
+        command = cell.text
+        if not cell.is_md:
             return command
             
         # No longer enforcing this requirement
@@ -410,12 +382,16 @@ class NotebookDef:
         if not self.i18n:
             return command
         else:
-            return self.replace_guid(cm=cm,
+            return self.replace_guid(cm=cell.cm,
                                      command=command,
                                      i=i,
                                      i18n_guid_map=i18n_guid_map)
 
-    def create_resource_bundle(self, natural_language: str, source_dir: str, target_dir: str) -> None:
+    def create_resource_bundle(self, natural_language: str, source_dir: str, target_dir: str) -> str:
+        """
+        Writes the notebook's MD cells to its i18n resource
+        :return: one of RESOURCE_GENERATED, RESOURCE_UNCHANGED or RESOURCE_SKIPPED
+        """
         natural_language = None if natural_language is None else natural_language.lower()
 
         assert type(natural_language) == str, f"""Expected the parameter "natural_language" to be of type "str", found "{type(natural_language)}" """
@@ -425,12 +401,8 @@ class NotebookDef:
         print("-" * 80)
         print(f".../{self.path}")
 
-        source_notebook_path = f"{source_dir}/{self.path}"
-
-        source_info = self.client.workspace().get_status(source_notebook_path)
-        language = source_info["language"].lower()
-
-        raw_source = self.client.workspace().export_notebook(source_notebook_path)
+        with self.build_config.metrics.phase("load_source", self.path):
+            language, raw_source = self.load_source(source_dir)
 
         cmd_delim = self.get_cmd_delim(language)
         commands = raw_source.split(cmd_delim)
@@ -446,9 +418,29 @@ class NotebookDef:
 
         if len(md_commands) == 0:
             print(f"Skipping resource - 0 MD cells: {self.path}")
+            return RESOURCE_SKIPPED
         else:
             # self.publish_resource(language, md_commands, resource_root, resource_path)
-            self.publish_resource(language, md_commands, target_dir, natural_language)
+            with self.build_config.metrics.phase("publish_resource", self.path):
+                return self.publish_resource(language, md_commands, target_dir, natural_language)
+
+    def load_source(self, source_dir: str) -> Tuple[str, str]:
+        """
+        Loads this notebook's source from the build's source archive, when one was exported, or directly from the workspace
+        :param source_dir: The directory containing the source notebooks
+        :return: The tuple (language, raw_source) where language is in lower case
+        """
+        source_notebook_path = f"{source_dir}/{self.path}"
+
+        source_archive = self.build_config.source_archive
+        if source_archive is not None and source_notebook_path in source_archive:
+            return source_archive.get(source_notebook_path)
+
+        # Served from the listing made at the start of each stage, see BuildConfig.refresh_source_metadata(), instead of
+        # one get_status() per notebook
+        source_info = self.build_config.metadata.get_status(self.client, source_notebook_path)
+
+        return self.build_config.source_cache.get(self.client, source_notebook_path, source_info)
 
     def load_i18n_source(self, i18n_resources_dir):
         import os
@@ -467,32 +459,30 @@ class NotebookDef:
         return None
 
     def load_i18n_guid_map(self, i18n_source: str):
-        import re
+        from dbacademy_courseware.dbbuild.i18n_bundle_class import I18nBundle
 
         if i18n_source is None:
             return dict()
 
-        i18n_guid_map = dict()
-
-        # parts = re.split(r"^<hr>--i18n-", i18n_source, flags=re.MULTILINE)
-        parts = re.split(r"^<hr>--i18n-|^<hr sandbox>--i18n-", i18n_source, flags=re.MULTILINE)
-
-        name = parts[0].strip()[3:]
+        name, guids = I18nBundle.parse(i18n_source)
         self.test(lambda: name == self.path, f"Expected the notebook \"{self.path}\" but found\n                      \"{name}\"")
 
-        for part in parts[1:]:
-            guid, value = self.parse_guid_and_value(part)
+        return dict(guids)
 
-            i18n_guid_map[guid] = value
-
-            # sandbox_parts = re.split(r"^<hr sandbox>--i18n-", value, flags=re.MULTILINE)
-            # i18n_guid_map[guid] = sandbox_parts[0]
+    def load_i18n_bundle(self, i18n_resources_dir: str) -> Dict[str, str]:
+        """
+        Returns the same map as load_i18n_guid_map(load_i18n_source()) but from the build's index of the language's
+        resources, parsed once for all notebooks.
+        """
+        resource = self.build_config.i18n_bundle(i18n_resources_dir).get(self.path)
 
-            # for sandbox_part in sandbox_parts[1:]:
-            #     guid, value = self.parse_guid_and_value(sandbox_part)
-            #     i18n_guid_map[guid] = value
+        if resource is None:
+            # i18n_language better be None if the file doesn't exist, or it's in the "ignored" round zero or one
+            self.warn(lambda: self.i18n_language is None or self.test_round in [0, 1], f"Resource not found ({self.test_round}): /Workspace{i18n_resources_dir}/{self.path}.md")
+            return dict()
 
-        return i18n_guid_map
+        self.test(lambda: resource.name == self.path, f"Expected the notebook \"{self.path}\" but found\n                      \"{resource.name}\"")
+        return resource.guid_map
 
     @staticmethod
     def parse_guid_and_value(part):
@@ -504,7 +494,7 @@ class NotebookDef:
 
         return guid, value
 
-    def publish(self, source_dir: str, target_dir: str, i18n_resources_dir: str, verbose: bool, debugging: bool, other_notebooks: list) -> None:
+    def publish(self, source_dir: str, target_dir: str, i18n_resources_dir: str, verbose: bool, debugging: bool, other_notebooks: list, path_index: CoursePathIndex = None, write: bool = True, source: Tuple[str, str] = None) -> None:
         assert type(source_dir) == str, f"""Expected the parameter "source_dir" to be of type "str", found "{type(source_dir)}" """
         assert type(target_dir) == str, f"""Expected the parameter "target_dir" to be of type "str", found "{type(target_dir)}" """
         assert type(i18n_resources_dir) == str, f"""Expected the parameter "resources_dir" to be of type "str", found "{type(i18n_resources_dir)}" """
@@ -515,22 +505,52 @@ class NotebookDef:
         for i, notebook in enumerate(other_notebooks):
             assert type(other_notebooks[i]) == NotebookDef, f"""Expected the parameter "other_notebooks[{i}]" to be of type "NotebookDef", found "{type(other_notebooks[i])}" """
 
-        self.errors = list()
-        self.warnings = list()
-        self.i18n_guids = list()
+        # Resolve every %run and MD link against one index instead of rebuilding it for each link
+        path_index = self.to_path_index(other_notebooks) if path_index is None else path_index
+
+        self.print_header()
+
+        payload = self.prepare(source_dir, i18n_resources_dir, path_index, debugging, source)
+
+        with self.build_config.metrics.phase("validate", self.path):
+            students_commands, solutions_commands = self.transform(payload)
+
+        self.finish(target_dir, payload.language, students_commands, solutions_commands, verbose, write)
 
+    def print_header(self) -> None:
         print()
         print("=" * 80)
         print(f".../{self.path}")
 
-        source_notebook_path = f"{source_dir}/{self.path}"
-        source_info = self.client.workspace().get_status(source_notebook_path)
-        language = source_info["language"].lower()
+    def prepare(self, source_dir: str, i18n_resources_dir: str, path_index: CoursePathIndex, debugging: bool, source: Tuple[str, str] = None):
+        """
+        Loads the notebook's source and i18n resource, returning the NotebookPayload from which transform() produces the
+        student's and solution's commands; loading requires the workspace whereas the transformation does not.
+        """
+        from dbacademy_courseware.dbpublish.notebook_payload_class import NotebookPayload
+
+        self.errors = list()
+        self.warnings = list()
+        self.i18n_guids = list()
+        self.i18n_guid_cells = dict()
+        self.published_notebooks = dict()
+
+        with self.build_config.metrics.phase("load_source", self.path):
+            language, raw_source = self.load_source(source_dir) if source is None else source
+
+        i18n_guid_map = self.load_i18n_bundle(i18n_resources_dir)
 
-        raw_source = self.client.workspace().export_notebook(source_notebook_path)
+        return NotebookPayload(self, language, raw_source, i18n_guid_map, path_index, debugging)
 
-        i18n_source = self.load_i18n_source(i18n_resources_dir)
-        i18n_guid_map = self.load_i18n_guid_map(i18n_source)
+    def transform(self, payload) -> Tuple[List[str], List[str]]:
+        """
+        Validates every command of the payload's source, returning the tuple (students_commands, solutions_commands)
+        """
+        language = payload.language
+        raw_source = payload.raw_source
+        i18n_guid_map = payload.i18n_guid_map
+        path_index = payload.path_index
+        debugging = payload.debugging
 
         skipped = 0
         students_commands = []
@@ -553,24 +573,24 @@ class NotebookDef:
                 print("\n" + ("=" * 80))
                 print(f"Debug Command {i + 1}")
 
-            command = commands[i].lstrip()
+            # Parsed once and shared by every pass until one of them rewrites the command
+            cell = Cell(language, commands[i].lstrip())
 
-            self.test(lambda: "DBTITLE" not in command, f"Cmd #{i+1} | Unsupported Cell-Title found")
-
-            # Misc tests for language specific cells
-            command = self.test_source_cells(language, command, i)
+            # Misc tests for cell titles, prohibited datasets and other language specific cells
+            self.test_source_cells(language, cell, i)
 
             # Misc tests specific to %md cells along with i18n specific rewrites
-            command = self.update_md_cells(language, command, i, i18n_guid_map, other_notebooks)
+            cell = cell.update(self.update_md_cells(language, cell, i, i18n_guid_map, path_index))
 
             # Misc tests specific to %run cells
-            self.test_run_cells(language, command, i, other_notebooks)
+            self.test_run_cells(language, cell, i, path_index)
 
             # Misc tests specific to %pip cells
-            command = self.test_pip_cells(language, command, i)
+            cell = cell.update(self.test_pip_cells(language, cell, i))
+            command = cell.text
 
             # Extract the leading comments and then the directives
-            leading_comments = self.get_leading_comments(language, command.strip())
+            leading_comments = cell.leading_comments
             directives = self.parse_directives(i, leading_comments)
 
             if debugging:
@@ -614,7 +634,8 @@ class NotebookDef:
             elif D_TODO in directives:
                 # This is a TO-DO cell, exclude from solution notebooks
                 todo_count += 1
-                command = self.clean_todo_cell(language, command, i)
+                command = self.clean_todo_cell(language, cell, i)
+                cell = cell.update(command)
                 students_commands.append(command)
 
             elif D_ANSWER in directives:
@@ -632,38 +653,12 @@ class NotebookDef:
                 students_commands.append(command)
                 solutions_commands.append(command)
 
-            # Check the command for BDC markers
-            bdc_tokens = ["IPYTHON_ONLY", "DATABRICKS_ONLY",
-                          "AMAZON_ONLY", "AZURE_ONLY", "TEST", "PRIVATE_TEST", "INSTRUCTOR_NOTE", "INSTRUCTOR_ONLY",
-                          "SCALA_ONLY", "PYTHON_ONLY", "SQL_ONLY", "R_ONLY"
-                                                                   "VIDEO", "ILT_ONLY", "SELF_PACED_ONLY", "INLINE",
-                          "NEW_PART", "{dbr}"]
-
-            for token in bdc_tokens:
-                self.test(lambda: token not in command, f"""Cmd #{i+1} | Found the token "{token}" """)
-
-            cm = self.get_comment_marker(language)
-            if not command.startswith(f"{cm} MAGIC %md"):
-                if language.lower() == "python":
-                    if "lang-python" not in self.ignoring:
-                        self.warn(lambda: "%python" not in command, f"""Cmd #{i+1} | Found "%python" in a Python notebook""")
-                elif language.lower() == "sql":
-                    if "lang-sql" not in self.ignoring:
-                        self.warn(lambda: "%sql" not in command, f"""Cmd #{i+1} | Found "%sql" in a SQL notebook""")
-                elif language.lower() == "scala":
-                    if "lang-scala" not in self.ignoring:
-                        self.warn(lambda: "%scala" not in command, f"""Cmd #{i+1} | Found "%scala" in a Scala notebook""")
-                elif language.lower() == "r":
-                    # We have to check both cases so as not to catch %run by accident
-                    if "lang-r" not in self.ignoring:
-                        self.warn(lambda: "%r " not in command,  f"""Cmd #{i+1} | Found "%r" in an R notebook""")
-                        self.warn(lambda: "%r\n" not in command, f"""Cmd #{i+1} | Found "%r" in an R notebook""")
-                else:
-                    raise Exception(f"The language {language} is not supported")
+            # Check the command for BDC markers, magic commands that duplicate the notebook's language and copyrights
+            is_md = cell.is_md
+            if not is_md and language.lower() not in ["python", "sql", "scala", "r"]:
+                raise Exception(f"The language {language} is not supported")
 
-            for year in range(2017, 2999):
-                tag = f"{year} Databricks, Inc"
-                self.test(lambda: tag not in command, f"""Cmd #{i+1} | Found copyright ({tag}) """)
+            self.build_config.cell_rules.apply(self, STAGE_CELL, language.lower(), command, i, is_md=is_md)
 
         self.test(lambda: found_header_directive, f"One of the two header directives ({D_INCLUDE_HEADER_TRUE} or {D_INCLUDE_HEADER_FALSE}) were not found.")
         self.test(lambda: found_footer_directive, f"One of the two footer directives ({D_INCLUDE_FOOTER_TRUE} or {D_INCLUDE_FOOTER_FALSE}) were not found.")
@@ -681,74 +676,145 @@ class NotebookDef:
             # Not checking for forward slash as the platform itself enforces this.
             self.warn(lambda: key not in self.path,  f"Found invalid character {key} in notebook name: {self.path}")
 
+        return students_commands, solutions_commands
+
+    def merge(self, result) -> None:
+        """
+        Merges the NotebookResult of a transform() performed in another process into this notebook
+        """
+        self.errors.extend([NotebookError(m) for m in result.errors])
+        self.warnings.extend([NotebookError(m) for m in result.warnings])
+        self.i18n_guids.extend(result.i18n_guids)
+        self.i18n_guid_cells.update(result.i18n_guid_cells)
+
+    def finish(self, target_dir: str, language: str, students_commands: List[str], solutions_commands: List[str], verbose: bool, write: bool) -> None:
+        # Duplicates across notebooks can only be reported once every notebook was transformed, see Publisher
+        self.build_config.guid_registry.update(self.path, self.i18n_guid_cells)
+
         # Create the student's notebooks
         students_notebook_path = f"{target_dir}/{self.path}"
         common.print_if(verbose, students_notebook_path)
         common.print_if(verbose, f"...publishing {len(students_commands)} commands")
-        self.publish_notebook(language, students_commands, students_notebook_path, print_warnings=True)
+        self.publish_notebook(language, students_commands, students_notebook_path, print_warnings=True, write=write)
 
         # Create the solutions notebooks
         if self.include_solution:
             solutions_notebook_path = f"{target_dir}/Solutions/{self.path}"
             common.print_if(verbose, solutions_notebook_path)
             common.print_if(verbose, f"...publishing {len(solutions_commands)} commands")
-            self.publish_notebook(language, solutions_commands, solutions_notebook_path, print_warnings=False)
+            self.publish_notebook(language, solutions_commands, solutions_notebook_path, print_warnings=False, write=write)
 
-    def publish_resource(self, language: str, md_commands: list, target_dir: str, natural_language: str) -> None:
+    def lint(self, source_dir: str, i18n_resources_dir: str, other_notebooks: list, path_index: CoursePathIndex = None, cache=None) -> bool:
+        """
+        Runs every check performed by publish() without writing anything, collecting rather than raising errors.
+        :param cache: The LintCache from which unchanged notebooks are answered, or None to always validate
+        :return: True if the results were served from the cache
+        """
+        from dbacademy_courseware.dbbuild.lint_cache_class import LintCache
+
+        language, raw_source = self.load_source(source_dir)
+
+        key = None
+        if cache is not None:
+            i18n_source = self.load_i18n_source(i18n_resources_dir)
+            key = LintCache.key(self, language, raw_source, i18n_source, [n.path for n in other_notebooks])
+
+            cached = cache.get(key)
+            if cached is not None:
+                errors, warnings = cached
+                self.errors = [NotebookError(m) for m in errors]
+                self.warnings = [NotebookError(m) for m in warnings]
+                return True
+
+        try:
+            self.publish(source_dir=source_dir,
+                         target_dir=f"{self.build_config.source_repo}/Lint",
+                         i18n_resources_dir=i18n_resources_dir,
+                         verbose=False,
+                         debugging=False,
+                         other_notebooks=other_notebooks,
+                         path_index=path_index,
+                         write=False,
+                         source=(language, raw_source))
+        except Exception:
+            if len(self.errors) == 0:
+                raise  # Not one of our validation errors
+
+        if cache is not None:
+            cache.put(key, self.path, [e.message for e in self.errors], [w.message for w in self.warnings])
+
+        return False
+
+    def publish_resource(self, language: str, md_commands: list, target_dir: str, natural_language: str) -> str:
+        """
+        Writes the resource unless the existing file already has the same content
+        :return: RESOURCE_GENERATED or RESOURCE_UNCHANGED
+        """
         import os
+        import hashlib
 
         m = self.get_comment_marker(language)
         target_path = f"{target_dir}/{natural_language}/{self.path}"
 
-        final_source = f"# /{self.path}\n"
+        writer = TextWriter().writeln(f"# /{self.path}")
 
         # Processes all commands except the last
         for md_command in md_commands:
             md_command = md_command.replace(f"{m} MAGIC ", "")
             md_command = md_command.replace(f"%md-sandbox --i18n-", f"<hr sandbox>--i18n-")
             md_command = md_command.replace(f"%md --i18n-", f"<hr>--i18n-")
-            final_source += md_command
-            final_source += "\n"
+            writer.writeln(md_command)
 
-        final_source = self.replace_contents(final_source)
+        final_source = self.replace_contents(writer.getvalue())
 
-        target_file = "/Workspace"+target_path+".md"
+        target_file = common.WORKSPACE_FS+target_path+".md"
         target_dir = "/".join(target_file.split("/")[:-1])
-        if not os.path.exists(target_dir):
-            os.makedirs(target_dir)
+
+        # Notebooks of the same folder may be published concurrently, the first of which creates the directory
+        os.makedirs(target_dir, exist_ok=True)
 
         if os.path.exists(target_file):
+            with open(target_file, "rb") as f:
+                existing_digest = hashlib.sha256(f.read()).hexdigest()
+
+            if existing_digest == hashlib.sha256(final_source.encode("utf-8")).hexdigest():
+                return RESOURCE_UNCHANGED
+
             os.remove(target_file)
 
         with open(target_file, "w") as w:
             w.write(final_source)
 
-    def publish_notebook(self, language: str, commands: list, target_path: str, print_warnings: bool) -> None:
+        return RESOURCE_GENERATED
+
+    def publish_notebook(self, language: str, commands: list, target_path: str, print_warnings: bool, write: bool = True) -> None:
         m = self.get_comment_marker(language)
-        final_source = f"{m} Databricks notebook source\n"
+        writer = TextWriter().writeln(f"{m} Databricks notebook source")
 
-        # Processes all commands except the last
-        for command in commands[:-1]:
-            final_source += command
-            final_source += self.get_cmd_delim(language)
+        # Processes all commands, delimited from each other
+        writer.write_all(commands, separator=self.get_cmd_delim(language))
 
-        # Process the last command
-        m = self.get_comment_marker(language)
-        final_source += commands[-1]
-        final_source += "" if commands[-1].startswith(f"{m} MAGIC") else "\n\n"
+        # Terminate the last command
+        writer.write("" if commands[-1].startswith(f"{m} MAGIC") else "\n\n")
 
-        final_source = self.replace_contents(final_source)
+        final_source = self.replace_contents(writer.getvalue())
 
         self.assert_no_errors(print_warnings)
 
-        parent_dir = "/".join(target_path.split("/")[0:-1])
-        self.client.workspace().mkdirs(parent_dir)
-        self.client.workspace().import_notebook(language.upper(), target_path, final_source)
+        self.published_notebooks[target_path] = (language.lower(), final_source)
+        if not write:
+            return  # The caller is responsible for writing the published notebooks
 
-    def clean_todo_cell(self, source_language, command, i):
-        new_command = ""
-        lines = command.split("\n")
-        source_m = self.get_comment_marker(source_language)
+        with self.build_config.metrics.phase("import_notebook", self.path):
+            parent_dir = "/".join(target_path.split("/")[0:-1])
+            self.build_config.directories.ensure(self.client, parent_dir)  # Typically already created by the Publisher
+            self.client.workspace().import_notebook(language.upper(), target_path, final_source)
+
+    def clean_todo_cell(self, source_language, command: Union[str, Cell], i):
+        new_lines = []
+        cell = Cell.of(source_language, command)
+        lines = cell.lines
+        source_m = cell.cm
 
         first = 0
         prefix = source_m
@@ -765,56 +831,46 @@ class NotebookDef:
 
             if index == 0 and first == 1:
                 # This is the first line, but the first is a magic command
-                new_command += line
+                new_lines.append(line)
 
             elif (index == first) and line.strip() not in [f"{prefix} {D_TODO}"]:
                 self.test(lambda: False, f"""Cmd #{i + 1} | Expected line #{index + 1} to be the "{D_TODO}" directive: "{line}" """)
+                new_lines.append("")  # The line is dropped, but not its line break
 
             elif not line.startswith(prefix) and line.strip() != "" and line.strip() != f"{source_m} MAGIC":
                 self.test(lambda: False, f"""Cmd #{i + 1} | Expected line #{index + 1} to be commented out: "{line}" with prefix "{prefix}" """)
+                new_lines.append("")  # The line is dropped, but not its line break
 
             elif line.strip().startswith(f"{prefix} {D_TODO}"):
                 # Add as-is
-                new_command += line
+                new_lines.append(line)
 
             elif line.strip() == "" or line.strip() == f"{source_m} MAGIC":
                 # No comment, do not process
-                new_command += line
+                new_lines.append(line)
 
             elif line.strip().startswith(f"{prefix} "):
                 # Remove comment and space
                 length = len(prefix) + 1
-                new_command += line[length:]
+                new_lines.append(line[length:])
 
             else:
                 # Remove just the comment
                 length = len(prefix)
-                new_command += line[length:]
-
-            # Add new line for all but the last line
-            if index < len(lines) - 1:
-                new_command += "\n"
+                new_lines.append(line[length:])
 
-        return new_command
+        return "\n".join(new_lines)
 
     def replace_contents(self, contents: str):
-        import re
+        from dbacademy_courseware.dbpublish.mustache_template_class import MustacheTemplate
 
-        for key in self.replacements:
-            old_value = "{{" + key + "}}"
-            new_value = self.replacements[key]
-            contents = contents.replace(old_value, new_value)
+        template = MustacheTemplate(self.replacements)
+        contents = template.render(contents)
 
-        # TODO Fix this error after a proper unit tests is created.
-        # noinspection RegExpDuplicateCharacterInClass
-        mustache_pattern = re.compile(r"{{[a-zA-Z\-\\_\\#\\/]*}}")
-        result = mustache_pattern.search(contents)
-        if result is not None:
-            self.test(lambda: False, f"A mustache pattern was detected after all replacements were processed: {result}")
+        if len(template.unresolved) > 0:
+            self.test(lambda: False, f"A mustache pattern was detected after all replacements were processed: {template.describe_unresolved()}")
 
-        for icon in [":HINT:", ":CAUTION:", ":BESTPRACTICE:", ":SIDENOTE:", ":NOTE:"]:
-            if icon in contents:
-                self.test(lambda: False, f"The deprecated {icon} pattern was found after all replacements were processed.")
+        self.build_config.cell_rules.apply(self, STAGE_CONTENTS, None, contents)
 
         # No longer supported
         # replacements[":HINT:"] =         """<img src="https://files.training.databricks.com/images/icon_hint_24.png"/>&nbsp;**Hint:**"""
@@ -825,6 +881,7 @@ class NotebookDef:
         return contents
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_comment_marker(language):
         language = language.replace("%", "")
 
@@ -846,64 +903,9 @@ class NotebookDef:
         marker = NotebookDef.get_comment_marker(language)
         return f"\n{marker} COMMAND ----------\n"
 
-    def get_leading_comments(self, language, command) -> list:
-        leading_comments = []
-        lines = command.split("\n")
-
-        source_m = self.get_comment_marker(language)
-        first_line = lines[0].lower()
-
-        if first_line.startswith(f"{source_m} magic %md"):
-            cell_m = self.get_comment_marker("md")
-        elif first_line.startswith(f"{source_m} magic %sql"):
-            cell_m = self.get_comment_marker("sql")
-        elif first_line.startswith(f"{source_m} magic %python"):
-            cell_m = self.get_comment_marker("python")
-        elif first_line.startswith(f"{source_m} magic %scala"):
-            cell_m = self.get_comment_marker("scala")
-        elif first_line.startswith(f"{source_m} magic %run"):
-            cell_m = source_m  # Included to preclude trapping for R language below
-        elif first_line.startswith(f"{source_m} magic %r"):
-            cell_m = self.get_comment_marker("r")
-        else:
-            cell_m = source_m
-
-        for il in range(len(lines)):
-            line = lines[il]
-
-            # Start by removing any "source" prefix
-            if line.startswith(f"{source_m} MAGIC"):
-                length = len(source_m) + 6
-                line = line[length:].strip()
-
-            elif line.startswith(f"{source_m} COMMAND"):
-                length = len(source_m) + 8
-                line = line[length:].strip()
-
-            # Next, if it starts with a magic command, remove it.
-            if line.strip().startswith("%"):
-                # Remove the magic command from this line
-                pos = line.find(" ")
-                if pos == -1:
-                    line = ""
-                else:
-                    line = line[pos:].strip()
-
-            # Finally process the refactored-line for any comments.
-            if line.strip() == cell_m or line.strip() == "":
-                # empty comment line, don't break, just ignore
-                pass
-
-            elif line.strip().startswith(cell_m):
-                # append to our list
-                comment = line.strip()[len(cell_m):].strip()
-                leading_comments.append(comment)
-
-            else:
-                # All done, this is a non-comment
-                return leading_comments
-
-        return leading_comments
+    @staticmethod
+    def get_leading_comments(language, command: Union[str, Cell]) -> list:
+        return Cell.of(language, command).leading_comments
 
     def parse_directives(self, i, comments):
         import re
@@ -0,0 +1,134 @@
+from typing import Dict, List
+
+from dbacademy_courseware.dbbuild.course_path_index_class import CoursePathIndex
+
+
+class DetachedBuildConfig:
+    """
+    The subset of a BuildConfig consulted by NotebookDef.transform(), without the client, caches and locks that cannot
+    be pickled, such that a notebook can be transformed in another process.
+    """
+    def __init__(self, rules: list, i18n_xml_tag_disabled: bool, commit_resolver):
+        self.rules = rules
+        self.i18n_xml_tag_disabled = i18n_xml_tag_disabled
+        self.commit_resolver = commit_resolver
+        self.__cell_rules = None
+        self.__metrics = None
+
+    @property
+    def cell_rules(self):
+        from dbacademy_courseware.dbpublish.cell_rule_set_class import CellRuleSet
+
+        if self.__cell_rules is None:
+            self.__cell_rules = CellRuleSet(self.rules)
+        return self.__cell_rules
+
+    @property
+    def metrics(self):
+        from dbacademy_courseware.dbbuild.build_metrics_class import BuildMetrics
+
+        if self.__metrics is None:
+            self.__metrics = BuildMetrics()  # Not reported; each process keeps its own
+        return self.__metrics
+
+    def __getstate__(self):
+        return {"rules": self.rules, "i18n_xml_tag_disabled": self.i18n_xml_tag_disabled, "commit_resolver": self.commit_resolver}
+
+    def __setstate__(self, state):
+        self.__init__(state.get("rules"), state.get("i18n_xml_tag_disabled"), state.get("commit_resolver"))
+
+
+class NotebookPayload:
+    """
+    Everything required to transform, and thus validate, a single notebook once its source was loaded: the source,
+    its language, the notebook's replacements and configuration along with the course's path index. Unlike the
+    NotebookDef itself, a payload can be pickled and sent to another process.
+    """
+    def __init__(self, notebook, language: str, raw_source: str, i18n_guid_map: Dict[str, str], path_index: CoursePathIndex, debugging: bool):
+        self.path = notebook.path
+        self.language = language
+        self.raw_source = raw_source
+        self.i18n_guid_map = i18n_guid_map
+        self.path_index = path_index
+        self.debugging = debugging
+
+        self.replacements = dict(notebook.replacements)
+        self.include_solution = notebook.include_solution
+        self.test_round = notebook.test_round
+        self.ignored = notebook.ignored
+        self.order = notebook.order
+        self.i18n = notebook.i18n
+        self.i18n_language = notebook.i18n_language
+        self.ignoring = list(notebook.ignoring or [])
+        self.version = notebook.version
+
+        self.rules = list(notebook.build_config.cell_rules.rules)
+        self.i18n_xml_tag_disabled = notebook.build_config.i18n_xml_tag_disabled
+        self.commit_resolver = notebook.build_config.commit_resolver
+
+    def to_notebook(self):
+        """
+        Returns a NotebookDef, detached from any workspace, that can transform but not load or publish this payload
+        """
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        notebook = NotebookDef.__new__(NotebookDef)
+        notebook.build_config = DetachedBuildConfig(self.rules, self.i18n_xml_tag_disabled, self.commit_resolver)
+        notebook.client = None
+        notebook.path = self.path
+        notebook.replacements = dict(self.replacements)
+        notebook.include_solution = self.include_solution
+        notebook.errors = list()
+        notebook.warnings = list()
+        notebook.test_round = self.test_round
+        notebook.ignored = self.ignored
+        notebook.order = self.order
+        notebook.i18n = self.i18n
+        notebook.i18n_language = self.i18n_language
+        notebook.i18n_guids = list()
+        notebook.i18n_guid_cells = dict()
+        notebook.ignoring = list(self.ignoring)
+        notebook.version = self.version
+        notebook.published_notebooks = dict()
+        return notebook
+
+
+class NotebookResult:
+    """
+    The outcome of transforming a NotebookPayload: the messages of the errors and warnings, the i18n GUIDs that were
+    found along with the index of the command declaring each, the student's and solution's commands and anything
+    printed along the way.
+    """
+    def __init__(self, path: str, errors: List[str], warnings: List[str], i18n_guids: List[str], i18n_guid_cells: Dict[str, int], students_commands: List[str], solutions_commands: List[str], output: str):
+        self.path = path
+        self.errors = errors
+        self.warnings = warnings
+        self.i18n_guids = i18n_guids
+        self.i18n_guid_cells = i18n_guid_cells
+        self.students_commands = students_commands
+        self.solutions_commands = solutions_commands
+        self.output = output
+
+
+def transform_payload(payload: NotebookPayload) -> NotebookResult:
+    """
+    Transforms the payload, typically in a worker process of a ProcessPoolExecutor, capturing what was printed such
+    that the caller can replay it in order.
+    """
+    import io
+    import contextlib
+
+    notebook = payload.to_notebook()
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        students_commands, solutions_commands = notebook.transform(payload)
+
+    return NotebookResult(payload.path,
+                          [e.message for e in notebook.errors],
+                          [w.message for w in notebook.warnings],
+                          list(notebook.i18n_guids),
+                          dict(notebook.i18n_guid_cells),
+                          students_commands,
+                          solutions_commands,
+                          output.getvalue())
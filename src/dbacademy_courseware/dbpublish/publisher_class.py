@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Union
 from dbacademy_gems import dbgems
 from dbacademy_courseware import validate_type
 from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
@@ -50,6 +50,9 @@ class Publisher:
         self.notebooks = []
         self._init_notebooks(build_config.notebooks.values())
 
+        # Set by publish_notebooks() when the published notebooks are assembled locally
+        self.published_dbc: Union[None, bytes] = None
+
         self.white_list = build_config.white_list
         self.black_list = build_config.black_list
         self._validate_white_black_list()
@@ -91,8 +94,9 @@ class Publisher:
     #                 <p><a href="https://{domain}/?o={workspace_id}#workspace{resource_dir}/{language}/{self.version_info_notebook}.md" target="_blank">Resource Bundle: {language}</a></p>
     #             </body>"""
 
-    def create_resource_bundle(self, folder_name: str = None, target_dir: str = None):
+    def create_resource_bundle(self, folder_name: str = None, target_dir: str = None, bulk_export: bool = False, max_workers: int = None):
         from dbacademy_gems import dbgems
+        from dbacademy_courseware.dbpublish.notebook_def_class import RESOURCE_GENERATED, RESOURCE_UNCHANGED, RESOURCE_SKIPPED
 
         if self.i18n_language is not None:
             print(f"Print skipping generation of resource bundle for non-english release, {self.i18n_language}")
@@ -101,15 +105,27 @@ class Publisher:
         folder_name = folder_name or f"english-v{self.build_config.version}"
         target_dir = target_dir or f"{self.source_repo}/Resources"
 
-        for notebook in self.notebooks:
-            notebook.create_resource_bundle(folder_name, self.source_dir, target_dir)
+        self.build_config.refresh_source_metadata()
+        if bulk_export and self.build_config.source_archive is None:
+            self.build_config.load_source_archive()
+
+        def create_resource(notebook: NotebookDef) -> str:
+            return notebook.create_resource_bundle(folder_name, self.source_dir, target_dir)
+
+        if max_workers is None or max_workers <= 1:
+            results = [create_resource(n) for n in self.notebooks]
+        else:
+            results = common.parallel_map(create_resource, self.notebooks, max_workers)
+
+        print("-" * 80)
+        print(f"Generated {results.count(RESOURCE_GENERATED)}, unchanged {results.count(RESOURCE_UNCHANGED)}, skipped {results.count(RESOURCE_SKIPPED)} resources")
 
         html = f"""<body><p><a href="/#workspace{target_dir}/{folder_name}/{Publisher.VERSION_INFO_NOTEBOOK}.md" target="_blank">Resource Bundle: {folder_name}</a></p></body>"""
         dbgems.display_html(html)
 
         return True
 
-    def publish_notebooks(self, *, verbose=False, debugging=False, **kwargs):
+    def publish_notebooks(self, *, verbose=False, debugging=False, max_workers: int = None, processes: int = None, bulk_export: bool = False, assemble_dbc: bool = False, import_dbc: bool = False, delta: bool = False, report_file: str = None, **kwargs):
 
         assert self.validated, f"Cannot publish notebooks until the publisher passes validation. Ensure that Publisher.validate() was called and that all assignments passed."
 
@@ -135,6 +151,12 @@ class Publisher:
         print("Arguments:")
         print(f"  verbose =   {verbose}")
         print(f"  debugging = {debugging}")
+        print(f"  max_workers = {max_workers}")
+        print(f"  processes = {processes}")
+        print(f"  bulk_export = {bulk_export}")
+        print(f"  assemble_dbc = {assemble_dbc}")
+        print(f"  import_dbc = {import_dbc}")
+        print(f"  delta = {delta}")
 
         if self.black_list is None:
             print(f"  exclude:    none")
@@ -152,19 +174,80 @@ class Publisher:
             for path in self.white_list[1:]:
                 print(f"              {path}")
 
+        self.build_config.refresh_source_metadata()
+        if bulk_export and self.build_config.source_archive is None:
+            # One download of the entire source directory instead of one export per notebook
+            print("-" * 80)
+            self.build_config.load_source_archive()
+
+        # One lookup per repo for the entire build, as opposed to one for every %pip command of every notebook
+        self.build_config.commit_resolver.resolve_all()
+
+        assert not (delta and import_dbc), "The parameters \"delta\" and \"import_dbc\" are mutually exclusive."
+
+        if import_dbc:
+            # Repos do not support the import of DBCs, and the DBC replaces the entire directory
+            assert not self.target_dir.startswith("/Repos/"), f"Cannot import a DBC into the repo \"{self.target_dir}\", see Publisher.configure_target_repo()"
+
+        self.published_dbc = None
+
         # Now that we backed up the version-info, we can delete everything.
         target_status = self.client.workspace().get_status(self.target_dir)
-        if target_status is not None:
+        metrics = self.build_config.metrics
+        if target_status is not None and import_dbc:
+            common.print_if(verbose, "-" * 80)
+            with metrics.phase("clean_target_dir"):
+                self.client.workspace().delete_path(self.target_dir)
+                self.build_config.metadata.invalidate(self.target_dir)
+                self.build_config.directories.invalidate(self.target_dir)
+        elif target_status is not None and not delta:
             common.print_if(verbose, "-" * 80)
-            common.clean_target_dir(self.client, self.target_dir, verbose)
+            with metrics.phase("clean_target_dir"):
+                common.clean_target_dir(self.client, self.target_dir, verbose)
+                self.build_config.metadata.invalidate(self.target_dir)
+                self.build_config.directories.invalidate(self.target_dir)
 
-        for notebook in main_notebooks:
+        if not import_dbc and not delta:
+            # Every directory is created once, up front, instead of once per notebook
+            target_paths = [f"{self.target_dir}/{n.path}" for n in main_notebooks]
+            target_paths.extend([f"{self.target_dir}/Solutions/{n.path}" for n in main_notebooks if n.include_solution])
+
+            with metrics.phase("create_directories"):
+                self.build_config.directories.create(self.client, target_paths, max_workers)
+
+        def publish_notebook(notebook: NotebookDef):
             notebook.publish(source_dir=self.source_dir,
                              target_dir=self.target_dir,
                              i18n_resources_dir=self.i18n_resources_dir,
                              verbose=verbose, 
                              debugging=debugging,
-                             other_notebooks=self.notebooks)
+                             other_notebooks=self.notebooks,
+                             path_index=self.build_config.path_index,
+                             write=not import_dbc and not delta)
+
+        if processes is not None and processes > 1:
+            # The validation is CPU bound, leaving only the loading and writing of notebooks to threads
+            self._publish_in_processes(main_notebooks, processes, max_workers, verbose, debugging, write=not import_dbc and not delta)
+        elif max_workers is None or max_workers <= 1:
+            for main_notebook in main_notebooks:
+                publish_notebook(main_notebook)
+        else:
+            # Output is replayed in notebook order, errors and warnings are collected per notebook.
+            common.parallel_map(publish_notebook, main_notebooks, max_workers)
+
+        self._test_guid_conflicts(main_notebooks)
+
+        if assemble_dbc or import_dbc:
+            with metrics.phase("assemble_dbc"):
+                self.published_dbc = self._assemble_dbc(main_notebooks)
+
+        if import_dbc:
+            with metrics.phase("import_dbc"):
+                self._import_dbc(self.published_dbc)
+
+        if delta:
+            with metrics.phase("publish_delta"):
+                self._publish_delta(main_notebooks, target_exists=target_status is not None)
 
         warnings = 0
         errors = 0
@@ -179,6 +262,7 @@ class Publisher:
                 html += f"""<div style="font-weight:bold; margin-top:1em">{notebook.path}</div>"""
                 for warning in notebook.warnings:
                     html += f"""<div style="margin-top:1em; white-space: pre-wrap">{warning.message}</div>"""
+        html += metrics.to_html()
         html += """</body></html>"""
 
         print("-"*80)
@@ -186,8 +270,117 @@ class Publisher:
         print(f"Found {warnings} warnings")
         print(f"Found {errors} errors")
 
+        print("-"*80)
+        self.build_config.write_build_report(report_file)
+
+        if verbose:
+            print("-"*80)
+            metrics.print_summary()
+            print("-"*80)
+            self.build_config.cell_rules.print_timings()
+
         dbgems.display_html(html)
 
+    def lint(self, *, cache_dir: str = None, bulk_export: bool = False) -> int:
+        """
+        Validates every notebook to be published, without writing anything, see BuildConfig.lint()
+        :return: the total number of errors
+        """
+        notebooks = [n for n in self.notebooks if self.black_list is None or n.path not in self.black_list]
+
+        return self.build_config.lint(cache_dir=cache_dir,
+                                      i18n_resources_dir=self.i18n_resources_dir,
+                                      bulk_export=bulk_export,
+                                      notebooks=notebooks)
+
+    def _test_guid_conflicts(self, notebooks: List[NotebookDef]) -> None:
+        """
+        Warns each notebook that declares an i18n GUID also declared by another notebook, listing every location
+        """
+        notebook_map = {n.path: n for n in notebooks}
+
+        for guid, locations in self.build_config.guid_registry.conflicts().items():
+            message = self.build_config.guid_registry.describe(guid, locations)
+            for path, i in locations:
+                if path in notebook_map:
+                    notebook_map[path].warn(lambda: False, f"Cmd #{i + 1} | {message}")
+
+    def _publish_in_processes(self, notebooks: List[NotebookDef], processes: int, max_workers: Union[None, int], verbose: bool, debugging: bool, write: bool) -> None:
+        """
+        Loads the source of each notebook in this process, transforms them on a pool of processes, and then merges the
+        errors and warnings back into each notebook before writing them, in order.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from dbacademy_courseware.dbpublish.notebook_payload_class import transform_payload
+
+        path_index = self.build_config.path_index
+
+        def prepare(notebook: NotebookDef):
+            return notebook.prepare(self.source_dir, self.i18n_resources_dir, path_index, debugging)
+
+        if max_workers is None or max_workers <= 1:
+            payloads = [prepare(n) for n in notebooks]
+        else:
+            payloads = common.parallel_map(prepare, notebooks, max_workers)
+
+        with self.build_config.metrics.phase("validate"):
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(transform_payload, payloads))
+
+        for notebook, payload, result in zip(notebooks, payloads, results):
+            notebook.print_header()
+            print(result.output, end="")
+
+            notebook.merge(result)
+            notebook.finish(self.target_dir, payload.language, result.students_commands, result.solutions_commands, verbose, write)
+
+    def _assemble_dbc(self, notebooks: List[NotebookDef]) -> bytes:
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+
+        archive = DbcArchive(self.target_dir)
+        for notebook in notebooks:
+            for target_path, (language, source) in notebook.published_notebooks.items():
+                archive.add(target_path, language, source)
+
+        print("-" * 80)
+        print(f"Assembled DBC of {len(archive)} notebooks for \"{self.target_dir}\"")
+        return archive.to_bytes()
+
+    def _import_dbc(self, data: bytes) -> None:
+        import tempfile
+
+        print(f"Importing DBC to \"{self.target_dir}\"")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            local_file_path = f"{temp_dir}/{self.build_name}.dbc"
+            with open(local_file_path, "wb") as f:
+                f.write(data)
+
+            self.client.workspace.mkdirs(self.target_dir)
+            self.client.workspace.import_dbc_files(self.target_dir, local_file_path=local_file_path)
+
+    def _publish_delta(self, notebooks: List[NotebookDef], target_exists: bool) -> None:
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+        from dbacademy_courseware.dbpublish.delta_plan_class import DeltaPlan
+
+        generated = dict()
+        for notebook in notebooks:
+            generated.update(notebook.published_notebooks)
+
+        if target_exists:
+            # One export of the entire target directory, instead of one per notebook
+            existing = DbcArchive.export(self.client, self.target_dir).notebooks
+            existing_paths = [e.get("path") for e in self.client.workspace().ls(self.target_dir, recursive=True) or []]
+        else:
+            existing, existing_paths = dict(), list()
+
+        plan = DeltaPlan(self.target_dir, Publisher.KEEPERS).compute(generated, existing, existing_paths)
+
+        print("-" * 80)
+        plan.print_plan()
+        plan.apply(self.client)
+        self.build_config.directories.invalidate(self.target_dir)
+
     def create_published_message(self):
         import urllib.parse
         from dbacademy_gems import dbgems
@@ -269,6 +462,8 @@ Please feel free to reach out to me (via Slack) or anyone on the curriculum team
         self.target_repo_url = validate_type(target_repo_url, "target_repo_url", str)
 
         common.reset_git_repo(client=self.client, directory=self.target_dir, repo_url=self.target_repo_url, branch=branch, which=None)
+        self.build_config.metadata.invalidate(self.target_dir)
+        self.build_config.directories.invalidate(self.target_dir)
 
         self.__validated_repo_reset = True
 
@@ -336,13 +531,24 @@ Please feel free to reach out to me (via Slack) or anyone on the curriculum team
     def create_dbc(self):
         return self.create_dbcs()
 
-    def create_dbcs(self):
+    def create_dbcs(self, report_file: str = None):
+        import time
         from dbacademy_gems import dbgems
 
         assert self.validated, f"Cannot create DBCs until the publisher passes validation. Ensure that Publisher.validate() was called and that all assignments passed."
 
-        print(f"Exporting DBC from \"{self.target_dir}\"")
-        data = self.build_config.client.workspace.export_dbc(self.target_dir)
+        metrics = self.build_config.metrics
+
+        if self.published_dbc is not None:
+            # Reuse the DBC that was assembled while publishing
+            print(f"Using the DBC assembled for \"{self.target_dir}\"")
+            data = self.published_dbc
+        else:
+            print(f"Exporting DBC from \"{self.target_dir}\"")
+            with metrics.phase("export_dbc"):
+                data = self.build_config.client.workspace.export_dbc(self.target_dir)
+
+        write_start = time.time()
 
         common.write_file(data=data,
                           overwrite=False,
@@ -359,8 +565,11 @@ Please feel free to reach out to me (via Slack) or anyone on the curriculum team
                           target_name="workspace-local FileStore",
                           target_file=f"dbfs:/FileStore/tmp/{self.build_config.build_name}-v{self.build_config.version}/{self.build_config.build_name}-v{self.build_config.version}-notebooks.dbc")
 
+        metrics.record_phase("write_dbc", None, time.time() - write_start)
+        self.build_config.write_build_report(report_file)
+
         url = f"/files/tmp/{self.build_config.build_name}-v{self.build_config.version}/{self.build_config.build_name}-v{self.build_config.version}-notebooks.dbc"
-        dbgems.display_html(f"""<html><body style="font-size:16px"><div><a href="{url}" target="_blank">Download DBC</a></div></body></html>""")
+        dbgems.display_html(f"""<html><body style="font-size:16px"><div><a href="{url}" target="_blank">Download DBC</a></div>{metrics.to_html()}</body></html>""")
 
     def get_validator(self):
         from .validator import Validator
@@ -371,10 +580,11 @@ Please feel free to reach out to me (via Slack) or anyone on the curriculum team
         assert self.__changes_in_source_repo is not None, f"The source repository was not tested for changes. Please run {method} to update the build state."
         assert self.__changes_in_source_repo == 0, f"Found {self.__changes_in_source_repo} changes(s) in the source repository. Please commit any changes before continuing and re-run {method} to update the build state."
 
-    def validate_no_changes_in_source_repo(self, repo_url: str = None, directory: str = None, repo_name: str = None):
+    def validate_no_changes_in_source_repo(self, repo_url: str = None, directory: str = None, repo_name: str = None, bulk_export: bool = False):
         repo_name = repo_name or f"{self.build_name}-source.git"
         results = self.__validate_no_changes_in_repo(repo_url=repo_url or f"https://github.com/databricks-academy/{repo_name}",
-                                                     directory=directory or self.source_repo)
+                                                     directory=directory or self.source_repo,
+                                                     bulk_export=bulk_export)
 
         self.__changes_in_source_repo = len(results)
         self.assert_no_changes_in_source_repo()
@@ -384,21 +594,24 @@ Please feel free to reach out to me (via Slack) or anyone on the curriculum team
         assert self.__changes_in_target_repo is not None, f"The source repository was not tested for changes. Please run {method} to update the build state."
         assert self.__changes_in_target_repo == 0, f"Found {self.__changes_in_target_repo} changes(s) in the source repository. Please commit any changes before continuing and re-run {method} to update the build state."
 
-    def validate_no_changes_in_target_repo(self, repo_url: str = None, directory: str = None, repo_name: str = None):
+    def validate_no_changes_in_target_repo(self, repo_url: str = None, directory: str = None, repo_name: str = None, bulk_export: bool = False):
         repo_name = repo_name or f"{self.build_name}.git"
         results = self.__validate_no_changes_in_repo(repo_url=repo_url or f"https://github.com/databricks-academy/{repo_name}",
-                                                     directory=directory or self.target_dir)
+                                                     directory=directory or self.target_dir,
+                                                     bulk_export=bulk_export)
 
         self.__changes_in_target_repo = len(results)
         self.assert_no_changes_in_target_repo()
 
-    def __validate_no_changes_in_repo(self, repo_url: str, directory: str) -> List[str]:
+    def __validate_no_changes_in_repo(self, repo_url: str, directory: str, bulk_export: bool) -> List[str]:
         from dbacademy_courseware.dbbuild import common
         results = common.validate_not_uncommitted(client=self.client,
                                                   build_name=self.build_name,
                                                   repo_url=repo_url,
                                                   directory=directory,
-                                                  ignored=["/Published/", "/Build-Scripts/"])
+                                                  ignored=["/Published/", "/Build-Scripts/"],
+                                                  bulk_export=bulk_export,
+                                                  source_cache=self.build_config.source_cache)
         if len(results) != 0:
             print()
             for result in results:
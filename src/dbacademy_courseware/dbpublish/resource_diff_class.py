@@ -1,4 +1,5 @@
 from typing import Union
+from dbacademy_courseware.dbbuild.text_writer_class import TextWriter
 
 
 class ResourceDiff:
@@ -27,9 +28,8 @@ class ResourceDiff:
         self.files_b = None
         self.all_files = None
 
-    def compare_and_save(self, target_file: str = None):
+    def compare_and_save(self, target_file: str = None, max_workers: int = None):
         diff = self.build_config.to_resource_diff()
-        html = diff.compare()
 
         if target_file is None:
             # Write the file to the docs folder
@@ -37,14 +37,24 @@ class ResourceDiff:
 
         file_name = target_file.split("/")[-1]
 
+        # Each file's section of the report is written as soon as it is available
         with open(target_file, "w") as file:
-            file.write(html)
+            diff.compare(TextWriter(file), max_workers=max_workers)
+
+        with open(target_file, "r") as file:
+            html = file.read()
 
         print(f"Wrote report to \"{target_file}\"")
         return file_name, html
 
-    def compare(self):
+    def compare(self, writer: TextWriter = None, max_workers: int = None) -> Union[None, str]:
+        """
+        Renders the HTML report to the specified writer, or to a new one if not specified. The files are diffed
+        concurrently, on up to max_workers threads, while each file's section is rendered in sorted order.
+        :return: The HTML report or None if the writer streams to a file
+        """
         import os
+        from concurrent.futures import ThreadPoolExecutor
 
         print(f"Comparing {self.old_resource} to {self.new_resource}")
 
@@ -60,7 +70,8 @@ class ResourceDiff:
         self.all_files = list(set(self.all_files))
         self.all_files.sort()
 
-        html = f"""<!DOCTYPE html><html>
+        writer = TextWriter() if writer is None else writer
+        writer.write(f"""<!DOCTYPE html><html>
         <head>
         <style>
             td {{padding: 5px; border:1px solid silver}}
@@ -71,37 +82,50 @@ class ResourceDiff:
                 <tr><td>Original:&nbsp;</td><td><b>{self.old_resource}</b></td></tr>
                 <tr><td>Latest:&nbsp;</td><td><b>{self.new_resource}</b></td></tr>
             </table>            
-            <table style="border-collapse: collapse; border-spacing:0">"""
-
-        html += f"""<thead><tr><td>Change Type</td><td>Message</td></tr></thead>"""
-
-        for file in self.all_files:
-            sd = SegmentDiff(file, self.old_dir, self.new_dir)
-            sd.read_segments()
-            
-            if len(sd.diff()) > 0:
-                html += f"""<tbody><tr><td colspan="2" style="background-color:gainsboro"><h2>/{sd.name}</h2></td></tr>"""
-                for change in sd.diff():
-                    html += f"""<tr><td style="white-space:nowrap; font-weight:bold">{change.change_type}</td>
-                                    <td style="font-weight:bold; width:100%">{change.message}</td>
-                                </tr>"""
-                    if change.change_type == "Cell Changed":
-                        rows = max(len(change.original_text.split("\n")), len(change.latest_text.split("\n")))+2
-
-                        html += f"""<tr><td colspan="2" style="padding:0">
-                            <table style="width:100%; border-collapse: collapse; border-spacing:0"><tr>
-                                <td style="width:50%; vertical-align:top; padding:0">
-                                    <textarea rows="{rows}" style="padding:2px; width:100%; white-space:pre; border:0">{change.original_text}</textarea>
-                                </td>
-                                <td style="width:50%; vertical-align:top; padding:0">
-                                    <textarea rows="{rows}" style="padding:2px; width:100%; white-space:pre; border:0">{change.latest_text}</textarea>
-                                </td>
-                            </tr></table>
-                        </td></tr>"""
-                html += f"""</tbody>"""
-
-        html += "</table></body></html>"
-        return html
+            <table style="border-collapse: collapse; border-spacing:0">""")
+
+        writer.write(f"""<thead><tr><td>Change Type</td><td>Message</td></tr></thead>""")
+
+        if max_workers is None or max_workers <= 1:
+            for file in self.all_files:
+                self.__write_changes(writer, self.__diff_file(file))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() yields the results in the order of the files, each as soon as it and those before it are done
+                for sd in executor.map(self.__diff_file, self.all_files):
+                    self.__write_changes(writer, sd)
+
+        writer.write("</table></body></html>")
+        return writer.getvalue()
+
+    def __diff_file(self, file: str) -> "SegmentDiff":
+        sd = SegmentDiff(file, self.old_dir, self.new_dir)
+        sd.read_segments()
+        sd.diff()
+        return sd
+
+    @staticmethod
+    def __write_changes(writer: TextWriter, sd: "SegmentDiff") -> None:
+        if len(sd.diff()) > 0:
+            writer.write(f"""<tbody><tr><td colspan="2" style="background-color:gainsboro"><h2>/{sd.name}</h2></td></tr>""")
+            for change in sd.diff():
+                writer.write(f"""<tr><td style="white-space:nowrap; font-weight:bold">{change.change_type}</td>
+                                <td style="font-weight:bold; width:100%">{change.message}</td>
+                            </tr>""")
+                if change.change_type == "Cell Changed":
+                    rows = max(len(change.original_text.split("\n")), len(change.latest_text.split("\n")))+2
+
+                    writer.write(f"""<tr><td colspan="2" style="padding:0">
+                        <table style="width:100%; border-collapse: collapse; border-spacing:0"><tr>
+                            <td style="width:50%; vertical-align:top; padding:0">
+                                <textarea rows="{rows}" style="padding:2px; width:100%; white-space:pre; border:0">{change.original_text}</textarea>
+                            </td>
+                            <td style="width:50%; vertical-align:top; padding:0">
+                                <textarea rows="{rows}" style="padding:2px; width:100%; white-space:pre; border:0">{change.latest_text}</textarea>
+                            </td>
+                        </tr></table>
+                    </td></tr>""")
+            writer.write(f"""</tbody>""")
 
 
 class Change:
@@ -110,24 +134,76 @@ class Change:
         self.name = name
         self.message = message
 
-        self.original_text = original_text
-        if self.original_text is not None:
-            while "\n\n" in self.original_text:
-                self.original_text = self.original_text.replace("\n\n", "\n")
+        # Blank lines are collapsed only when, and if, the texts are rendered
+        self.__original_text = original_text
+        self.__latest_text = latest_text
+        self.__normalized = dict()
 
-        self.latest_text = latest_text
-        if self.latest_text is not None:
-            while "\n\n" in self.latest_text:
-                self.latest_text = self.latest_text.replace("\n\n", "\n")
+    @staticmethod
+    def normalize(text: Union[None, str]) -> Union[None, str]:
+        """
+        Collapses each run of blank lines into a single line break, in one pass
+        """
+        import re
+        return None if text is None else re.sub(r"\n{2,}", "\n", text)
+
+    def __get_normalized(self, key: str, text: Union[None, str]) -> Union[None, str]:
+        if key not in self.__normalized:
+            self.__normalized[key] = Change.normalize(text)
+        return self.__normalized[key]
+
+    @property
+    def original_text(self) -> Union[None, str]:
+        return self.__get_normalized("original", self.__original_text)
+
+    @property
+    def latest_text(self) -> Union[None, str]:
+        return self.__get_normalized("latest", self.__latest_text)
 
 
 class Segment:
+    """
+    The lines of one i18n GUID's cell along with a digest of those lines, computed as each line is added, such that
+    two unchanged segments can be compared without ever joining their lines.
+    """
     def __init__(self, guid):
+        import hashlib
+
         self.guid = guid
-        self.contents = ""
+        self.lines = list()
+        self.__hash = hashlib.sha1()
+        self.__contents = None
+        self.__text = None
 
     def add_line(self, line):
-        self.contents += line
+        self.lines.append(line)
+        self.__hash.update(line.encode("utf-8"))
+        self.__contents = None
+        self.__text = None
+
+    @property
+    def digest(self) -> str:
+        return self.__hash.hexdigest()
+
+    @property
+    def contents(self) -> str:
+        if self.__contents is None:
+            self.__contents = "".join(self.lines)
+        return self.__contents
+
+    @property
+    def text(self) -> str:
+        """
+        The segment's contents without leading or trailing whitespace
+        """
+        if self.__text is None:
+            self.__text = self.contents.strip()
+        return self.__text
+
+    def same_as(self, other: "Segment") -> bool:
+        # Identical digests imply identical contents; only when they differ are the texts themselves compared, as the
+        # segments may yet differ only by leading or trailing whitespace.
+        return self.digest == other.digest or self.text == other.text
 
 
 class SegmentDiff:
@@ -138,8 +214,17 @@ class SegmentDiff:
         self.latest_dir = latest_dir
         self.segments_a = None
         self.segments_b = None
+        self.__changes = None
 
     def diff(self):
+        """
+        Returns the changes between the two versions of the file, computed only once per call to read_segments()
+        """
+        if self.__changes is None:
+            self.__changes = self.__compute_diff()
+        return self.__changes
+
+    def __compute_diff(self):
         if self.segments_a is None:
             return [Change("Missing Notebook", self.name, f"{self.name} from original")]
         elif self.segments_b is None:
@@ -147,25 +232,25 @@ class SegmentDiff:
 
         changes = []
 
-        guids = list()
-        guids.extend(self.segments_a.keys())
-        guids.extend(self.segments_b.keys())
-        guids = list(set(guids))
+        # The original's GUIDs, in order, followed by those added to the latest
+        guids = list(self.segments_a.keys())
+        guids.extend([g for g in self.segments_b.keys() if g not in self.segments_a])
 
         for guid in guids:
             if guid not in self.segments_a:
                 changes.append(Change("Cell Added", self.name, guid))
             elif guid not in self.segments_b:
                 changes.append(Change("Cell Removed", self.name, guid))
-            elif self.segments_a[guid].contents.strip() != self.segments_b[guid].contents.strip():
+            elif not self.segments_a[guid].same_as(self.segments_b[guid]):
                 # Try to figure out the first line that changed.
-                changes.append(Change("Cell Changed", self.name, f"{guid}", self.segments_a[guid].contents.strip(), self.segments_b[guid].contents.strip()))
+                changes.append(Change("Cell Changed", self.name, f"{guid}", self.segments_a[guid].text, self.segments_b[guid].text))
 
         return changes
 
     def read_segments(self):
         self.segments_a = self._read_segments_file(f"{self.original_dir}/{self.name}")
         self.segments_b = self._read_segments_file(f"{self.latest_dir}/{self.name}")
+        self.__changes = None
 
     @staticmethod
     def _read_segments_file(file: str) -> Union[None, dict]:
@@ -175,12 +260,11 @@ class SegmentDiff:
             return None
 
         with open(file, "r") as f:
-            lines = f.readlines()
-
             segment = None
             segments = {}
 
-            for i, line in enumerate(lines):
+            # Streamed, one line at a time, instead of reading the whole file first
+            for i, line in enumerate(f):
                 try:
                     if i == 0:
                         pass  # Line zero will be the file name.
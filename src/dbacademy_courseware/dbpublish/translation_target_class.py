@@ -0,0 +1,21 @@
+class TranslationTarget:
+    """
+    One language, such as "japanese-v3.1.0", into which a course is translated along with the repo to which that
+    translation is published.
+    """
+    def __init__(self, build_name: str, i18n_language: str, target_dir: str = None, target_repo_url: str = None, target_branch: str = None):
+        self.i18n_language = i18n_language
+
+        # Include the i18n code in the version.
+        # This hack just happens to work for japanese and korean
+        self.lang_code = i18n_language[0:2].upper()
+        self.common_language, self.core_version = i18n_language.split("-")
+        self.core_version = self.core_version[1:]
+        self.version = f"{self.core_version}-{self.lang_code}"
+
+        self.target_branch = target_branch or "published"
+        self.target_dir = target_dir or f"/Repos/Temp/{build_name}-{self.common_language}"
+        self.target_repo_url = target_repo_url or f"https://github.com/databricks-academy/{build_name}-{self.common_language}.git"
+
+    def __str__(self):
+        return f"{self.i18n_language} -> {self.target_dir}"
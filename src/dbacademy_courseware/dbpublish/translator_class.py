@@ -1,6 +1,8 @@
+from typing import List, Tuple, Union
 from dbacademy_gems import dbgems
 from dbacademy_courseware import validate_type
 from dbacademy_courseware.dbbuild import common
+from dbacademy_courseware.dbpublish.translation_target_class import TranslationTarget
 
 class Translator:
     from dbacademy_courseware.dbbuild import BuildConfig
@@ -104,45 +106,21 @@ class Translator:
 
         self.__validated = True
 
-    def _load_i18n_source(self, path):
-        import os
-
+    def _load_i18n_resource(self, path: str, i18n_language: str = None):
+        """
+        Returns the I18nResource of the specified notebook from the build's index of the language's resources, or None
+        for the notebooks in Includes, which are not translated
+        """
         if path.startswith("Solutions/"): path = path[10:]
-        if path.startswith("Includes/"): return ""
-
-        i18n_source_path = f"/Workspace{self.resources_folder}/{self.i18n_language}/{path}.md"
-        assert os.path.exists(i18n_source_path), f"Cannot find {i18n_source_path}"
-
-        with open(f"{i18n_source_path}") as f:
-            source = f.read()
-            source = source.replace("<hr />\n--i18n-", "<hr>--i18n-")
-            source = source.replace("<hr sandbox />\n--i18n-", "<hr sandbox>--i18n-")
-            return source
-
-    # noinspection PyMethodMayBeStatic
-    def _load_i18n_guid_map(self, path: str, i18n_source: str):
-        import re
-        from dbacademy_courseware.dbpublish import NotebookDef
-
-        if i18n_source is None:
-            return dict()
+        if path.startswith("Includes/"): return None
 
-        i18n_guid_map = dict()
+        bundle = self.build_config.i18n_bundle(f"{self.resources_folder}/{i18n_language or self.i18n_language}")
+        resource = bundle.get(path)
 
-        # parts = re.split(r"^<hr>--i18n-", i18n_source, flags=re.MULTILINE)
-        parts = re.split(r"^<hr>--i18n-|^<hr sandbox>--i18n-", i18n_source, flags=re.MULTILINE)
+        assert resource is not None, f"Cannot find {bundle.local_dir}/{path}.md"
+        assert resource.name == path, f"Expected the notebook \"{path}\", found \"{resource.name}\""
 
-        name = parts[0].strip()[3:]
-        path = path[10:] if path.startswith("Solutions/") else path
-        if not path.startswith("Includes/"):
-            assert name == path, f"Expected the notebook \"{path}\", found \"{name}\""
-
-        for part in parts[1:]:
-            guid, value = NotebookDef.parse_guid_and_value(part)
-
-            i18n_guid_map[guid] = value
-
-        return i18n_guid_map
+        return resource
 
     @property
     def validated(self):
@@ -161,121 +139,240 @@ class Translator:
         guid = f"--i18n-{line_zero[pos_a+len(prefix):pos_b - 1]}"
         return guid, line_zero
 
-    def publish_notebooks(self):
-        from datetime import datetime
-        from dbacademy_courseware.dbpublish import Publisher, NotebookDef
-        from dbacademy_courseware import get_workspace_url
-
-        assert self.validated, f"Cannot publish until the validator's configuration passes validation. Ensure that Translator.validate() was called and that all assignments passed"
+    def _translate_notebook(self, file: str, source_archive, built_on: str, target: TranslationTarget) -> Tuple[str, str, List[str]]:
+        """
+        Exports the notebook and replaces each of its MD cells with the translated text of the cell's GUID
+        :return: the tuple (language, new_source, missing_guids) where the notebook cannot be published unless missing_guids is empty
+        """
+        from dbacademy_courseware.dbpublish import NotebookDef
 
-        print(f"Publishing translated version of {self.build_name}, {self.version}")
-        print(f"...Removing files from target directories")
-        common.clean_target_dir(self.client, self.target_dir, verbose=False)
+        i18n_resource = self._load_i18n_resource(file, target.i18n_language)
+        source_notebook_path = f"{self.source_dir}/{file}"
+
+        if source_archive is not None and source_notebook_path in source_archive:
+            language, raw_source = source_archive.get(source_notebook_path)
+        else:
+            source_info = self.build_config.metadata.get_status(self.client, source_notebook_path)
+            language, raw_source = self.build_config.source_cache.get(self.client, source_notebook_path, source_info)
+
+        if file.startswith("Includes/"):
+            return language, raw_source, []  # Published as-is
+
+        cmd_delim = NotebookDef.get_cmd_delim(language)
+        cm = NotebookDef.get_comment_marker(language)
+        raw_lines = raw_source.split("\n")
+        header = raw_lines.pop(0)
+        source = "\n".join(raw_lines)
+
+        commands = source.split(cmd_delim)
+        new_commands = [commands.pop(0)]
+        missing_guids = []
+
+        for i, command in enumerate(commands):
+            command = command.strip()
+            guid, line_zero = self.__extract_i18n_guid(command)
+            if guid is None:
+                new_commands.append(command)                            # No GUID, it's %python or other type of command, not MD
+            elif guid not in i18n_resource:
+                missing_guids.append(guid)                              # Reported, for all notebooks, before anything is written
+            else:
+                replacements = i18n_resource.lines(guid)                # Get the replacement text for the specified GUID
+                cmd_lines = [f"{cm} MAGIC {x}" for x in replacements]   # Prefix the magic command to each line
+
+                lines = [line_zero, ""]                                 # The first line doesn't exist in the guid map
+                lines.extend(cmd_lines)                                 # Convert to a set of lines and append
+
+                new_command = "\n".join(lines)                          # Combine all the lines into a new command
+                new_commands.append(new_command.strip())                # Append the new command to set of commands
+
+        new_source = f"{header}\n"                           # Add the Databricks Notebook Header
+        new_source += f"\n{cmd_delim}\n".join(new_commands)  # Join all the new_commands into one
+
+        # Update the built_on and version_number - typically only found in the Version Info notebook.
+        new_source = new_source.replace("{{built_on}}", built_on)
+        new_source = new_source.replace("{{version_number}}", target.version)
+
+        return language, new_source, missing_guids
+
+    def _load_source_files(self, bulk_export: bool) -> Tuple[List[str], Union[None, "DbcArchive"]]:
+        """
+        Lists the source directory and, optionally, exports it in its entirety
+        :return: the tuple (source_files, source_archive) where each file is relative to the source directory
+        """
+        from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
 
         prefix = len(self.source_dir) + 1
-        source_files = [f.get("path")[prefix:] for f in self.client.workspace.ls(self.source_dir, recursive=True)]
+        source_files = [f.get("path")[prefix:] for f in self.build_config.metadata.load(self.client, self.source_dir)]
+
+        # One download of the entire source directory instead of one export per notebook
+        with self.build_config.metrics.phase("load_source_archive"):
+            source_archive = DbcArchive.export(self.client, self.source_dir) if bulk_export else None
+
+        return source_files, source_archive
+
+    def _current_target(self) -> TranslationTarget:
+        target = TranslationTarget(self.build_name, self.i18n_language, self.target_dir, self.target_repo_url, self.target_branch)
+        target.version = self.version
+        return target
+
+    def _publish_target(self, target: TranslationTarget, source_files: List[str], source_archive, max_workers: Union[None, int]) -> None:
+        """
+        Translates every notebook, concurrently on up to max_workers threads, and only once every notebook was
+        translated, and every GUID found, replaces the contents of the target's directory.
+        """
+        from datetime import datetime
+
+        metrics = self.build_config.metrics
+        built_on = datetime.now().strftime("%b %-d, %Y at %H:%M:%S UTC")
         print(f"...Processing {len(source_files)} files:")
 
-        # We have to first create the directory before writing to it.
-        # Processing them first, once and only once, avoids duplicate REST calls.
-        print(f"...Pre-creating directory structures")
-        processed_directory = []
-        for file in source_files:
-            target_notebook_path = f"{self.target_dir}/{file}"
-            if target_notebook_path not in processed_directory:
-                processed_directory.append(target_notebook_path)
-                target_notebook_dir = "/".join(target_notebook_path.split("/")[:-1])
-                self.client.workspace.mkdirs(target_notebook_dir)
-
-        print("\nProcessing notebooks:")
-        for file in source_files:
+        def translate(file: str) -> Tuple[str, str, List[str]]:
             print(f"   /{file}")
-            source = self._load_i18n_source(file)
-            i18n_guid_map = self._load_i18n_guid_map(file, source)
+            with metrics.phase("translate", file):
+                return self._translate_notebook(file, source_archive, built_on, target)
+
+        print("\nTranslating notebooks:")
+        if max_workers is None or max_workers <= 1:
+            results = [translate(f) for f in source_files]
+        else:
+            results = common.parallel_map(translate, source_files, max_workers)
 
-            # Compute the source and target directories
-            source_notebook_path = f"{self.source_dir}/{file}"
-            target_notebook_path = f"{self.target_dir}/{file}"
+        missing = [f"The GUID \"{guid}\" was not found in \"{file}\"." for file, (_, _, guids) in zip(source_files, results) for guid in guids]
+        for message in missing:
+            print(message)
+        assert len(missing) == 0, f"Found {len(missing)} missing GUIDs, the target directory was not modified."
 
-            source_info = self.client.workspace().get_status(source_notebook_path)
-            language = source_info["language"].lower()
-            cmd_delim = NotebookDef.get_cmd_delim(language)
-            cm = NotebookDef.get_comment_marker(language)
+        print(f"...Removing files from target directories")
+        with metrics.phase("clean_target_dir"):
+            common.clean_target_dir(self.client, target.target_dir, verbose=False)
+            self.build_config.directories.invalidate(target.target_dir)
 
-            raw_source = self.client.workspace().export_notebook(source_notebook_path)
-            raw_lines = raw_source.split("\n")
-            header = raw_lines.pop(0)
-            source = "\n".join(raw_lines)
+        # We have to first create the directory before writing to it.
+        # Processing them first, once and only once, avoids duplicate REST calls.
+        print(f"...Pre-creating directory structures")
+        with metrics.phase("create_directories"):
+            self.build_config.directories.create(self.client, [f"{target.target_dir}/{file}" for file in source_files], max_workers)
 
-            if file.startswith("Includes/"):
-                # Write the original notebook to the target directory
+        def import_notebook(item: Tuple[str, Tuple[str, str, List[str]]]) -> None:
+            file, (language, new_source, _) = item
+            with metrics.phase("import_notebook", file):
+                # Write the new notebook to the target directory
                 self.client.workspace.import_notebook(language=language.upper(),
-                                                      notebook_path=target_notebook_path,
-                                                      content=raw_source,
+                                                      notebook_path=f"{target.target_dir}/{file}",
+                                                      content=new_source,
                                                       overwrite=True)
-                continue
 
-            commands = source.split(cmd_delim)
-            new_commands = [commands.pop(0)]
+        print("...Importing notebooks")
+        if max_workers is None or max_workers <= 1:
+            for item in zip(source_files, results):
+                import_notebook(item)
+        else:
+            common.parallel_map(import_notebook, list(zip(source_files, results)), max_workers)
 
-            for i, command in enumerate(commands):
-                command = command.strip()
-                guid, line_zero = self.__extract_i18n_guid(command)
-                if guid is None:
-                    new_commands.append(command)                            # No GUID, it's %python or other type of command, not MD
-                else:
-                    assert guid in i18n_guid_map, f"The GUID \"{guid}\" was not found in \"{file}\"."
-                    replacements = i18n_guid_map[guid].strip().split("\n")  # Get the replacement text for the specified GUID
-                    cmd_lines = [f"{cm} MAGIC {x}" for x in replacements]   # Prefix the magic command to each line
-
-                    lines = [line_zero, ""]                                 # The first line doesn't exist in the guid map
-                    lines.extend(cmd_lines)                                 # Convert to a set of lines and append
+    def publish_notebooks(self, bulk_export: bool = False, report_file: str = None, max_workers: int = None):
+        from dbacademy_courseware.dbpublish import Publisher
+        from dbacademy_courseware import get_workspace_url
 
-                    new_command = "\n".join(lines)                          # Combine all the lines into a new command
-                    new_commands.append(new_command.strip())                # Append the new command to set of commands
+        assert self.validated, f"Cannot publish until the validator's configuration passes validation. Ensure that Translator.validate() was called and that all assignments passed"
 
-            new_source = f"{header}\n"                           # Add the Databricks Notebook Header
-            new_source += f"\n{cmd_delim}\n".join(new_commands)  # Join all the new_commands into one
+        print(f"Publishing translated version of {self.build_name}, {self.version}")
 
-            # Update the built_on and version_number - typically only found in the Version Info notebook.
-            built_on = datetime.now().strftime("%b %-d, %Y at %H:%M:%S UTC")
-            new_source = new_source.replace("{{built_on}}", built_on)
-            new_source = new_source.replace("{{version_number}}", self.version)
+        source_files, source_archive = self._load_source_files(bulk_export)
+        self._publish_target(self._current_target(), source_files, source_archive, max_workers)
 
-            # Write the new notebook to the target directory
-            self.client.workspace.import_notebook(language=language.upper(),
-                                                  notebook_path=target_notebook_path,
-                                                  content=new_source,
-                                                  overwrite=True)
+        self.build_config.write_build_report(report_file)
 
         html = f"""<html><body style="font-size:16px">
                      <div><a href="{get_workspace_url()}#workspace{self.target_dir}/{Publisher.VERSION_INFO_NOTEBOOK}" target="_blank">See Published Version</a></div>
+                     {self.build_config.metrics.to_html()}
                    </body></html>"""
 
         dbgems.display_html(html)
 
+    def publish_languages(self, i18n_languages: List[str] = None, *, bulk_export: bool = True, max_workers: int = None, create_dbcs: bool = False, report_file: str = None) -> List[TranslationTarget]:
+        """
+        Publishes every one of the specified languages, by default all of them, each to its own target repo. The English
+        source is cloned and exported once per core version, which is then translated into each of that version's
+        languages concurrently, on up to max_workers threads.
+        :return: the TranslationTarget of each language
+        """
+        from dbacademy_courseware.dbpublish import Publisher
+        from dbacademy_courseware import get_workspace_url
+
+        i18n_languages = self.language_options if i18n_languages is None else i18n_languages
+        for i18n_language in i18n_languages:
+            assert i18n_language in self.language_options, f"The language must be one of {self.language_options}, found \"{i18n_language}\"."
+
+        targets = [TranslationTarget(self.build_name, i18n_language) for i18n_language in i18n_languages]
+
+        for core_version in sorted({t.core_version for t in targets}):
+            group = [t for t in targets if t.core_version == core_version]
+
+            print("-" * 80)
+            print(f"Publishing {', '.join([t.i18n_language for t in group])} from v{core_version}")
+            self.__reset_source_repo(source_branch=f"published-v{core_version}")
+            source_files, source_archive = self._load_source_files(bulk_export)
+
+            def publish_target(target: TranslationTarget) -> None:
+                print("-" * 80)
+                print(f"Publishing translated version of {self.build_name}, {target.version}")
+
+                common.reset_git_repo(client=self.client,
+                                      directory=target.target_dir,
+                                      repo_url=target.target_repo_url,
+                                      branch=target.target_branch,
+                                      which="target")
+                self.build_config.metadata.invalidate(target.target_dir)
+                self.build_config.directories.invalidate(target.target_dir)
+
+                self._publish_target(target, source_files, source_archive, max_workers=None)
+
+                if create_dbcs:
+                    self._create_dbc(target.target_dir, target.version, target.lang_code)
+
+            if max_workers is None or max_workers <= 1:
+                for t in group:
+                    publish_target(t)
+            else:
+                common.parallel_map(publish_target, group, max_workers)
+
+        self.build_config.write_build_report(report_file)
+
+        links = "".join([f"""<div><a href="{get_workspace_url()}#workspace{t.target_dir}/{Publisher.VERSION_INFO_NOTEBOOK}" target="_blank">See Published Version ({t.i18n_language})</a></div>""" for t in targets])
+        html = f"""<html><body style="font-size:16px">
+                     {links}
+                     {self.build_config.metrics.to_html()}
+                   </body></html>"""
+
+        dbgems.display_html(html)
+
+        return targets
+
     def create_dbcs(self):
         from dbacademy_gems import dbgems
 
         assert self.validated, f"Cannot create DBCs until the publisher passes validation. Ensure that Publisher.validate() was called and that all assignments passed."
 
-        print(f"Exporting DBC from \"{self.target_dir}\"")
-        data = self.client.workspace.export_dbc(self.target_dir)
+        self._create_dbc(self.target_dir, self.version, self.lang_code)
+
+    def _create_dbc(self, target_dir: str, version: str, lang_code: str) -> None:
+        print(f"Exporting DBC from \"{target_dir}\"")
+        data = self.client.workspace.export_dbc(target_dir)
 
         common.write_file(data=data,
                           overwrite=False,
                           target_name="Distributions system (versioned)",
-                          target_file=f"dbfs:/mnt/secured.training.databricks.com/distributions/{self.build_name}/v{self.version}/{self.build_name}-v{self.version}-notebooks.dbc")
+                          target_file=f"dbfs:/mnt/secured.training.databricks.com/distributions/{self.build_name}/v{version}/{self.build_name}-v{version}-notebooks.dbc")
 
         common.write_file(data=data,
                           overwrite=False,
                           target_name="Distributions system (latest)",
-                          target_file=f"dbfs:/mnt/secured.training.databricks.com/distributions/{self.build_name}/vLATEST-{self.lang_code}/notebooks.dbc")
+                          target_file=f"dbfs:/mnt/secured.training.databricks.com/distributions/{self.build_name}/vLATEST-{lang_code}/notebooks.dbc")
 
         common.write_file(data=data,
                           overwrite=True,
                           target_name="workspace-local FileStore",
-                          target_file=f"dbfs:/FileStore/tmp/{self.build_name}-v{self.version}/{self.build_name}-v{self.version}-notebooks.dbc")
+                          target_file=f"dbfs:/FileStore/tmp/{self.build_name}-v{version}/{self.build_name}-v{version}-notebooks.dbc")
 
-        url = f"/files/tmp/{self.build_name}-v{self.version}/{self.build_name}-v{self.version}-notebooks.dbc"
+        url = f"/files/tmp/{self.build_name}-v{version}/{self.build_name}-v{version}-notebooks.dbc"
         dbgems.display_html(f"""<html><body style="font-size:16px"><div><a href="{url}" target="_blank">Download DBC</a></div></body></html>""")
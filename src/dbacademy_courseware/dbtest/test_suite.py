@@ -57,6 +57,10 @@ class TestSuite:
         for notebook in self.build_config.notebooks.values():
             self.test_rounds[notebook.test_round] = list()
 
+        # One listing of the test directory instead of one get_status() per notebook
+        metadata = self.build_config.metadata
+        metadata.load(self.client, test_dir)
+
         # Add each notebook to the dictionary or rounds which is a dictionary of tests
         for notebook in self.build_config.notebooks.values():
             if notebook.test_round > 0:
@@ -64,8 +68,9 @@ class TestSuite:
                 test_instance = TestInstance(self.build_config, notebook, test_dir, self.test_type)
                 self.test_rounds[notebook.test_round].append(test_instance)
 
-                if self.client.workspace().get_status(test_instance.notebook_path) is None:
-                    raise Exception(f"Notebook not found: {test_instance.notebook_path}")
+                with self.build_config.metrics.phase("validate_test_notebooks", notebook.path):
+                    if metadata.get_status(self.client, test_instance.notebook_path) is None:
+                        raise Exception(f"Notebook not found: {test_instance.notebook_path}")
 
         url = f"https://{dbgems.get_browser_host_name()}/?o={dbgems.get_workspace_id()}#job/list/search/dbacademy.course:{build_config.build_name}?offset=0"
         print(f"Test Suite: {url}")
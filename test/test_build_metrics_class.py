@@ -0,0 +1,89 @@
+import unittest
+from dbacademy_courseware.dbbuild.build_metrics_class import BuildMetrics
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_phases(self):
+        metrics = BuildMetrics()
+
+        with metrics.phase("publish", "1.1 Lesson"):
+            pass
+        with metrics.phase("publish", "1.2 Lesson"):
+            pass
+        metrics.record_phase("clean_target_dir", None, 1.5)
+
+        report = metrics.to_dict()
+        self.assertEqual(["publish", "clean_target_dir"], list(report.get("phases").keys()))
+        self.assertEqual(1.5, report.get("phases").get("clean_target_dir"))
+        self.assertEqual(["1.1 Lesson", "1.2 Lesson"], list(report.get("notebooks").keys()))
+
+    def test_instrument(self):
+        import tempfile
+        from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+        metrics = BuildMetrics()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = metrics.instrument(LocalRestClient(temp_dir))
+            self.assertIs(client, metrics.instrument(client))
+
+            client.workspace().mkdirs("/Source")
+            client.workspace.import_notebook("SQL", "/Source/Lesson", "-- Databricks notebook source\nSELECT 1")
+            client.workspace().get_status("/Source/Lesson")
+            client.workspace().get_status("/Source/Missing")
+            self.assertEqual("SQL", client.workspace.get_status("/Source/Lesson").get("language"))
+
+            self.assertRaises(AssertionError, lambda: client.workspace.export_notebook("/Source/Missing"))
+
+        calls = metrics.to_dict().get("calls")
+        self.assertEqual(["workspace.export_notebook", "workspace.get_status", "workspace.import_notebook", "workspace.mkdirs"], list(calls.keys()))
+        self.assertEqual(3, calls.get("workspace.get_status").get("count"))
+        self.assertEqual(1, calls.get("workspace.export_notebook").get("errors"))
+
+    def test_responses_not_proxied(self):
+        import io
+        import datetime
+        from urllib.response import addinfourl
+
+        class Workspace:
+            def export(self, path: str):
+                return addinfourl(io.BytesIO(b"{}"), headers={}, url=f"https://localhost/api/2.0/workspace/export?path={path}", code=200)
+
+            def modified_at(self, path: str):
+                return datetime.datetime(2022, 1, 1)
+
+        class Client:
+            def __init__(self):
+                self.workspace = Workspace()
+
+        metrics = BuildMetrics()
+        client = metrics.instrument(Client())
+
+        response = client.workspace.export("/Source/Lesson")
+        self.assertIsInstance(response, addinfourl)
+        self.assertEqual(200, response.getcode())
+        self.assertIsInstance(client.workspace.modified_at("/Source/Lesson"), datetime.datetime)
+
+        # Only the REST calls are recorded, not the subsequent use of what they returned
+        self.assertEqual(["workspace.export", "workspace.modified_at"], list(metrics.to_dict().get("calls").keys()))
+
+    def test_write_report(self):
+        import os, json, tempfile
+
+        metrics = BuildMetrics()
+        metrics.record_call("workspace.ls", 0.25)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_file = os.path.join(temp_dir, "reports", "build-report.json")
+            metrics.write_report(report_file)
+
+            with open(report_file) as f:
+                report = json.load(f)
+
+        self.assertEqual({"count": 1, "total_seconds": 0.25, "mean_seconds": 0.25, "max_seconds": 0.25, "errors": 0}, report.get("calls").get("workspace.ls"))
+        self.assertIn("workspace.ls", metrics.to_html())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from dbacademy_courseware.dbpublish.cell_class import Cell
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_magic(self):
+        self.assertEqual("%md-sandbox", Cell("python", "# MAGIC %md-sandbox --i18n-abc\n# MAGIC # Title").magic)
+        self.assertTrue(Cell("python", "# MAGIC %md-sandbox\n# MAGIC # Title").is_md)
+        self.assertTrue(Cell("sql", "-- MAGIC %run ../Includes/Setup").is_run)
+        self.assertTrue(Cell("scala", "// MAGIC %pip install something").is_pip)
+
+        cell = Cell("python", "print(\"Hello\")")
+        self.assertEqual("", cell.magic)
+        self.assertFalse(cell.is_md)
+
+        # The magic command must be commented out with the notebook's own marker
+        self.assertFalse(Cell("sql", "# MAGIC %md").is_md)
+
+    def test_leading_comments(self):
+        cell = Cell("python", "# MAGIC %sql\n# MAGIC -- TODO\n# MAGIC -- A comment\n# MAGIC SELECT 1")
+        self.assertEqual(["TODO", "A comment"], cell.leading_comments)
+
+        cell = Cell("sql", "-- ANSWER\n\nSELECT 1")
+        self.assertEqual(["ANSWER"], cell.leading_comments)
+
+    def test_update(self):
+        cell = Cell("python", "# TODO\nprint(1)")
+        self.assertEqual(["TODO"], cell.leading_comments)
+
+        self.assertIs(cell, cell.update("# TODO\nprint(1)"))
+        self.assertIs(cell, Cell.of("python", cell))
+
+        updated = cell.update("print(1)")
+        self.assertIsNot(cell, updated)
+        self.assertEqual([], updated.leading_comments)
+        self.assertEqual(("print(1)",), updated.lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from dbacademy_courseware.dbpublish.cell_rule_set_class import CellRuleSet, CellRule, STAGE_SOURCE, STAGE_CELL, STAGE_CONTENTS
+
+
+class MyTestCase(unittest.TestCase):
+
+    @staticmethod
+    def create_notebook(ignoring=None):
+        from dbacademy_courseware.dbbuild import BuildConfig
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        version = "1.2.3"
+        build_config = BuildConfig.load_config({"name": "Unit Test"}, version)
+        return NotebookDef(build_config=build_config,
+                           path="Agenda",
+                           replacements={},
+                           include_solution=False,
+                           test_round=2,
+                           ignored=False,
+                           order=0,
+                           i18n=False,
+                           i18n_language=None,
+                           ignoring=ignoring or [],
+                           version=version)
+
+    def test_copyright_years(self):
+        rules = CellRuleSet()
+        notebook = self.create_notebook()
+
+        command = "# MAGIC &copy; 2016 Databricks, Inc\n# MAGIC &copy; 2022 Databricks, Inc\n# MAGIC &copy; 2017 Databricks, Inc\n# MAGIC &copy; 2999 Databricks, Inc"
+        rules.apply(notebook, STAGE_CELL, "python", command, 3)
+
+        self.assertEqual(["Cmd #4 | Found copyright (2017 Databricks, Inc) ",
+                          "Cmd #4 | Found copyright (2022 Databricks, Inc) "], [e.message for e in notebook.errors])
+
+    def test_overlapping_tokens(self):
+        rules = CellRuleSet()
+        notebook = self.create_notebook()
+
+        rules.apply(notebook, STAGE_CELL, "python", "# PRIVATE_TEST", 0)
+
+        self.assertEqual(["Cmd #1 | Found the token \"TEST\" ",
+                          "Cmd #1 | Found the token \"PRIVATE_TEST\" "], [e.message for e in notebook.errors])
+
+    def test_prefix_literals(self):
+        rules = CellRuleSet([CellRule("short", "ABC", "short"),
+                             CellRule("long", "ABCD", "long")])
+        notebook = self.create_notebook()
+
+        rules.apply(notebook, STAGE_CELL, "python", "xxABCDxx", 0)
+
+        self.assertEqual(["short", "long"], [e.message for e in notebook.errors])
+
+    def test_language_magic(self):
+        rules = CellRuleSet()
+
+        notebook = self.create_notebook()
+        rules.apply(notebook, STAGE_CELL, "python", "%python\nprint(1)", 0)
+        self.assertEqual(["Cmd #1 | Found \"%python\" in a Python notebook"], [w.message for w in notebook.warnings])
+
+        notebook = self.create_notebook()
+        rules.apply(notebook, STAGE_CELL, "python", "# MAGIC %md\n%python", 0, is_md=True)
+        self.assertEqual(0, len(notebook.warnings))
+
+        notebook = self.create_notebook(ignoring=["lang-python"])
+        rules.apply(notebook, STAGE_CELL, "python", "%python\nprint(1)", 0)
+        self.assertEqual(0, len(notebook.warnings))
+
+    def test_prohibited_dataset(self):
+        rules = CellRuleSet()
+        notebook = self.create_notebook()
+
+        rules.apply(notebook, STAGE_SOURCE, "python", "x = 1\ndf = spark.read.load(\"/mnt/training/some.csv\")\ny = 2", 1)
+
+        self.assertEqual(0, len(notebook.errors))
+        self.assertEqual(["Cmd #2 | Course includes prohibited use of /mnt/training:\n       | df = spark.read.load(\"/mnt/training/some.csv\")"], [w.message for w in notebook.warnings])
+
+    def test_deprecated_icons(self):
+        rules = CellRuleSet()
+        notebook = self.create_notebook()
+
+        rules.apply(notebook, STAGE_CONTENTS, None, "Some :NOTE: and a :HINT:")
+
+        self.assertEqual(["The deprecated :HINT: pattern was found after all replacements were processed.",
+                          "The deprecated :NOTE: pattern was found after all replacements were processed."], [e.message for e in notebook.errors])
+        self.assertEqual(1, rules.rule_hits.get("deprecated-icon::NOTE:"))
+
+    def test_rule_seconds(self):
+        rules = CellRuleSet()
+        notebook = self.create_notebook()
+
+        # Matched by the scan though not reported, a Python magic in a SQL notebook being acceptable
+        rules.apply(notebook, STAGE_CELL, "sql", "%python\nprint(1)", 0)
+
+        self.assertEqual(0, len(notebook.warnings))
+        self.assertEqual(0, rules.rule_hits.get("lang-python"))
+        self.assertGreater(rules.rule_seconds.get("lang-python"), 0)
+        self.assertGreater(rules.rule_seconds.get("lang-sql"), 0)
+
+        # Rules of the other stages were never matched
+        self.assertEqual(0, rules.rule_seconds.get("cell-title"))
+        self.assertEqual(0, rules.rule_seconds.get("deprecated-icon::NOTE:"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from dbacademy_courseware.dbbuild.commit_resolver_class import CommitResolver
+
+
+class CountingResolver(CommitResolver):
+
+    def __init__(self, pin_file: str = None):
+        super().__init__(pin_file)
+        self.fetched = []
+
+    def fetch(self, repo_name: str) -> str:
+        self.fetched.append(repo_name)
+        return f"sha-{repo_name}"
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pin_file = f"{self.temp_dir.name}/pins/commits.json"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_resolve_once(self):
+        resolver = CountingResolver()
+
+        self.assertEqual("sha-dbacademy-gems", resolver.resolve("dbacademy-gems"))
+        self.assertEqual("sha-dbacademy-gems", resolver.resolve("dbacademy-gems"))
+        self.assertEqual(["dbacademy-gems"], resolver.fetched)
+
+        commits = resolver.resolve_all()
+        self.assertEqual(CommitResolver.REPOSITORIES, list(commits.keys()))
+        self.assertEqual(3, len(resolver.fetched))
+
+    def test_pin_file(self):
+        import os
+
+        resolver = CountingResolver(self.pin_file)
+        resolver.resolve_all()
+        self.assertTrue(os.path.exists(self.pin_file))
+
+        pinned = CountingResolver(self.pin_file)
+        self.assertEqual(resolver.commits, pinned.commits)
+
+        pinned.resolve_all()
+        self.assertEqual([], pinned.fetched)
+
+    def test_pickle(self):
+        import pickle
+
+        resolver = CountingResolver()
+        resolver.resolve("dbacademy-rest")
+
+        copy = pickle.loads(pickle.dumps(resolver))
+        self.assertEqual("sha-dbacademy-rest", copy.resolve("dbacademy-rest"))
+
+    def test_update_git_commit(self):
+        from dbacademy_courseware.dbbuild import BuildConfig
+        from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+        resolver = CommitResolver()
+        resolver.commits["dbacademy-gems"] = "abc123"
+        resolver.save(self.pin_file)
+
+        client = LocalRestClient(f"{self.temp_dir.name}/workspace")
+        client.workspace().mkdirs("/Source")
+        client.workspace().import_notebook("PYTHON", "/Source/Lesson", "# Databricks notebook source\nprint(1)")
+
+        build_config = BuildConfig(name="Unit Test",
+                                   version="1.2.3",
+                                   client=client,
+                                   source_dir="/Source",
+                                   source_repo="/",
+                                   cloud="AWS",
+                                   commit_pin_file=self.pin_file)
+
+        notebook = build_config.notebooks.get("Lesson")
+        url = "git+https://github.com/databricks-academy/dbacademy-gems"
+
+        command = notebook.update_git_commit(f"%pip install {url}", url)
+        self.assertEqual(f"%pip install {url}@abc123", command)
+        self.assertEqual(0, build_config.commit_resolver.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+from dbacademy_courseware.dbbuild import common
+
+
+class MyTestCase(unittest.TestCase):
+
+    @staticmethod
+    def run_parallel(function, items: list, max_workers: int):
+        """
+        :return: the tuple (results, error, stdout) of parallel_map()
+        """
+        import io, contextlib
+
+        stdout = io.StringIO()
+        results, error = None, None
+
+        with contextlib.redirect_stdout(stdout):
+            try:
+                results = common.parallel_map(function, items, max_workers)
+            except Exception as e:
+                error = e
+
+        return results, error, stdout.getvalue()
+
+    def test_output_order(self):
+        import time
+
+        def process(i: int) -> int:
+            # Later items complete first
+            time.sleep((5 - i) * 0.01)
+            print(f"start {i}")
+            time.sleep(0.001)
+            print(f"end {i}")
+            return i * i
+
+        results, error, stdout = self.run_parallel(process, list(range(6)), max_workers=6)
+
+        self.assertIsNone(error)
+        self.assertEqual([0, 1, 4, 9, 16, 25], results)
+        self.assertEqual("".join([f"start {i}\nend {i}\n" for i in range(6)]), stdout)
+
+    def test_first_failure(self):
+        import time
+        import threading
+
+        later_failed = threading.Event()
+
+        def process(i: int) -> int:
+            print(f"item {i}")
+            if i == 3:
+                later_failed.set()
+                raise ValueError("item 3")
+            elif i == 1:
+                # Fails only after a later item already failed
+                later_failed.wait(1)
+                time.sleep(0.01)
+                raise ValueError("item 1")
+            return i
+
+        results, error, stdout = self.run_parallel(process, list(range(6)), max_workers=6)
+
+        # The first failure in the order of the items is the one raised, with the output of the items up to it
+        self.assertIsNone(results)
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual("item 1", str(error))
+        self.assertEqual("item 0\nitem 1\n", stdout)
+
+    def test_stdout_restored(self):
+        import io, sys, contextlib
+
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            common.parallel_map(lambda i: i, [1, 2], max_workers=2)
+            self.assertIs(stdout, sys.stdout)
+
+            self.assertRaises(ZeroDivisionError, lambda: common.parallel_map(lambda i: 1 / 0, [1, 2], max_workers=2))
+            self.assertIs(stdout, sys.stdout)
+    def index_repo_dir(self, bulk_export: bool):
+        """
+        :return: the tuple (results, export_calls) of index_repo_dir() for a repo of two notebooks and a README.md
+        """
+        import os
+        import tempfile
+        from unittest import mock
+        from dbacademy_courseware.dbbuild.build_metrics_class import BuildMetrics
+        from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metrics = BuildMetrics()
+            client = metrics.instrument(LocalRestClient(f"{temp_dir}/workspace"))
+
+            client.workspace().mkdirs("/Repos/someone/course/Includes")
+            client.workspace().import_notebook("PYTHON", "/Repos/someone/course/Lesson", "# Databricks notebook source\nprint(1)\n")
+            client.workspace().import_notebook("SQL", "/Repos/someone/course/Includes/Setup", "-- Databricks notebook source\nSELECT 1\n")
+
+            # The workspace's file system, in which notebooks have no extension
+            fs = f"{temp_dir}/fs"
+            os.makedirs(f"{fs}/Repos/someone/course/Includes")
+            for file in ["Lesson", "Includes/Setup"]:
+                open(f"{fs}/Repos/someone/course/{file}", "w").close()
+            with open(f"{fs}/Repos/someone/course/README.md", "w") as f:
+                f.write("# Course")
+
+            with mock.patch("dbacademy_courseware.dbbuild.common.WORKSPACE_FS", fs):
+                results = common.index_repo_dir(client=client, repo_dir="/Repos/someone/course", ignored=[], bulk_export=bulk_export)
+
+        calls = metrics.to_dict().get("calls").get("workspace.export_notebook")
+        return results, 0 if calls is None else calls.get("count")
+
+    def test_index_repo_dir(self):
+        expected, export_calls = self.index_repo_dir(bulk_export=False)
+        self.assertEqual(2, export_calls)
+        self.assertEqual("# Course", expected.get("/README.md").get("contents"))
+        self.assertEqual("# Databricks notebook source\nprint(1)\n", expected.get("/Lesson").get("contents"))
+
+        # Every notebook is served from the one DBC
+        actual, export_calls = self.index_repo_dir(bulk_export=True)
+        self.assertEqual(0, export_calls)
+        self.assertEqual({k: v.get("contents") for k, v in expected.items()}, {k: v.get("contents") for k, v in actual.items()})
+
+
+if __name__ == '__main__':
+    unittest.main()
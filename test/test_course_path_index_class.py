@@ -0,0 +1,53 @@
+import unittest
+from dbacademy_courseware.dbbuild.course_path_index_class import CoursePathIndex
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_parent_directories(self):
+        index = CoursePathIndex(["Agenda", "Module 1/Lessons/Lesson 1", "Includes/Classroom-Setup"])
+
+        self.assertTrue("Agenda" in index)
+        self.assertTrue("Module 1/Lessons/Lesson 1" in index)
+        self.assertTrue("Module 1/Lessons" in index)
+        self.assertTrue("Module 1" in index)
+        self.assertTrue("Includes" in index)
+        self.assertFalse("Lessons" in index)
+        self.assertFalse("Module 1/Lesson 1" in index)
+
+    def test_resolve(self):
+        self.assertEqual("Includes/Classroom-Setup", CoursePathIndex.resolve("Agenda", "./Includes/Classroom-Setup"))
+        self.assertEqual("Includes/Classroom-Setup", CoursePathIndex.resolve("Agenda", "../Includes/Classroom-Setup"))
+        self.assertEqual("Module 1/Includes/Classroom-Setup", CoursePathIndex.resolve("Module 1/Lesson 1", "./Includes/Classroom-Setup"))
+        self.assertEqual("Includes/Classroom-Setup", CoursePathIndex.resolve("Module 1/Lesson 1", "../Includes/Classroom-Setup"))
+        self.assertEqual("Includes/Classroom-Setup", CoursePathIndex.resolve("Module 1/Lesson 1", "../../../Includes/Classroom-Setup"))
+        self.assertEqual("Module 1/Lesson 2", CoursePathIndex.resolve("Module 1/Lesson 1", "./Labs/../Lesson 2"))
+        self.assertEqual("Includes", CoursePathIndex.resolve("Agenda", "./Includes/"))
+
+    def test_notebook_exists(self):
+        from dbacademy_courseware.dbbuild import BuildConfig
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        build_config = BuildConfig.load_config({"name": "Unit Test"}, "1.2.3")
+        notebook = NotebookDef(build_config=build_config,
+                               path="Module 1/Lesson 1",
+                               replacements={},
+                               include_solution=False,
+                               test_round=2,
+                               ignored=False,
+                               order=0,
+                               i18n=False,
+                               i18n_language=None,
+                               ignoring=[],
+                               version="1.2.3")
+
+        index = CoursePathIndex(["Module 1/Lesson 1", "Includes/Classroom-Setup"])
+        notebook.test_run_cells("python", "# MAGIC %run ../Includes/Classroom-Setup", 0, index)
+        notebook.test_run_cells("python", "# MAGIC %run \"./Includes/Classroom-Setup\"", 1, index)
+
+        self.assertEqual(0, len(notebook.warnings))
+        self.assertEqual(["Cmd #2 | Cannot find notebook for the %run target: \"./Includes/Classroom-Setup\" resolved as \"Module 1/Includes/Classroom-Setup\""], [e.message for e in notebook.errors])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from dbacademy_courseware.dbbuild.dbc_archive_class import DbcArchive
+
+
+class MyTestCase(unittest.TestCase):
+
+    @staticmethod
+    def create_dbc(notebooks: dict) -> bytes:
+        import io, json, zipfile
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zip_file:
+            for name, notebook in notebooks.items():
+                zip_file.writestr(name, json.dumps(notebook))
+        return buffer.getvalue()
+
+    def test_read(self):
+        data = self.create_dbc({
+            "Source/Includes/Classroom-Setup.python": {
+                "language": "python",
+                "commands": [{"position": 2.0, "command": "print(\"Hello\")"},
+                             {"position": 1.0, "command": "%md\n\n# Some Title"}]
+            },
+            "Source/1.1 Lesson.sql": {
+                "language": "sql",
+                "commands": [{"position": 1.0, "command": "SELECT 1", "commandTitle": "Query", "showCommandTitle": True}]
+            },
+            "Source/manifest.mf": {}
+        })
+
+        archive = DbcArchive.read("/Repos/Someone/course/Source", data)
+        self.assertEqual(2, len(archive))
+
+        language, source = archive.get("/Repos/Someone/course/Source/Includes/Classroom-Setup")
+        self.assertEqual("python", language)
+        self.assertEqual("# Databricks notebook source\n# MAGIC %md\n# MAGIC\n# MAGIC # Some Title\n\n# COMMAND ----------\n\nprint(\"Hello\")\n", source)
+
+        language, source = archive.get("/Repos/Someone/course/Source/1.1 Lesson")
+        self.assertEqual("sql", language)
+        self.assertEqual("-- Databricks notebook source\n-- DBTITLE 1,Query\nSELECT 1\n", source)
+
+        self.assertIsNone(archive.get("/Repos/Someone/course/Source/manifest"))
+
+    def test_round_trip(self):
+        source = "-- Databricks notebook source\n-- MAGIC %md\n-- MAGIC\n-- MAGIC # Some Title\n\n-- COMMAND ----------\n\n-- DBTITLE 0,Query\nSELECT *\nFROM some_table\n"
+
+        archive = DbcArchive("/Repos/Temp/course")
+        archive.add("/Repos/Temp/course/Solutions/Lesson", "SQL", source)
+
+        data = archive.to_bytes()
+        self.assertEqual(data, archive.to_bytes())
+
+        archive = DbcArchive.read("/Repos/Temp/course", data)
+        self.assertEqual(("sql", source), archive.get("/Repos/Temp/course/Solutions/Lesson"))
+
+        commands = DbcArchive.to_commands("sql", source)
+        self.assertEqual(["%md\n\n# Some Title", "SELECT *\nFROM some_table"], [c.get("command") for c in commands])
+        self.assertEqual(["", "Query"], [c.get("commandTitle") for c in commands])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from dbacademy_courseware.dbpublish.delta_plan_class import DeltaPlan
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_digest_ignores_delimiters(self):
+        source_a = "# Databricks notebook source\nprint(1)\n\n# COMMAND ----------\n\nprint(2)"
+        source_b = "# Databricks notebook source\nprint(1)\n\n\n# COMMAND ----------\n\nprint(2)\n"
+        source_c = "# Databricks notebook source\nprint(1)\n\n# COMMAND ----------\n\nprint(3)"
+
+        self.assertEqual(DeltaPlan.digest("python", source_a), DeltaPlan.digest("Python", source_b))
+        self.assertNotEqual(DeltaPlan.digest("python", source_a), DeltaPlan.digest("python", source_c))
+        self.assertNotEqual(DeltaPlan.digest("python", source_a), DeltaPlan.digest("scala", source_a))
+
+    def test_digest_trailing_whitespace(self):
+        # Two trailing spaces are a hard line break in Markdown
+        source_a = "# Databricks notebook source\n# MAGIC %md\n# MAGIC First line\n# MAGIC Second line\n"
+        source_b = "# Databricks notebook source\n# MAGIC %md\n# MAGIC First line  \n# MAGIC Second line\n"
+
+        self.assertNotEqual(DeltaPlan.digest("python", source_a), DeltaPlan.digest("python", source_b))
+        self.assertNotEqual(DeltaPlan.digest("python", "# Databricks notebook source\nprint(1)"), DeltaPlan.digest("python", "# Databricks notebook source\nprint(1) "))
+
+    def test_compute(self):
+        target = "/Repos/Published/course"
+        same = "# Databricks notebook source\nprint(1)"
+        changed = "# Databricks notebook source\nprint(2)"
+
+        generated = {
+            f"{target}/Includes/Setup": ("python", same),
+            f"{target}/1.1 Lesson": ("python", changed),
+            f"{target}/1.2 Lesson": ("python", same),
+        }
+        existing = {
+            f"{target}/Includes/Setup": ("python", same),
+            f"{target}/1.1 Lesson": ("python", same),
+            f"{target}/Old/Lesson": ("python", same),
+        }
+        existing_paths = list(existing.keys()) + [f"{target}/Includes", f"{target}/Old", f"{target}/README.md", f"{target}/stray.txt"]
+
+        plan = DeltaPlan(target, ["README.md"]).compute(generated, existing, existing_paths)
+
+        self.assertEqual([f"{target}/1.2 Lesson"], list(plan.adds.keys()))
+        self.assertEqual([f"{target}/1.1 Lesson"], list(plan.updates.keys()))
+        self.assertEqual([f"{target}/Includes/Setup"], plan.unchanged)
+        self.assertEqual([f"{target}/Old", f"{target}/stray.txt"], plan.deletes)
+        self.assertEqual(4, plan.changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
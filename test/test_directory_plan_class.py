@@ -0,0 +1,78 @@
+import unittest
+from dbacademy_courseware.dbbuild.directory_plan_class import DirectoryPlan
+from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = LocalRestClient(self.temp_dir.name)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_ancestors(self):
+        self.assertEqual(["/Published/Solutions", "/Published"], DirectoryPlan.ancestors("/Published/Solutions/Includes"))
+        self.assertEqual([], DirectoryPlan.ancestors("/Published"))
+
+    def test_leaves(self):
+        leaves = DirectoryPlan().leaves(["/Published/1.1 Lesson",
+                                         "/Published/Includes/Classroom-Setup",
+                                         "/Published/Includes/Reset",
+                                         "/Published/Solutions/1.1 Lesson",
+                                         "/Published/Solutions/Includes/Classroom-Setup"])
+
+        self.assertEqual(["/Published/Includes", "/Published/Solutions/Includes"], leaves)
+
+    def test_create(self):
+        plan = DirectoryPlan()
+
+        created = plan.create(self.client, [f"/Published/Module {m}/Lesson {l}" for m in range(4) for l in range(5)], max_workers=4)
+        self.assertEqual([f"/Published/Module {m}" for m in range(4)], created)
+        self.assertEqual(4, plan.calls)
+        self.assertEqual("DIRECTORY", self.client.workspace().get_status("/Published/Module 3").get("object_type"))
+
+        # Directories, and their ancestors, already created are not created again
+        self.assertFalse(plan.ensure(self.client, "/Published/Module 2"))
+        self.assertFalse(plan.ensure(self.client, "/Published"))
+        self.assertEqual([], plan.leaves(["/Published/Module 1/Lesson 9"]))
+        self.assertEqual(4, plan.calls)
+
+    def test_invalidate(self):
+        plan = DirectoryPlan()
+        self.assertTrue(plan.ensure(self.client, "/Published/Includes"))
+
+        plan.invalidate("/Published/Includes")
+        self.assertFalse("/Published/Includes" in plan)
+        self.assertTrue("/Published" in plan)
+
+        self.assertTrue(plan.ensure(self.client, "/Published/Includes"))
+        self.assertEqual(2, plan.calls)
+
+    def test_concurrent_targets(self):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        plan = DirectoryPlan()
+        barrier = threading.Barrier(2)
+
+        def publish(target: str) -> list:
+            paths = [f"{target}/1.1 Lesson", f"{target}/Includes/Setup", f"{target}/Solutions/1.1 Lesson"]
+            barrier.wait()  # Both targets are published at the same time
+            return plan.create(self.client, paths)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            created = list(executor.map(publish, ["/Repos/A", "/Repos/B"]))
+
+        # Each target creates its own leaves, and only its own
+        self.assertEqual([["/Repos/A/Includes", "/Repos/A/Solutions"], ["/Repos/B/Includes", "/Repos/B/Solutions"]], created)
+        self.assertEqual(4, plan.calls)
+        for directory in ["/Repos/A/Includes", "/Repos/A/Solutions", "/Repos/B/Includes", "/Repos/B/Solutions"]:
+            self.assertEqual("DIRECTORY", self.client.workspace().get_status(directory).get("object_type"))
+
+
+if __name__ == '__main__':
+    unittest.main()
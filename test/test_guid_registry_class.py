@@ -0,0 +1,63 @@
+import unittest
+from dbacademy_courseware.dbbuild.guid_registry_class import GuidRegistry
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_update(self):
+        registry = GuidRegistry()
+        registry.update("Lesson 2", {"--i18n-b": 3, "--i18n-a": 1})
+
+        self.assertEqual(2, len(registry))
+        self.assertTrue("--i18n-a" in registry)
+        self.assertEqual(["--i18n-a", "--i18n-b"], registry.guids("Lesson 2"))
+        self.assertEqual([("Lesson 2", 3)], registry.locations("--i18n-b"))
+
+        # Publishing the notebook again replaces its GUIDs
+        registry.update("Lesson 2", {"--i18n-c": 1})
+        self.assertFalse("--i18n-a" in registry)
+        self.assertEqual(["--i18n-c"], registry.guids("Lesson 2"))
+
+        registry.remove("Lesson 2")
+        self.assertEqual(0, len(registry))
+
+    def test_conflicts(self):
+        registry = GuidRegistry()
+        registry.update("Lesson 2", {"--i18n-a": 1, "--i18n-b": 2})
+        registry.update("Lesson 1", {"--i18n-a": 4})
+        registry.update("Lesson 3", {"--i18n-c": 0})
+
+        conflicts = registry.conflicts()
+        self.assertEqual({"--i18n-a": [("Lesson 1", 4), ("Lesson 2", 1)]}, conflicts)
+
+        message = GuidRegistry.describe("--i18n-a", conflicts.get("--i18n-a"))
+        self.assertEqual("The i18n GUID --i18n-a is declared by 2 notebooks: \"Lesson 1\" Cmd #5, \"Lesson 2\" Cmd #2", message)
+
+    def test_notebook_cells(self):
+        from dbacademy_courseware.dbbuild import BuildConfig
+        from dbacademy_courseware.dbpublish.notebook_def_class import NotebookDef
+
+        build_config = BuildConfig.load_config({"name": "Unit Test"}, "1.2.3")
+        notebook = NotebookDef(build_config=build_config,
+                               path="Agenda",
+                               replacements={},
+                               include_solution=False,
+                               test_round=2,
+                               ignored=False,
+                               order=0,
+                               i18n=True,
+                               i18n_language=None,
+                               ignoring=[],
+                               version="1.2.3")
+
+        for i, guid in enumerate(["--i18n-a", "--i18n-b", "--i18n-a"]):
+            command = f"# MAGIC %md {guid}\n# MAGIC # Some Title"
+            notebook.update_md_cells(language="Python", command=command, i=i, i18n_guid_map=dict(), other_notebooks=[])
+
+        self.assertEqual(["--i18n-a", "--i18n-b"], notebook.i18n_guids)
+        self.assertEqual({"--i18n-a": 0, "--i18n-b": 1}, notebook.i18n_guid_cells)
+        self.assertEqual("Cmd #3 | Duplicate i18n GUID found: --i18n-a", notebook.errors[0].message)
+
+
+if __name__ == '__main__':
+    unittest.main()
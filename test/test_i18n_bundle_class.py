@@ -0,0 +1,69 @@
+import unittest
+from dbacademy_courseware.dbbuild.i18n_bundle_class import I18nBundle
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import os
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.local_dir = f"{self.temp_dir.name}/english"
+        self.index_file = f"{self.temp_dir.name}/index/english.json"
+
+        os.makedirs(f"{self.local_dir}/Includes")
+        self.write("1.1 Lesson", "# /1.1 Lesson\n<hr>--i18n-aaa\n# Hello\nWorld\n<hr sandbox />\n--i18n-bbb\nSandbox\n")
+        self.write("Includes/Setup", "# /Includes/Setup\n")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def write(self, path: str, source: str) -> None:
+        with open(f"{self.local_dir}/{path}.md", "w") as f:
+            f.write(source)
+
+    def bundle(self) -> I18nBundle:
+        return I18nBundle("/Resources/english", index_file=self.index_file, local_dir=self.local_dir)
+
+    def test_parse(self):
+        name, guids = I18nBundle.parse("# /1.1 Lesson\n<hr>--i18n-aaa\nOne\n<hr sandbox>--i18n-bbb\nTwo\n")
+
+        self.assertEqual("1.1 Lesson", name)
+        self.assertEqual([("--i18n-aaa", "One\n"), ("--i18n-bbb", "Two\n")], guids)
+
+    def test_load(self):
+        bundle = self.bundle()
+
+        self.assertEqual(2, len(bundle))
+        self.assertEqual(2, bundle.parsed)
+        self.assertIsNone(bundle.get("Missing"))
+
+        resource = bundle.get("1.1 Lesson")
+        self.assertEqual("1.1 Lesson", resource.name)
+        self.assertEqual(["--i18n-aaa", "--i18n-bbb"], list(resource.guid_map.keys()))
+        self.assertEqual(["# Hello", "World"], resource.lines("--i18n-aaa"))
+        self.assertEqual("Sandbox\n", resource.guid_map.get("--i18n-bbb"))
+
+        self.assertEqual(0, len(bundle.get("Includes/Setup")))
+
+    def test_persisted_index(self):
+        import os
+
+        self.bundle().load()
+        self.assertTrue(os.path.exists(self.index_file))
+
+        bundle = self.bundle()
+        self.assertEqual(2, len(bundle))
+        self.assertEqual(0, bundle.parsed)
+        self.assertEqual(["# Hello", "World"], bundle.get("1.1 Lesson").lines("--i18n-aaa"))
+
+        self.write("1.1 Lesson", "# /1.1 Lesson\n<hr>--i18n-aaa\n# Bonjour\n")
+
+        bundle = self.bundle()
+        self.assertEqual(["# Bonjour"], bundle.get("1.1 Lesson").lines("--i18n-aaa"))
+        self.assertEqual(1, bundle.parsed)
+
+
+if __name__ == '__main__':
+    unittest.main()
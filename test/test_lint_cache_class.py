@@ -0,0 +1,98 @@
+import unittest
+from dbacademy_courseware.dbbuild.lint_cache_class import LintCache
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+        from dbacademy_courseware.dbbuild import BuildConfig
+        from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = f"{self.temp_dir.name}/cache"
+
+        client = LocalRestClient(f"{self.temp_dir.name}/workspace")
+        client.workspace().mkdirs("/Course/Source")
+        client.workspace().import_notebook("PYTHON", "/Course/Source/Good", "# Databricks notebook source\n# INCLUDE_HEADER_FALSE\n# INCLUDE_FOOTER_FALSE\n\n# COMMAND ----------\n\nprint(1)")
+        client.workspace().import_notebook("PYTHON", "/Course/Source/Bad", "# Databricks notebook source\n# INCLUDE_HEADER_FALSE\n\n# COMMAND ----------\n\n# MAGIC %run ./Missing")
+
+        self.client = client
+        self.build_config = BuildConfig(name="Unit Test", version="1.2.3", client=client, source_dir="/Course/Source", source_repo="/Course", cloud="AWS")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_lint(self):
+        self.assertEqual(2, self.build_config.lint(cache_dir=self.cache_dir))
+
+        bad = self.build_config.notebooks.get("Bad")
+        expected = [e.message for e in bad.errors]
+        self.assertEqual(0, len(self.build_config.notebooks.get("Good").errors))
+
+        # The second pass is answered entirely from the cache
+        cache = LintCache(self.cache_dir)
+        self.assertTrue(bad.lint("/Course/Source", "/Course/Resources", list(self.build_config.notebooks.values()), cache=cache))
+        self.assertEqual(expected, [e.message for e in bad.errors])
+        self.assertEqual(1, cache.hits)
+
+    def test_key(self):
+        notebook = self.build_config.notebooks.get("Good")
+        key = LintCache.key(notebook, "python", "print(1)", None, ["Good", "Bad"])
+
+        self.assertEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Bad", "Good"]))
+        self.assertNotEqual(key, LintCache.key(notebook, "python", "print(2)", None, ["Good", "Bad"]))
+        self.assertNotEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good"]))
+
+        notebook.replacements["built_on"] = "today"
+        key = LintCache.key(notebook, "python", "print(1)", None, ["Good", "Bad"])
+        notebook.replacements["built_on"] = "tomorrow"
+        self.assertEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good", "Bad"]))
+
+        notebook.ignoring.append("lang-python")
+        self.assertNotEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good", "Bad"]))
+
+    def test_key_version(self):
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        notebook = self.build_config.notebooks.get("Good")
+        key = LintCache.key(notebook, "python", "print(1)", None, ["Good"])
+
+        notebook.version = "1.2.4"
+        self.assertNotEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good"]))
+
+        # A pinned library is only a warning when building one of these versions
+        notebook.version = BuildConfig.VERSION_TEST
+        self.assertNotEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good"]))
+
+        notebook.version = "1.2.3"
+        self.assertEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good"]))
+
+    def test_key_rules(self):
+        from dbacademy_courseware.dbpublish.cell_rule_set_class import CellRule, CellRuleSet, default_rules
+
+        notebook = self.build_config.notebooks.get("Good")
+        key = LintCache.key(notebook, "python", "print(1)", None, ["Good"])
+
+        # Changing any rule's message, or adding a rule, invalidates the cached results
+        rules = default_rules()
+        rules[0].message = "Cmd #{cmd} | Cell titles are not supported"
+        self.build_config.cell_rules = CellRuleSet(rules)
+        self.assertNotEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good"]))
+
+        self.build_config.cell_rules = CellRuleSet(default_rules() + [CellRule("todo", "TODO", "Cmd #{cmd} | Found TODO")])
+        self.assertNotEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good"]))
+
+        self.build_config.cell_rules = CellRuleSet()
+        self.assertEqual(key, LintCache.key(notebook, "python", "print(1)", None, ["Good"]))
+
+    def test_tool_digest(self):
+        digest = LintCache.tool_digest()
+
+        self.assertEqual(64, len(digest))
+        self.assertNotEqual("0.0.0", digest)
+        self.assertEqual(digest, LintCache.tool_digest())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = LocalRestClient(self.temp_dir.name)
+
+        self.client.workspace().mkdirs("/Source/Includes")
+        self.client.workspace().import_notebook("PYTHON", "/Source/1.1 Lesson", """# Databricks notebook source
+# INCLUDE_HEADER_TRUE
+# INCLUDE_FOOTER_TRUE
+
+# COMMAND ----------
+
+# MAGIC %run ./Includes/Classroom-Setup
+
+# COMMAND ----------
+
+print("Hello {{version_number}}")
+""")
+        self.client.workspace.import_notebook("SQL", "/Source/Includes/Classroom-Setup", "-- Databricks notebook source\nSELECT 1")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_ls(self):
+        self.assertIsNone(self.client.workspace().ls("/Missing"))
+
+        entities = self.client.workspace().ls("/Source")
+        self.assertEqual(["/Source/1.1 Lesson", "/Source/Includes"], [e.get("path") for e in entities])
+        self.assertEqual(["NOTEBOOK", "DIRECTORY"], [e.get("object_type") for e in entities])
+
+        entities = self.client.workspace().ls("/Source", recursive=True)
+        self.assertEqual(["/Source/1.1 Lesson", "/Source/Includes/Classroom-Setup"], [e.get("path") for e in entities])
+        self.assertEqual(["PYTHON", "SQL"], [e.get("language") for e in entities])
+
+    def test_get_status(self):
+        self.assertIsNone(self.client.workspace().get_status("/Source/Missing"))
+        self.assertEqual("DIRECTORY", self.client.workspace().get_status("/Source").get("object_type"))
+        self.assertEqual("SQL", self.client.workspace().get_status("/Source/Includes/Classroom-Setup").get("language"))
+
+    def test_delete_path(self):
+        self.client.workspace().delete_path("/Source/Includes")
+        self.assertIsNone(self.client.workspace().get_status("/Source/Includes/Classroom-Setup"))
+        self.assertIsNotNone(self.client.workspace().get_status("/Source/1.1 Lesson"))
+
+    def test_export_and_import_dbc(self):
+        import os
+
+        data = self.client.workspace.export_dbc("/Source")
+
+        dbc_file = os.path.join(self.temp_dir.name, "Source.dbc")
+        with open(dbc_file, "wb") as f:
+            f.write(data)
+
+        self.client.workspace.mkdirs("/Copy")
+        self.client.workspace.import_dbc_files("/Copy", local_file_path=dbc_file)
+
+        self.assertEqual("-- Databricks notebook source\nSELECT 1\n", self.client.workspace.export_notebook("/Copy/Includes/Classroom-Setup"))
+
+    def test_publish(self):
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        build_config = BuildConfig(name="Unit Test",
+                                   version="1.2.3",
+                                   client=self.client,
+                                   source_dir="/Source",
+                                   source_repo="/",
+                                   cloud="AWS")
+
+        self.assertEqual(["1.1 Lesson", "Includes/Classroom-Setup"], sorted(build_config.notebooks.keys()))
+
+        notebook = build_config.notebooks.get("1.1 Lesson")
+        notebook.replacements["version_number"] = "1.2.3"
+        notebook.publish(source_dir="/Source",
+                         target_dir="/Published",
+                         i18n_resources_dir="/Resources",
+                         verbose=False,
+                         debugging=False,
+                         other_notebooks=list(build_config.notebooks.values()))
+
+        source = self.client.workspace().export_notebook("/Published/1.1 Lesson")
+        self.assertIn("print(\"Hello 1.2.3\")", source)
+        self.assertIsNotNone(self.client.workspace().get_status("/Published/Solutions/1.1 Lesson"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+from dbacademy_courseware.dbpublish.mustache_template_class import MustacheTemplate
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_render(self):
+        template = MustacheTemplate({"version_number": "1.2.3", "built_on": "today"})
+
+        actual = template.render("Version {{version_number}}, built {{built_on}}; again {{{version_number}}}")
+        self.assertEqual("Version 1.2.3, built today; again {1.2.3}", actual)
+        self.assertEqual([], template.unresolved)
+
+    def test_render_single_pass(self):
+        # Substituted values are not themselves re-processed
+        template = MustacheTemplate({"a": "{{b}}", "b": "B"})
+        self.assertEqual("{{b}} B", template.render("{{a}} {{b}}"))
+
+    def test_unresolved(self):
+        template = MustacheTemplate({"known": "yes"})
+
+        actual = template.render("{{known}} {{unknown}} {{ not_ours }} {{also-unknown}}")
+        self.assertEqual("yes {{unknown}} {{ not_ours }} {{also-unknown}}", actual)
+        self.assertEqual([("{{unknown}}", 10), ("{{also-unknown}}", 37)], template.unresolved)
+        self.assertEqual("{{unknown}} at position 10, {{also-unknown}} at position 37", template.describe_unresolved())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = LocalRestClient(self.temp_dir.name)
+
+        self.client.workspace().mkdirs("/Source/Includes")
+        self.client.workspace().import_notebook("PYTHON", "/Source/1.1 Lesson", """# Databricks notebook source
+# INCLUDE_HEADER_TRUE
+# INCLUDE_FOOTER_TRUE
+
+# COMMAND ----------
+
+# MAGIC %run ./Includes/Classroom-Setup
+
+# COMMAND ----------
+
+# MAGIC %run ./Includes/Missing
+
+# COMMAND ----------
+
+print("Hello {{version_number}}")
+""")
+        self.client.workspace().import_notebook("SQL", "/Source/Includes/Classroom-Setup", "-- Databricks notebook source\nSELECT 1")
+
+        self.build_config = BuildConfig(name="Unit Test",
+                                        version="1.2.3",
+                                        client=self.client,
+                                        source_dir="/Source",
+                                        source_repo="/",
+                                        cloud="AWS")
+
+        self.notebook = self.build_config.notebooks.get("1.1 Lesson")
+        self.notebook.replacements["version_number"] = "1.2.3"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def prepare(self):
+        return self.notebook.prepare("/Source", "/Resources", self.build_config.path_index, debugging=False)
+
+    def test_pickle(self):
+        import pickle
+
+        payload = pickle.loads(pickle.dumps(self.prepare()))
+
+        self.assertEqual("1.1 Lesson", payload.path)
+        self.assertEqual("python", payload.language)
+        self.assertEqual("1.2.3", payload.replacements.get("version_number"))
+        self.assertTrue("Includes/Classroom-Setup" in payload.path_index)
+
+    def test_transform_payload(self):
+        from dbacademy_courseware.dbpublish.notebook_payload_class import transform_payload
+
+        expected = self.notebook.transform(self.prepare())
+        expected_errors = [e.message for e in self.notebook.errors]
+
+        result = transform_payload(self.prepare())
+        self.assertEqual(expected, (result.students_commands, result.solutions_commands))
+        self.assertEqual(expected_errors, result.errors)
+        self.assertEqual(1, len(result.errors))
+        self.assertTrue("Includes/Missing" in result.errors[0])
+
+    def test_process_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+        from dbacademy_courseware.dbpublish.notebook_payload_class import transform_payload
+
+        payload = self.prepare()
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = list(executor.map(transform_payload, [payload]))[0]
+
+        self.notebook.merge(result)
+        self.assertEqual(1, len(self.notebook.errors))
+
+        self.assertRaises(Exception, lambda: self.notebook.finish("/Published", payload.language, result.students_commands, result.solutions_commands, verbose=False, write=True))
+        self.assertIsNone(self.client.workspace().get_status("/Published/1.1 Lesson"))
+
+
+if __name__ == '__main__':
+    unittest.main()
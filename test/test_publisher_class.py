@@ -0,0 +1,93 @@
+import os
+import unittest
+from typing import Tuple
+from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+from dbacademy_courseware.dbpublish import Publisher
+
+
+class MyTestCase(unittest.TestCase):
+
+    NOTEBOOKS = {
+        "Version Info": "# Databricks notebook source\n# INCLUDE_HEADER_TRUE\n# INCLUDE_FOOTER_TRUE\n\n# COMMAND ----------\n\n# MAGIC %md\n# MAGIC Version {{version_number}}\n",
+        "1.1 Lesson": "# Databricks notebook source\n# INCLUDE_HEADER_TRUE\n# INCLUDE_FOOTER_TRUE\n\n# COMMAND ----------\n\n# MAGIC %run ./Includes/Classroom-Setup\n\n# COMMAND ----------\n\n# TODO\n# x = FILL_IN\n\n# COMMAND ----------\n\n# ANSWER\nx = 1\n",
+        "1.2 Lab": "-- Databricks notebook source\n-- INCLUDE_HEADER_TRUE\n-- INCLUDE_FOOTER_TRUE\n\n-- COMMAND ----------\n\n-- MAGIC %md\n-- MAGIC\n-- MAGIC # Lab\n\n-- COMMAND ----------\n\n-- ANSWER\nSELECT 1\n",
+        "1.3 Datasets": "# Databricks notebook source\n# INCLUDE_HEADER_TRUE\n# INCLUDE_FOOTER_TRUE\n\n# COMMAND ----------\n\ndf = spark.read.load(\"/mnt/training/some.csv\")\n\n# COMMAND ----------\n\n# MAGIC %python\n# MAGIC df.display()\n",
+        "Includes/Classroom-Setup": "# Databricks notebook source\n# INCLUDE_HEADER_FALSE\n# INCLUDE_FOOTER_FALSE\n\n# COMMAND ----------\n\nprint(\"Setup\")\n",
+    }
+
+    def setUp(self) -> None:
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def publish(self, name: str, **kwargs) -> Tuple[str, Publisher, str]:
+        """
+        Publishes the course into its own workspace
+        :return: the tuple (local_dir, publisher, html) where local_dir is the local directory of the published notebooks and
+                 html is the summary displayed at the end of the build, less the build's metrics
+        """
+        from unittest import mock
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        root = f"{self.temp_dir.name}/{name}"
+        client = LocalRestClient(root)
+        client.workspace().mkdirs("/Course/Source/Includes")
+
+        for path, source in self.NOTEBOOKS.items():
+            language = "SQL" if source.startswith("--") else "PYTHON"
+            client.workspace().import_notebook(language, f"/Course/Source/{path}", source)
+
+        build_config = BuildConfig(name="Unit Test", version="1.2.3", client=client, source_dir="/Course/Source", source_repo="/Course", cloud="AWS")
+        build_config.commit_resolver.commits.update({r: "0" * 40 for r in build_config.commit_resolver.REPOSITORIES})
+
+        publisher = Publisher(build_config)
+        publisher.validate()
+
+        # The metrics, being timings, differ from one build to the next
+        with mock.patch("dbacademy_gems.dbgems.display_html") as display_html, mock.patch.object(build_config.metrics, "to_html", return_value=""):
+            publisher.publish_notebooks(report_file=f"{root}/build-report.json", **kwargs)
+
+        html = display_html.call_args[0][0]
+        return client.workspace().to_local_path(publisher.target_dir), publisher, html
+
+    @staticmethod
+    def read_tree(directory: str) -> dict:
+        tree = dict()
+        for dp, dn, filenames in os.walk(directory):
+            for f in filenames:
+                with open(os.path.join(dp, f)) as file:
+                    tree[os.path.relpath(os.path.join(dp, f), directory)] = file.read()
+        return tree
+
+    def test_bulk_export(self):
+        expected = self.read_tree(self.publish("serial")[0])
+        actual = self.read_tree(self.publish("bulk", bulk_export=True)[0])
+
+        self.assertIn("Solutions/1.1 Lesson.py", expected)
+        self.assertEqual(sorted(expected.keys()), sorted(actual.keys()))
+        for path in expected:
+            self.assertEqual(expected[path], actual[path], path)
+
+    def test_max_workers(self):
+        expected_dir, expected_publisher, expected_html = self.publish("serial")
+        actual_dir, actual_publisher, actual_html = self.publish("parallel", max_workers=4)
+
+        self.assertEqual(self.read_tree(expected_dir), self.read_tree(actual_dir))
+
+        # Errors and warnings are reported to, and summarized for, the notebook that raised them
+        for expected, actual in zip(expected_publisher.notebooks, actual_publisher.notebooks):
+            self.assertEqual(expected.path, actual.path)
+            self.assertEqual([w.message for w in expected.warnings], [w.message for w in actual.warnings])
+            self.assertEqual([e.message for e in expected.errors], [e.message for e in actual.errors])
+
+        datasets = [n for n in actual_publisher.notebooks if n.path == "1.3 Datasets"][0]
+        self.assertEqual(2, len(datasets.warnings))
+        self.assertIn("/mnt/training", expected_html)
+        self.assertEqual(expected_html, actual_html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import unittest
+from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+from dbacademy_courseware.dbpublish.notebook_def_class import RESOURCE_GENERATED, RESOURCE_UNCHANGED, RESOURCE_SKIPPED
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = LocalRestClient(self.temp_dir.name)
+
+        self.client.workspace().mkdirs("/Source")
+        self.client.workspace().import_notebook("PYTHON", "/Source/1.1 Lesson", """# Databricks notebook source
+print("Setup")
+
+# COMMAND ----------
+
+# MAGIC %md --i18n-a6e39b59-1715-4750-bd5d-5d638cf57c3a
+# MAGIC # Hello World
+
+# COMMAND ----------
+
+print("Hello")
+""")
+        self.client.workspace().import_notebook("PYTHON", "/Source/1.2 Lab", "# Databricks notebook source\nprint(1)\n")
+
+        self.build_config = BuildConfig(name="Unit Test",
+                                        version="1.2.3",
+                                        client=self.client,
+                                        source_dir="/Source",
+                                        source_repo="/",
+                                        cloud="AWS")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_skipped(self):
+        notebook = self.build_config.notebooks.get("1.2 Lab")
+        self.assertEqual(RESOURCE_SKIPPED, notebook.create_resource_bundle("english", "/Source", "/Resources"))
+
+    def test_unchanged(self):
+        from unittest import mock
+
+        target_dir = "/Resources"
+        notebook = self.build_config.notebooks.get("1.1 Lesson")
+
+        with mock.patch("dbacademy_courseware.dbbuild.common.WORKSPACE_FS", self.temp_dir.name):
+            self.assertEqual(RESOURCE_GENERATED, notebook.create_resource_bundle("english", "/Source", target_dir))
+            self.assertEqual(RESOURCE_UNCHANGED, notebook.create_resource_bundle("english", "/Source", target_dir))
+
+        with open(f"{self.temp_dir.name}{target_dir}/english/1.1 Lesson.md") as f:
+            self.assertIn("<hr>--i18n-a6e39b59-1715-4750-bd5d-5d638cf57c3a", f.read())
+
+    def test_concurrent_new_directory(self):
+        from unittest import mock
+        from dbacademy_courseware.dbbuild import BuildConfig
+        from dbacademy_courseware.dbpublish import Publisher
+
+        # Every notebook is written to the same, not yet existing, directory
+        self.client.workspace().mkdirs("/Source/Dir")
+        for i in range(16):
+            self.client.workspace().import_notebook("PYTHON", f"/Source/Dir/Lesson {i}", f"""# Databricks notebook source
+print({i})
+
+# COMMAND ----------
+
+# MAGIC %md --i18n-a6e39b59-1715-4750-bd5d-5d638cf57c{i:03d}
+# MAGIC # Lesson {i}
+""")
+
+        build_config = BuildConfig(name="Unit Test",
+                                   version="9",
+                                   client=self.client,
+                                   source_dir="/Source",
+                                   source_repo="/",
+                                   cloud="AWS")
+        publisher = Publisher(build_config)
+
+        with mock.patch("dbacademy_courseware.dbbuild.common.WORKSPACE_FS", self.temp_dir.name):
+            self.assertTrue(publisher.create_resource_bundle(target_dir="/Resources", max_workers=8))
+
+        files = os.listdir(f"{self.temp_dir.name}/Resources/english-v9/Dir")
+        self.assertEqual(16, len(files))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from dbacademy_courseware.dbpublish.resource_diff_class import Change, Segment, SegmentDiff
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_dir = f"{self.temp_dir.name}/english-v1.0.0"
+        self.latest_dir = f"{self.temp_dir.name}/english-v1.0.1"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def write(self, directory: str, name: str, text: str):
+        import os
+
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{directory}/{name}", "w") as f:
+            f.write(text)
+
+    def test_digest(self):
+        segment_a = Segment("--i18n-a")
+        segment_b = Segment("--i18n-b")
+        for line in ["# Lesson\n", "Some text\n"]:
+            segment_a.add_line(line)
+            segment_b.add_line(line)
+
+        self.assertEqual(segment_a.digest, segment_b.digest)
+        self.assertTrue(segment_a.same_as(segment_b))
+
+        segment_b.add_line("\n")
+        self.assertNotEqual(segment_a.digest, segment_b.digest)
+        self.assertTrue(segment_a.same_as(segment_b))
+
+    def test_normalize(self):
+        change = Change("Cell Changed", "Lesson.md", "--i18n-a", "a\n\n\n\nb\n\nc", None)
+
+        self.assertEqual("a\nb\nc", change.original_text)
+        self.assertIsNone(change.latest_text)
+
+    def test_diff(self):
+        self.write(self.original_dir, "Lesson.md", "# /Lesson\n<hr>--i18n-a\n# Title\n<hr>--i18n-b\nSame\n<hr>--i18n-c\nRemoved\n")
+        self.write(self.latest_dir, "Lesson.md", "# /Lesson\n<hr>--i18n-a\n# New\n\n\nTitle\n<hr>--i18n-b\nSame\n\n<hr sandbox>--i18n-d\nAdded\n")
+
+        sd = SegmentDiff("Lesson.md", self.original_dir, self.latest_dir)
+        sd.read_segments()
+        changes = sd.diff()
+
+        self.assertEqual(["Cell Changed", "Cell Removed", "Cell Added"], [c.change_type for c in changes])
+        self.assertEqual(["a", "c", "d"], [c.message for c in changes])
+        self.assertEqual("# Title", changes[0].original_text)
+        self.assertEqual("# New\nTitle", changes[0].latest_text)
+
+    def test_missing(self):
+        self.write(self.latest_dir, "Lesson.md", "# /Lesson\n<hr>--i18n-a\n# Title\n")
+
+        sd = SegmentDiff("Lesson.md", self.original_dir, self.latest_dir)
+        sd.read_segments()
+
+        self.assertEqual(["Missing Notebook"], [c.change_type for c in sd.diff()])
+
+    def test_memoized(self):
+        self.write(self.original_dir, "Lesson.md", "# /Lesson\n<hr>--i18n-a\n# Title\n")
+        self.write(self.latest_dir, "Lesson.md", "# /Lesson\n<hr>--i18n-a\n# New Title\n")
+
+        sd = SegmentDiff("Lesson.md", self.original_dir, self.latest_dir)
+        sd.read_segments()
+
+        self.assertIs(sd.diff(), sd.diff())
+
+    def test_compare(self):
+        from dbacademy_courseware.dbpublish.resource_diff_class import ResourceDiff
+
+        for i in range(8):
+            self.write(self.original_dir, f"Lesson {i}.md", f"# /Lesson {i}\n<hr>--i18n-a\n# Title {i}\n")
+            self.write(self.latest_dir, f"Lesson {i}.md", f"# /Lesson {i}\n<hr>--i18n-a\n# Title {i % 2}\n")
+
+        diff = ResourceDiff(None, resources_folder=self.temp_dir.name, old_resource="english-v1.0.0", new_resource="english-v1.0.1")
+        html = diff.compare()
+
+        self.assertEqual(html, diff.compare(max_workers=4))
+        self.assertEqual(6, html.count("Cell Changed"))
+        self.assertLess(html.index("/Lesson 2.md"), html.index("/Lesson 7.md"))
+
+        with open(f"{self.temp_dir.name}/report.html", "w") as file:
+            from dbacademy_courseware.dbbuild.text_writer_class import TextWriter
+            self.assertIsNone(diff.compare(TextWriter(file), max_workers=4))
+
+        with open(f"{self.temp_dir.name}/report.html", "r") as file:
+            self.assertEqual(html, file.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+from dbacademy_courseware.dbbuild.source_cache_class import SourceCache
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = LocalRestClient(self.temp_dir.name)
+
+        self.client.workspace().mkdirs("/Source")
+        self.client.workspace().import_notebook("PYTHON", "/Source/Lesson", "# Databricks notebook source\nprint(1)\n")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_get(self):
+        cache = SourceCache()
+        status = self.client.workspace().get_status("/Source/Lesson")
+
+        self.assertEqual(("python", "# Databricks notebook source\nprint(1)\n"), cache.get(self.client, "/Source/Lesson", status))
+        self.assertEqual(("python", "# Databricks notebook source\nprint(1)\n"), cache.get(self.client, "/Source/Lesson", status))
+
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertTrue("/Source/Lesson" in cache)
+
+    def test_modified(self):
+        cache = SourceCache()
+        status = self.client.workspace().get_status("/Source/Lesson")
+        cache.get(self.client, "/Source/Lesson", status)
+
+        # A different modification time implies a different version of the notebook
+        self.client.workspace().import_notebook("PYTHON", "/Source/Lesson", "# Databricks notebook source\nprint(2)\n", overwrite=True)
+        status = dict(status, modified_at=status.get("modified_at") + 1)
+
+        self.assertEqual(("python", "# Databricks notebook source\nprint(2)\n"), cache.get(self.client, "/Source/Lesson", status))
+        self.assertEqual(2, cache.misses)
+
+    def test_invalidate(self):
+        cache = SourceCache()
+        cache.get(self.client, "/Source/Lesson", self.client.workspace().get_status("/Source/Lesson"))
+
+        cache.invalidate("/Source")
+        self.assertEqual(0, len(cache))
+        self.assertEqual({"notebooks": 0, "hits": 0, "misses": 1, "hit_rate": 0.0}, cache.to_dict())
+
+    def test_build_config(self):
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        build_config = BuildConfig(name="Unit Test",
+                                   version="1.2.3",
+                                   client=self.client,
+                                   source_dir="/Source",
+                                   source_repo="/",
+                                   cloud="AWS")
+
+        notebook = build_config.notebooks.get("Lesson")
+        notebook.load_source("/Source")
+        notebook.load_source("/Source")
+
+        self.assertEqual(1, build_config.metrics.calls.get("workspace.export_notebook")[0])
+        self.assertEqual(1, build_config.metrics.to_dict().get("caches").get("source_cache").get("hits"))
+
+    def test_edited_between_stages(self):
+        import os
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        self.client.workspace().import_notebook("PYTHON", "/Source/Lesson", "# Databricks notebook source\n# INCLUDE_HEADER_FALSE\n# INCLUDE_FOOTER_FALSE\n\n# COMMAND ----------\n\nprint(1)\n", overwrite=True)
+
+        build_config = BuildConfig(name="Unit Test",
+                                   version="1.2.3",
+                                   client=self.client,
+                                   source_dir="/Source",
+                                   source_repo="/",
+                                   cloud="AWS")
+
+        cache_dir = f"{self.temp_dir.name}/lint-cache"
+        self.assertEqual(0, build_config.lint(cache_dir=cache_dir))
+
+        # Edited by the author after the BuildConfig was created
+        self.client.workspace().import_notebook("PYTHON", "/Source/Lesson", "# Databricks notebook source\n# INCLUDE_HEADER_FALSE\n# INCLUDE_FOOTER_FALSE\n\n# COMMAND ----------\n\n# MAGIC %run ./Missing\n", overwrite=True)
+        local_path = self.client.workspace().to_local_path("/Source/Lesson") + ".py"
+        os.utime(local_path, (os.path.getatime(local_path), os.path.getmtime(local_path) + 10))
+
+        self.assertEqual(1, build_config.lint(cache_dir=cache_dir))
+        self.assertEqual(2, build_config.source_cache.misses)
+
+
+if __name__ == '__main__':
+    unittest.main()
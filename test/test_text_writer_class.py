@@ -0,0 +1,31 @@
+import unittest
+from dbacademy_courseware.dbbuild.text_writer_class import TextWriter
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_write(self):
+        writer = TextWriter().writeln("# Databricks notebook source")
+        writer.write_all(["print(1)", "print(2)"], separator="\n# COMMAND ----------\n")
+
+        expected = "# Databricks notebook source\nprint(1)\n# COMMAND ----------\nprint(2)"
+        self.assertEqual(expected, writer.getvalue())
+        self.assertEqual(expected, writer.getvalue())
+        self.assertEqual(len(expected), len(writer))
+
+    def test_empty(self):
+        self.assertEqual("", TextWriter().getvalue())
+
+    def test_stream(self):
+        import io
+
+        buffer = io.StringIO()
+        writer = TextWriter(buffer).writeln("<html>").write("</html>")
+
+        self.assertIsNone(writer.getvalue())
+        self.assertEqual("<html>\n</html>", buffer.getvalue())
+        self.assertEqual(14, len(writer))
+
+
+if __name__ == '__main__':
+    unittest.main()
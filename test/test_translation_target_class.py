@@ -0,0 +1,34 @@
+import unittest
+from dbacademy_courseware.dbpublish.translation_target_class import TranslationTarget
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_defaults(self):
+        target = TranslationTarget("example-course", "japanese-v3.1.0")
+
+        self.assertEqual("JA", target.lang_code)
+        self.assertEqual("japanese", target.common_language)
+        self.assertEqual("3.1.0", target.core_version)
+        self.assertEqual("3.1.0-JA", target.version)
+
+        self.assertEqual("published", target.target_branch)
+        self.assertEqual("/Repos/Temp/example-course-japanese", target.target_dir)
+        self.assertEqual("https://github.com/databricks-academy/example-course-japanese.git", target.target_repo_url)
+
+    def test_distinct_targets(self):
+        targets = [TranslationTarget("example-course", l) for l in ["japanese-v3.1.0", "korean-v3.1.0"]]
+
+        self.assertEqual(2, len({t.target_dir for t in targets}))
+        self.assertEqual(["3.1.0-JA", "3.1.0-KO"], [t.version for t in targets])
+
+    def test_overrides(self):
+        target = TranslationTarget("example-course", "korean-v2.0.1", target_dir="/Repos/Temp/example-course", target_branch="main")
+
+        self.assertEqual("2.0.1-KO", target.version)
+        self.assertEqual("main", target.target_branch)
+        self.assertEqual("/Repos/Temp/example-course", target.target_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
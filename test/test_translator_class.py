@@ -0,0 +1,152 @@
+import os
+import unittest
+from unittest import mock
+from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+
+class MyTestCase(unittest.TestCase):
+
+    LESSON = """# Databricks notebook source
+print("Setup")
+
+# COMMAND ----------
+
+# MAGIC %md <i18n value="a6e39b59-1715-4750-bd5d-5d638cf57c3a"/>
+# MAGIC # Hello World
+
+# COMMAND ----------
+
+# MAGIC %md <i18n value="0b3d2a4e-59b4-4d56-9bd6-7c8d4c0f1e2a"/>
+# MAGIC Some text
+"""
+
+    def setUp(self) -> None:
+        import tempfile
+        from dbacademy_courseware.dbbuild import BuildConfig
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.client = LocalRestClient(f"{self.temp_dir.name}/workspace")
+        workspace = self.client.workspace()
+
+        workspace.mkdirs("/Course/Source")
+        workspace.import_notebook("PYTHON", "/Course/Source/1.1 Lesson", self.LESSON)
+        workspace.mkdirs("/Course/Resources/japanese-v1.0.0")
+
+        self.build_config = BuildConfig(name="Unit Test", version="1.0.0", client=self.client, source_dir="/Course/Source", source_repo="/Course", cloud="AWS")
+
+        # The published English source, as cloned by Translator.validate()
+        self.source_dir = f"/Repos/Temp/{self.build_config.username}-{self.build_config.build_name}-english_published-v1.0.0"
+        workspace.mkdirs(self.source_dir)
+        workspace.import_notebook("PYTHON", f"{self.source_dir}/1.1 Lesson", self.LESSON)
+
+        # The previously published translation
+        self.target_dir = f"/Repos/Temp/{self.build_config.build_name}"
+        workspace.mkdirs(self.target_dir)
+        workspace.import_notebook("PYTHON", f"{self.target_dir}/1.1 Lesson", "# Databricks notebook source\nprint(\"Previous\")\n")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def write_resource(self, guids: dict, i18n_language: str = "japanese-v1.0.0"):
+        resource_dir = self.client.workspace().to_local_path(f"/Course/Resources/{i18n_language}")
+        with open(f"{resource_dir}/1.1 Lesson.md", "w") as f:
+            f.write("# /1.1 Lesson\n")
+            for guid, text in guids.items():
+                f.write(f"<hr>--i18n-{guid}\n# MAGIC %md\n{text}\n")
+
+    def i18n_bundle(self, resources_dir: str):
+        from dbacademy_courseware.dbbuild.i18n_bundle_class import I18nBundle
+
+        bundle = I18nBundle(resources_dir,
+                            index_file=f"{self.temp_dir.name}/{resources_dir.split('/')[-1]}.json",
+                            local_dir=self.client.workspace().to_local_path(resources_dir))
+        bundle.load()
+        return bundle
+
+    def publish(self):
+        from dbacademy_courseware.dbpublish import Translator
+
+        # The language is selected with a widget and the repos are cloned from GitHub
+        with mock.patch("dbacademy_gems.dbgems.dbutils"), \
+             mock.patch("dbacademy_gems.dbgems.get_parameter", return_value="japanese-v1.0.0"), \
+             mock.patch("dbacademy_courseware.dbbuild.common.reset_git_repo"), \
+             mock.patch.object(self.build_config, "i18n_bundle", side_effect=self.i18n_bundle):
+
+            translator = Translator(self.build_config)
+            translator.validate()
+            translator.publish_notebooks(report_file=f"{self.temp_dir.name}/build-report.json")
+
+    def read_target(self) -> str:
+        return self.client.workspace().export_notebook(f"{self.target_dir}/1.1 Lesson")
+
+    def test_publish(self):
+        self.write_resource({"a6e39b59-1715-4750-bd5d-5d638cf57c3a": "# Konnichiwa",
+                             "0b3d2a4e-59b4-4d56-9bd6-7c8d4c0f1e2a": "Tekisuto"})
+        self.publish()
+
+        source = self.read_target()
+        self.assertIn("# MAGIC # Konnichiwa", source)
+        self.assertIn("# MAGIC Tekisuto", source)
+        self.assertNotIn("Previous", source)
+
+    def test_publish_languages(self):
+        from dbacademy_courseware.dbpublish import Translator
+
+        self.client.workspace().mkdirs("/Course/Resources/korean-v1.0.0")
+        self.write_resource({"a6e39b59-1715-4750-bd5d-5d638cf57c3a": "# Konnichiwa",
+                             "0b3d2a4e-59b4-4d56-9bd6-7c8d4c0f1e2a": "Tekisuto"})
+        self.write_resource({"a6e39b59-1715-4750-bd5d-5d638cf57c3a": "# Annyeong",
+                             "0b3d2a4e-59b4-4d56-9bd6-7c8d4c0f1e2a": "Teukseuteu"}, "korean-v1.0.0")
+
+        # The previously published translations, as cloned by Translator.publish_languages()
+        for language in ["japanese", "korean"]:
+            self.client.workspace().mkdirs(f"{self.target_dir}-{language}")
+            self.client.workspace().import_notebook("PYTHON", f"{self.target_dir}-{language}/1.1 Lesson", "# Databricks notebook source\nprint(\"Previous\")\n")
+
+        metadata = self.build_config.metadata
+        with mock.patch("dbacademy_gems.dbgems.dbutils"), \
+             mock.patch("dbacademy_gems.dbgems.display_html"), \
+             mock.patch("dbacademy_gems.dbgems.get_parameter", return_value="japanese-v1.0.0"), \
+             mock.patch("dbacademy_courseware.dbbuild.common.reset_git_repo"), \
+             mock.patch.object(self.build_config, "i18n_bundle", side_effect=self.i18n_bundle), \
+             mock.patch.object(self.build_config.metrics, "to_html", return_value=""), \
+             mock.patch.object(metadata, "load", wraps=metadata.load) as load:
+
+            translator = Translator(self.build_config)
+            targets = translator.publish_languages(["japanese-v1.0.0", "korean-v1.0.0"], max_workers=2)
+
+        # Each target gets its own language, from the one export of the shared source
+        self.assertEqual(["1.0.0-JA", "1.0.0-KO"], [t.version for t in targets])
+        japanese = self.client.workspace().export_notebook(f"{targets[0].target_dir}/1.1 Lesson")
+        korean = self.client.workspace().export_notebook(f"{targets[1].target_dir}/1.1 Lesson")
+
+        self.assertIn("# MAGIC # Konnichiwa", japanese)
+        self.assertIn("# MAGIC Tekisuto", japanese)
+        self.assertNotIn("Annyeong", japanese)
+        self.assertNotIn("Previous", japanese)
+        self.assertIn("# MAGIC # Annyeong", korean)
+        self.assertIn("# MAGIC Teukseuteu", korean)
+        self.assertNotIn("Konnichiwa", korean)
+        self.assertNotIn("Previous", korean)
+
+        self.assertEqual(1, len([c for c in load.call_args_list if c.args[1] == self.source_dir]))
+
+        calls = self.build_config.metrics.to_dict()["calls"]
+        self.assertEqual(1, calls["workspace.export_dbc"]["count"])
+        self.assertNotIn("workspace.export_notebook", calls)
+
+    def test_missing_guid(self):
+        previous = self.read_target()
+        self.write_resource({"a6e39b59-1715-4750-bd5d-5d638cf57c3a": "# Konnichiwa"})
+
+        with self.assertRaises(AssertionError) as context:
+            self.publish()
+
+        # Every GUID is checked before the target is cleaned, leaving it as it was
+        self.assertIn("1 missing GUIDs", str(context.exception))
+        self.assertEqual(previous, self.read_target())
+        self.assertEqual(["1.1 Lesson.py"], os.listdir(self.client.workspace().to_local_path(self.target_dir)))
+
+
+if __name__ == '__main__':
+    unittest.main()
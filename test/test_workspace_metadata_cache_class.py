@@ -0,0 +1,61 @@
+import unittest
+from dbacademy_courseware.dbbuild.workspace_metadata_cache_class import WorkspaceMetadataCache
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        import tempfile
+        from dbacademy_courseware.dbbuild.build_metrics_class import BuildMetrics
+        from dbacademy_courseware.dbbuild.local_workspace_class import LocalRestClient
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.metrics = BuildMetrics()
+        self.client = self.metrics.instrument(LocalRestClient(self.temp_dir.name))
+
+        self.client.workspace().mkdirs("/Source/Includes")
+        self.client.workspace().import_notebook("SQL", "/Source/Includes/Setup", "-- Databricks notebook source\nSELECT 1")
+        self.client.workspace().import_notebook("PYTHON", "/Source/Lesson", "# Databricks notebook source\nprint(1)")
+        self.client.workspace().mkdirs("/Other")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def get_status_calls(self) -> int:
+        return self.metrics.to_dict().get("calls").get("workspace.get_status", {}).get("count", 0)
+
+    def test_get_status(self):
+        cache = WorkspaceMetadataCache()
+        self.assertEqual(2, len(cache.load(self.client, "/Source")))
+
+        self.assertEqual("SQL", cache.get_status(self.client, "/Source/Includes/Setup").get("language"))
+        self.assertEqual("PYTHON", cache.get_status(self.client, "/Source/Lesson").get("language"))
+        self.assertIsNone(cache.get_status(self.client, "/Source/Missing"))
+        self.assertEqual(0, self.get_status_calls())
+        self.assertEqual(3, cache.hits)
+
+        # Outside the listed directory, the workspace is consulted
+        self.assertEqual("DIRECTORY", cache.get_status(self.client, "/Other").get("object_type"))
+        self.assertEqual(1, self.get_status_calls())
+        self.assertEqual(1, cache.misses)
+
+    def test_invalidate(self):
+        cache = WorkspaceMetadataCache()
+        cache.load(self.client, "/Source")
+
+        self.client.workspace().import_notebook("PYTHON", "/Source/Includes/New", "# Databricks notebook source\nprint(2)")
+        self.assertIsNone(cache.get_status(self.client, "/Source/Includes/New"))
+
+        cache.invalidate("/Source/Includes")
+        self.assertNotIn("/Source/Includes/Setup", cache)
+        self.assertIn("/Source/Lesson", cache)
+
+        self.assertEqual("PYTHON", cache.get_status(self.client, "/Source/Includes/New").get("language"))
+        self.assertEqual(1, self.get_status_calls())
+
+        cache.invalidate()
+        self.assertEqual(0, len(cache))
+
+
+if __name__ == '__main__':
+    unittest.main()